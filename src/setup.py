@@ -36,7 +36,8 @@ setup(
         'redis',
         'langcodes',
         'ipaddress',
-        'python-consul'
+        'python-consul',
+        'cryptography'
     ],
     zip_safe=False,
 )
@@ -40,3 +40,23 @@ WORKERS = {}
 TOKEN = ""
 TOKEN_INFO = {}
 collect_queue = ""      # Queue name for asynchronous collect
+PLUGIN_ENDPOINT_CACHE_TTL = 300     # Seconds to reuse plugin endpoint in worker process
+SECRET_LIST_PAGE_SIZE = 1000     # Number of secrets per list call of secret service
+SECRET_CACHE_TTL = 300      # Seconds to reuse secret (metadata) in process
+SECRET_DATA_CACHE_TTL = 60      # Seconds to reuse secret_data in process (encrypted in memory)
+COLLECTOR_BULK_SIZE = 0     # Number of resources per bulk upsert in synchronous collect (0: one by one, also in db_q)
+COLLECTOR_CONCURRENCY = 1      # Number of secrets collected at the same time in synchronous collect
+COLLECTOR_PLUGIN_CONCURRENCY = {}      # Max concurrent collecting per plugin in process, ex) {'plugin-xxx': 5}
+COLLECTOR_PLUGIN_DEFAULT_CONCURRENCY = 0      # Max concurrent collecting of plugin, which is not in above (0: no limit)
+COLLECTOR_DB_QUEUE_BATCH_SIZE = 100    # Number of resources per db_q task
+COLLECTOR_DB_QUEUE_MAX_INFLIGHT = 20   # Max number of db_q tasks in queue per JobTask (0: unlimited)
+COLLECTOR_JOB_TASK_TIMEOUT = 1800     # Seconds to wait for db_q tasks of JobTask after all resources are pushed, then finalize it with current stat
+COLLECTOR_PRIORITY_CACHE_TTL = 300     # Seconds to keep collector priority in worker process
+JOB_MAX_ERRORS = 1000      # Max number of errors kept in Job and JobTask (0: unlimited)
+COLLECTOR_STAT_FLUSH_SIZE = 1000       # Number of processed resources, before JobTask stat is flushed to cache in db_q consumer
+COLLECTOR_STAT_FLUSH_INTERVAL = 3      # Seconds to flush JobTask stat to cache in db_q consumer (0: flush every task)
+COLLECTOR_METRICS_LOG_INTERVAL = 60     # Seconds to log summary of collector latency histograms (0: no log)
+COLLECTOR_CHANGE_HISTORY_MODE = 'INLINE'       # INLINE (diff in resource) | COMPACT (no diff) | COLLECTION (diff in ResourceChangeHistory)
+COLLECTOR_CHANGE_HISTORY_RETENTION_DAYS = 30   # Days to keep ResourceChangeHistory (COLLECTION mode)
+COLLECTOR_PARTIAL_UPDATE = True     # Collector updates only changed paths of resource ($set/$unset), instead of whole fields
+COLLECTOR_ROLLBACK_POLICY = 'CHANGED'      # Rollback snapshot of collector update: FULL | CHANGED (updated fields only) | NONE
@@ -1,12 +1,14 @@
 # -*- coding: utf-8 -*-
 import logging
 
+import grpc
 from google.protobuf.json_format import MessageToDict
 
 from spaceone.core import pygrpc
 from spaceone.core.connector import BaseConnector
 from spaceone.core.utils import parse_endpoint
 from spaceone.inventory.error import *
+from spaceone.inventory.lib.plugin_client_pool import plugin_client_pool
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,6 +18,7 @@ class CollectorPluginConnector(BaseConnector):
     def __init__(self, transaction, config):
         super().__init__(transaction, config)
         self.client = None
+        self.endpoint = None
 
     def initialize(self, endpoint):
         """ Initialize based on endpoint
@@ -29,7 +32,11 @@ class CollectorPluginConnector(BaseConnector):
         e = parse_endpoint(endpoint_str)
         protocol = e['scheme']
         if protocol == 'grpc':
-            self.client = pygrpc.client(endpoint="%s:%s" % (e['hostname'], e['port']), version='plugin')
+            # Reuse gRPC client (channel) of endpoint
+            self.endpoint = endpoint_str
+            self.client = plugin_client_pool.get_client(
+                endpoint_str, 'plugin',
+                lambda: pygrpc.client(endpoint="%s:%s" % (e['hostname'], e['port']), version='plugin'))
         elif protocol == 'http':
             # TODO:
             pass
@@ -49,6 +56,7 @@ class CollectorPluginConnector(BaseConnector):
             return MessageToDict(plugin_info)
         except Exception as e:
             _LOGGER.error(f'[init] error: {e}')
+            self._invalidate_client_by_error(e)
             raise ERROR_INIT_PLUGIN_FAILURE(params=params)
 
     def verify(self, options, secret_data):
@@ -62,7 +70,8 @@ class CollectorPluginConnector(BaseConnector):
             verify_info = self.client.Collector.verify(params, metadata=meta)
             return MessageToDict(verify_info)
         except Exception as e:
-            raise ERROR_AUTHENTICATION_FAILURE_PLUGIN(messsage=str(e))
+            self._invalidate_client_by_error(e)
+            raise ERROR_AUTHENTICATION_FAILURE_PLUGIN(message=str(e))
 
     def collect(self, options, secret_data, filter, region_id=None, zone_id=None, pool_id=None):
         """ Collector Data base on param
@@ -87,5 +96,22 @@ class CollectorPluginConnector(BaseConnector):
         #_LOGGER.debug('[collect] correct params: %s' % params)
         # TODO: meta (plugin has no meta)
         meta = []
-        result_stream = self.client.Collector.collect(params, metadata=meta)
+        try:
+            result_stream = self.client.Collector.collect(params, metadata=meta)
+        except Exception as e:
+            self._invalidate_client_by_error(e)
+            raise e
+
         return result_stream
+
+    def _invalidate_client_by_error(self, e):
+        """ Remove pooled client only by transport error (UNAVAILABLE)
+        Errors of plugin like authentication failure do not break the client
+        """
+        if isinstance(e, grpc.RpcError):
+            is_unavailable = e.code() == grpc.StatusCode.UNAVAILABLE
+        else:
+            is_unavailable = isinstance(e, ERROR_GRPC_CONNECTION)
+
+        if is_unavailable:
+            plugin_client_pool.invalidate_client(self.endpoint)
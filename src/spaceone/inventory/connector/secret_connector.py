@@ -36,6 +36,10 @@ class SecretConnector(BaseConnector):
         return self.client.Secret.list({'provider': provider, 'domain_id': domain_id},
                                        metadata=self.transaction.get_connection_meta())
 
+    def list_secrets(self, query, domain_id):
+        return self.client.Secret.list({'query': query, 'domain_id': domain_id},
+                                       metadata=self.transaction.get_connection_meta())
+
     def get_secret_data(self, secret_id, domain_id):
         return self.client.Secret.get_data({'secret_id': secret_id, 'domain_id': domain_id},
                                            metadata=self.transaction.get_connection_meta())
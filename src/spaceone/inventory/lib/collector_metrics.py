@@ -0,0 +1,147 @@
+import bisect
+import contextlib
+import logging
+import threading
+import time
+
+from spaceone.core import config
+
+_LOGGER = logging.getLogger(__name__)
+_DEFAULT_LOG_INTERVAL = 60
+BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]     # seconds
+
+# Stages of collector ingestion
+PLUGIN_WAIT = 'plugin_wait'     # wait for next resource from plugin stream
+DECODE = 'decode'               # convert ResourceInfo message
+MATCH = 'match'                 # find resource with match_rules
+MERGE = 'merge'                 # merge data with change_history
+CREATE = 'create'               # create resource (service, include merge)
+UPDATE = 'update'               # update resource (service, include merge)
+BULK_MATCH = 'bulk_match'       # find resources of bulk with match_rules (per bulk)
+BULK_WRITE = 'bulk_write'       # write resources of bulk (per bulk)
+
+
+class Histogram(object):
+    """ Latency histogram with fixed buckets """
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, elapsed):
+        self.count += 1
+        self.sum += elapsed
+        self.max = max(self.max, elapsed)
+        self.buckets[bisect.bisect_left(BUCKETS, elapsed)] += 1
+
+    def percentile(self, p):
+        """ Upper bound of bucket which has p percentile (max, if it is in last bucket) """
+        if self.count == 0:
+            return 0.0
+
+        rank = self.count * p / 100
+        accumulated = 0
+        for idx, bucket_count in enumerate(self.buckets):
+            accumulated += bucket_count
+            if accumulated >= rank:
+                return BUCKETS[idx] if idx < len(BUCKETS) else self.max
+
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'avg': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': round(self.max, 6)
+        }
+
+
+class CollectorMetrics(object):
+    """
+    Process level latency histograms of collector ingestion
+
+    histograms: {(stage, collector_id, resource_type): Histogram}
+    Summary is logged at INFO level every COLLECTOR_METRICS_LOG_INTERVAL seconds (0: no log)
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._logged_at = time.time()
+
+    def observe(self, stage, elapsed, collector_id=None, resource_type=None):
+        key = (stage, collector_id, resource_type)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram()
+                self._histograms[key] = histogram
+
+            histogram.observe(elapsed)
+
+        self._log_summary_periodically()
+
+    @contextlib.contextmanager
+    def measure(self, stage, collector_id=None, resource_type=None):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.time() - start, collector_id, resource_type)
+
+    def get_stat(self, stage=None, collector_id=None):
+        """
+        Returns: list of {
+            'stage': str,
+            'collector_id': str,
+            'resource_type': str,
+            'count': int,
+            'sum': float,
+            'avg': float,
+            'p50': float,
+            'p95': float,
+            'p99': float,
+            'max': float
+        }
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+
+        stat = []
+        for (hist_stage, hist_collector_id, resource_type), histogram in sorted(items, key=lambda x: str(x[0])):
+            if stage and stage != hist_stage:
+                continue
+            if collector_id and collector_id != hist_collector_id:
+                continue
+
+            stat.append(dict(stage=hist_stage, collector_id=hist_collector_id, resource_type=resource_type,
+                             **histogram.to_dict()))
+
+        return stat
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def _log_summary_periodically(self):
+        log_interval = config.get_global('COLLECTOR_METRICS_LOG_INTERVAL', _DEFAULT_LOG_INTERVAL)
+        if log_interval <= 0 or time.time() - self._logged_at < log_interval:
+            return
+
+        with self._lock:
+            if time.time() - self._logged_at < log_interval:
+                return
+            self._logged_at = time.time()
+
+        for stat in self.get_stat():
+            _LOGGER.info(f'[collector_metrics] {stat["stage"]} ({stat["collector_id"]}, {stat["resource_type"]}): '
+                         f'count={stat["count"]}, avg={stat["avg"]}, p95={stat["p95"]}, max={stat["max"]}')
+
+
+collector_metrics = CollectorMetrics()
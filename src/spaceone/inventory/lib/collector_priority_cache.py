@@ -0,0 +1,77 @@
+import logging
+import threading
+import time
+
+from spaceone.core import config
+
+_LOGGER = logging.getLogger(__name__)
+_DEFAULT_TTL = 300
+
+
+class CollectorPriorityCache(object):
+    """
+    Process level cache of collector priority, which is shared by all CollectionDataManager in a worker
+
+    cache: {collector_id: (priority, expire_time)}
+    priority is None, if collector does not exist
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def get_priorities(self, collector_ids, loader):
+        """ Get priorities of collectors
+
+        Args:
+            collector_ids (list)
+            loader (func): function which returns {collector_id: priority} of missed collector_ids
+
+        Returns:
+            priorities (dict): {collector_id: priority} (not existing collectors are excluded)
+        """
+        now = time.time()
+        priorities = {}
+        missed_ids = []
+
+        with self._lock:
+            for collector_id in set(collector_ids):
+                cached = self._cache.get(collector_id)
+                if cached and cached[1] > now:
+                    priorities[collector_id] = cached[0]
+                    self.hit_count += 1
+                else:
+                    missed_ids.append(collector_id)
+                    self.miss_count += 1
+
+        if len(missed_ids) > 0:
+            loaded = loader(missed_ids)
+            expire_time = now + config.get_global('COLLECTOR_PRIORITY_CACHE_TTL', _DEFAULT_TTL)
+
+            with self._lock:
+                for collector_id in missed_ids:
+                    priority = loaded.get(collector_id)
+                    self._cache[collector_id] = (priority, expire_time)
+                    priorities[collector_id] = priority
+
+        _LOGGER.debug(f'[get_priorities] collector priority cache: {self.get_stat()}')
+        return {collector_id: priority for collector_id, priority in priorities.items() if priority is not None}
+
+    def invalidate(self, collector_id=None):
+        with self._lock:
+            if collector_id:
+                self._cache.pop(collector_id, None)
+            else:
+                self._cache = {}
+
+    def get_stat(self):
+        return {
+            'hit_count': self.hit_count,
+            'miss_count': self.miss_count,
+            'size': len(self._cache)
+        }
+
+
+collector_priority_cache = CollectorPriorityCache()
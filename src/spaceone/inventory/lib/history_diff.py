@@ -0,0 +1,39 @@
+def make_hashable(value):
+    """ Canonical hashable form of value, which is equal only if values are equal
+    dict is compared regardless of key order, list is compared in order
+    """
+    if isinstance(value, dict):
+        return '__dict__', tuple(sorted(((key, make_hashable(sub_value)) for key, sub_value in value.items()),
+                                        key=lambda item: str(item[0])))
+    elif isinstance(value, (list, tuple)):
+        return '__list__', tuple(make_hashable(sub_value) for sub_value in value)
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return '__repr__', repr(value)
+
+
+def get_history_diff(old_data, new_data):
+    """ Diff of old and new value of change history
+
+    list: elements which are only in old (delete) or new (insert), keeping order of each list
+        Elements are compared by hash of canonical form, so it takes O(n + m) instead of O(n * m)
+    others: whole old (delete) and new (insert) value
+    """
+    if isinstance(old_data, list) and isinstance(new_data, list):
+        old_keys = [make_hashable(value) for value in old_data]
+        new_keys = [make_hashable(value) for value in new_data]
+        old_key_set = set(old_keys)
+        new_key_set = set(new_keys)
+
+        return {
+            'insert': [value for value, key in zip(new_data, new_keys) if key not in old_key_set],
+            'delete': [value for value, key in zip(old_data, old_keys) if key not in new_key_set]
+        }
+    else:
+        return {
+            'insert': new_data,
+            'delete': old_data
+        }
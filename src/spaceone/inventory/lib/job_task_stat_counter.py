@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+
+from spaceone.core import config, cache
+
+_LOGGER = logging.getLogger(__name__)
+_DEFAULT_FLUSH_SIZE = 1000
+_DEFAULT_FLUSH_INTERVAL = 3
+STAT_KINDS = ['CREATED', 'UPDATED', 'FAILURE', 'PROCESSED']
+JOB_TASK_STAT_EXPIRE_TIME = 3600            # 1 hour
+
+
+@cache.connection
+def _get_redis_connection(cache_cls):
+    """ Redis client of default cache (None, if cache backend is not Redis) """
+    return getattr(cache_cls, 'conn', None)
+
+
+def increment_job_task_stats(amounts):
+    """ Increment stats of JobTask in cache with one Redis pipeline (MULTI/EXEC)
+    Keys are created with expire time by producer, but late counts after finalization create keys again.
+    Expire time is reset with each increment (EXPIRE does not rewrite value), otherwise they are never deleted.
+
+    Args:
+        amounts (dict): {key: amount}, keys are incremented in order
+
+    Returns: {key: value after increment}
+    """
+    conn = _get_redis_connection()
+    if conn is None:
+        return {key: cache.increment(key, amount) for key, amount in amounts.items()}
+
+    pipeline = conn.pipeline()
+    for key, amount in amounts.items():
+        pipeline.incrby(key, amount)
+        pipeline.expire(key, JOB_TASK_STAT_EXPIRE_TIME)
+
+    results = pipeline.execute()
+    return dict(zip(amounts.keys(), results[::2]))
+
+
+def increment_job_task_stat(key, amount=1):
+    """ Increment stat of JobTask in cache (see increment_job_task_stats)
+
+    Returns: value after increment
+    """
+    return increment_job_task_stats({key: amount})[key]
+
+
+class JobTaskStatCounter(object):
+    """
+    Process level aggregator of JobTask stat, which is shared by all db_q consumers in a worker
+    Counts are added to cache (job_task_stat:<domain_id>:<job_id>:<job_task_id>:<kind>),
+    when COLLECTOR_STAT_FLUSH_SIZE resources are counted or COLLECTOR_STAT_FLUSH_INTERVAL seconds are passed.
+
+    PROCESSED is flushed after the other kinds,
+    so stat of JobTask is complete in cache, when PROCESSED reaches TOTAL.
+    Flush listeners are called after periodic flush, for completion check of JobTask.
+
+    pending: {(domain_id, job_id, job_task_id): {kind: count, ..., 'flushed_at': timestamp}}
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flush_thread = None
+        self._flush_listeners = []
+        self.add_count = 0
+        self.flush_count = 0
+
+    def add(self, domain_id, job_id, job_task_id, created=0, updated=0, failure=0, processed=0):
+        """ Add stat of JobTask
+
+        Returns: True, if stat of JobTask is flushed to cache
+        """
+        flush_size = config.get_global('COLLECTOR_STAT_FLUSH_SIZE', _DEFAULT_FLUSH_SIZE)
+        flush_interval = config.get_global('COLLECTOR_STAT_FLUSH_INTERVAL', _DEFAULT_FLUSH_INTERVAL)
+        key = (domain_id, job_id, job_task_id)
+        now = time.time()
+
+        with self._lock:
+            self.add_count += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = dict.fromkeys(STAT_KINDS, 0)
+                pending['flushed_at'] = now
+                self._pending[key] = pending
+
+            pending['CREATED'] += created
+            pending['UPDATED'] += updated
+            pending['FAILURE'] += failure
+            pending['PROCESSED'] += processed
+
+            should_flush = flush_size <= 0 or flush_interval <= 0 or pending['PROCESSED'] >= flush_size \
+                or now - pending['flushed_at'] >= flush_interval
+
+        if should_flush:
+            self.flush(domain_id, job_id, job_task_id)
+        else:
+            self._start_flush_thread(flush_interval)
+
+        return should_flush
+
+    def add_flush_listener(self, listener):
+        """ listener(domain_id, job_id, job_task_id) is called after periodic flush of JobTask stat """
+        with self._lock:
+            if listener not in self._flush_listeners:
+                self._flush_listeners.append(listener)
+
+    def flush(self, domain_id=None, job_id=None, job_task_id=None):
+        """ Flush stat of JobTask to cache (all JobTasks, if job_task_id is None)
+
+        Returns: list of (domain_id, job_id, job_task_id) which are flushed
+        """
+        with self._lock:
+            if job_task_id:
+                key = (domain_id, job_id, job_task_id)
+                pending_list = [(key, self._pending.pop(key))] if key in self._pending else []
+            else:
+                pending_list = list(self._pending.items())
+                self._pending = {}
+
+        flushed_keys = []
+        for key, pending in pending_list:
+            if self._flush_to_cache(key, pending):
+                flushed_keys.append(key)
+
+        return flushed_keys
+
+    def get_stat(self):
+        return {
+            'add_count': self.add_count,
+            'flush_count': self.flush_count,
+            'pending': len(self._pending)
+        }
+
+    def _flush_to_cache(self, key, pending):
+        domain_id, job_id, job_task_id = key
+        amounts = {}
+        for kind in STAT_KINDS:
+            if pending[kind] > 0:
+                amounts[f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:{kind}'] = pending[kind]
+
+        if amounts:
+            try:
+                # All kinds are incremented at once, PROCESSED is the last one
+                increment_job_task_stats(amounts)
+            except Exception as e:
+                _LOGGER.error(f'[_flush_to_cache] failed to flush stat of {job_task_id}: {e}')
+                self._restore(key, pending)
+                return False
+
+        with self._lock:
+            self.flush_count += 1
+
+        return True
+
+    def _restore(self, key, pending):
+        """ Add remained counts again, they will be flushed next time """
+        with self._lock:
+            current = self._pending.setdefault(key, dict(dict.fromkeys(STAT_KINDS, 0), flushed_at=time.time()))
+            for kind in STAT_KINDS:
+                current[kind] += pending[kind]
+
+    def _start_flush_thread(self, flush_interval):
+        if self._flush_thread is not None:
+            return
+
+        with self._lock:
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(target=self._flush_periodically, args=(flush_interval,),
+                                                      daemon=True)
+                self._flush_thread.start()
+
+    def _flush_periodically(self, flush_interval):
+        while True:
+            time.sleep(flush_interval)
+            try:
+                flushed_keys = self.flush()
+            except Exception as e:
+                _LOGGER.error(f'[_flush_periodically] {e}')
+                continue
+
+            for domain_id, job_id, job_task_id in flushed_keys:
+                for listener in list(self._flush_listeners):
+                    try:
+                        listener(domain_id, job_id, job_task_id)
+                    except Exception as e:
+                        _LOGGER.error(f'[_flush_periodically] failed to call flush listener of {job_task_id}: {e}')
+
+
+job_task_stat_counter = JobTaskStatCounter()
@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+
+from spaceone.core import config
+
+_LOGGER = logging.getLogger(__name__)
+_DEFAULT_TTL = 300
+
+
+class PluginClientPool(object):
+    """
+    Process level pool of plugin endpoints and gRPC clients, which are reused across JobTasks in a worker
+
+    endpoints: {(plugin_id, version, domain_id): (endpoint, expire_time)}
+    clients: {(endpoint, version): client}
+    """
+
+    def __init__(self):
+        self._endpoints = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    def get_endpoint(self, plugin_id, version, domain_id, loader):
+        """ Get plugin endpoint (message)
+
+        Args:
+            loader (func): function which gets endpoint from plugin service, if endpoint is not cached
+        """
+        key = (plugin_id, version, domain_id)
+        now = time.time()
+
+        with self._lock:
+            cached = self._endpoints.get(key)
+            if cached and cached[1] > now:
+                return cached[0]
+
+        endpoint = loader()
+        expire_time = now + config.get_global('PLUGIN_ENDPOINT_CACHE_TTL', _DEFAULT_TTL)
+
+        with self._lock:
+            self._endpoints[key] = (endpoint, expire_time)
+
+        return endpoint
+
+    def get_client(self, endpoint, version, factory):
+        """ Get gRPC client of endpoint
+
+        Args:
+            endpoint (str): ex) grpc://plugin-xxx:50051
+            factory (func): function which creates client, if client is not pooled
+        """
+        key = (endpoint, version)
+
+        with self._lock:
+            if key in self._clients:
+                return self._clients[key]
+
+        client = factory()
+        if client is not None:
+            with self._lock:
+                self._clients[key] = client
+
+        return client
+
+    def invalidate(self, plugin_id, version, domain_id):
+        """ Remove endpoint and client of plugin (ex. connection failure) """
+        key = (plugin_id, version, domain_id)
+
+        with self._lock:
+            cached = self._endpoints.pop(key, None)
+
+        if cached:
+            self.invalidate_client(self._get_endpoint_str(cached[0]))
+
+    def invalidate_client(self, endpoint):
+        with self._lock:
+            for key in list(self._clients.keys()):
+                if key[0] == endpoint:
+                    _LOGGER.debug(f'[invalidate_client] remove client: {key}')
+                    del self._clients[key]
+
+    @staticmethod
+    def _get_endpoint_str(endpoint):
+        return getattr(endpoint, 'endpoint', endpoint).replace('"', '')
+
+
+plugin_client_pool = PluginClientPool()
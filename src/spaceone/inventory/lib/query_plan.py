@@ -0,0 +1,126 @@
+"""
+Check query plans of hot queries (collector and cleanup) on Server, CloudService and IPAddress
+Collection scans (COLLSCAN) mean that indexes of model meta are missing or not created yet
+
+usage: python -m spaceone.inventory.lib.query_plan --host mongodb://localhost:27017 --db inventory
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from pymongo import MongoClient
+
+from spaceone.inventory.model.cloud_service_model import CloudService
+from spaceone.inventory.model.ip_address_model import IPAddress
+from spaceone.inventory.model.server_model import Server
+
+NOT_DELETED = {'state': {'$ne': 'DELETED'}}
+
+
+def make_query_shapes(domain_id):
+    """ Raw filters which are same as queries of
+        - CollectingManager._query_with_match_rules (ResourceManager.find_resources)
+        - rule_matcher.match_resources (batch query)
+        - CleanupManager.update_collection_state and delete_resources_by_policy
+        - ServerManager/CloudServiceManager._append_state_query
+
+    Returns: {model: {query name: filter}}
+    """
+    updated_at = datetime.utcnow() - timedelta(hours=24)
+    domain = {'domain_id': domain_id}
+
+    def _and(*conditions):
+        return {'$and': [domain] + list(conditions)}
+
+    cleanup_queries = {
+        'cleanup_update_collection_state': _and({'updated_at': {'$lt': updated_at}},
+                                                {'collection_info.state': {'$nin': ['DISCONNECTED', 'MANUAL']}}),
+        'cleanup_delete_resources': _and({'updated_at': {'$lt': updated_at}},
+                                         {'collection_info.state': 'DISCONNECTED'})
+    }
+
+    return {
+        Server: dict({
+            'match_reference': _and({'reference.resource_id': 'arn:aws:ec2:i-00000000'}, NOT_DELETED),
+            'match_reference_batch': _and({'reference.resource_id': {'$in': ['arn:1', 'arn:2']}}, NOT_DELETED),
+            'match_instance_id': _and({'data.compute.instance_id': 'i-00000000'}, NOT_DELETED),
+            'list_servers': _and(NOT_DELETED)
+        }, **{name: _and(query['$and'][1], query['$and'][2], NOT_DELETED)
+              for name, query in cleanup_queries.items()}),
+        CloudService: dict({
+            'match_reference': _and({'reference.resource_id': 'arn:aws:ec2:sg-00000000'}, NOT_DELETED),
+            'match_reference_batch': _and({'reference.resource_id': {'$in': ['arn:1', 'arn:2']}}, NOT_DELETED),
+            'match_cloud_service_type': _and({'provider': 'aws'}, {'cloud_service_group': 'EC2'},
+                                             {'cloud_service_type': 'SecurityGroup'}, NOT_DELETED),
+            'list_cloud_services': _and(NOT_DELETED)
+        }, **{name: _and(query['$and'][1], query['$and'][2], NOT_DELETED)
+              for name, query in cleanup_queries.items()}),
+        IPAddress: dict({
+            'match_reference': _and({'reference.resource_id': 'eni-00000000'}),
+            'match_ip_address': _and({'ip_address': '10.0.0.1'})
+        }, **cleanup_queries)
+    }
+
+
+def find_stages(plan, stage_name):
+    """ Find stages (dict) of stage_name in query plan """
+    stages = []
+    if isinstance(plan, dict):
+        if plan.get('stage') == stage_name:
+            stages.append(plan)
+
+        for value in plan.values():
+            stages += find_stages(value, stage_name)
+
+    elif isinstance(plan, list):
+        for value in plan:
+            stages += find_stages(value, stage_name)
+
+    return stages
+
+
+def check_query_plans(db, domain_id='domain-00000000'):
+    """ Explain query shapes
+
+    Returns: list of {
+        'collection': str,
+        'query': str,
+        'collscan': bool,
+        'indexes': list of index name used by winning plan
+    }
+    """
+    results = []
+    for model, queries in make_query_shapes(domain_id).items():
+        collection = db[model._get_collection_name()]
+        for name, query_filter in queries.items():
+            explain = collection.find(query_filter).explain()
+            winning_plan = explain.get('queryPlanner', {}).get('winningPlan', {})
+            results.append({
+                'collection': collection.name,
+                'query': name,
+                'collscan': len(find_stages(winning_plan, 'COLLSCAN')) > 0,
+                'indexes': sorted(set(stage.get('indexName') for stage in find_stages(winning_plan, 'IXSCAN')))
+            })
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check query plans of inventory hot queries')
+    parser.add_argument('--host', default='mongodb://localhost:27017', help='MongoDB URI')
+    parser.add_argument('--db', default='inventory', help='Database name')
+    parser.add_argument('--domain-id', default='domain-00000000', help='domain_id of query shapes')
+    args = parser.parse_args()
+
+    results = check_query_plans(MongoClient(args.host)[args.db], args.domain_id)
+    for result in results:
+        plan = 'COLLSCAN' if result['collscan'] else ', '.join(result['indexes'])
+        print(f'{result["collection"]:<16} {result["query"]:<36} {plan}')
+
+    collscans = [result for result in results if result['collscan']]
+    print(f'\n{len(collscans)} of {len(results)} queries use collection scan')
+    return 1 if collscans else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
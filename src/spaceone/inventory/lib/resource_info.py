@@ -0,0 +1,68 @@
+from google.protobuf.descriptor import FieldDescriptor
+from google.protobuf.json_format import MessageToDict
+
+STRUCT_TYPES = ['google.protobuf.Struct', 'google.protobuf.ListValue', 'google.protobuf.Value']
+
+
+def value_to_python(value):
+    """ Convert google.protobuf.Value to python value (same result as MessageToDict) """
+    kind = value.WhichOneof('kind')
+    if kind == 'struct_value':
+        return struct_to_dict(value.struct_value)
+    elif kind == 'list_value':
+        return list_value_to_list(value.list_value)
+    elif kind == 'string_value':
+        return value.string_value
+    elif kind == 'number_value':
+        return value.number_value
+    elif kind == 'bool_value':
+        return value.bool_value
+    else:
+        return None
+
+
+def struct_to_dict(struct):
+    """ Convert google.protobuf.Struct to dict without reflection of MessageToDict """
+    return {key: value_to_python(value) for key, value in struct.fields.items()}
+
+
+def list_value_to_list(list_value):
+    return [value_to_python(value) for value in list_value.values]
+
+
+def message_to_dict(message):
+    """ Convert ResourceInfo message from collector plugin to dict
+    Same result as MessageToDict(message, preserving_proto_field_name=True),
+    but Struct fields (resource, match_rules) are converted without reflection of MessageToDict
+    """
+    message_dict = {}
+    other_fields = []
+
+    for field, value in message.ListFields():
+        if field.message_type and field.message_type.full_name in STRUCT_TYPES \
+                and field.label != FieldDescriptor.LABEL_REPEATED:
+            message_dict[field.name] = _convert_struct(value)
+        elif field.type == FieldDescriptor.TYPE_ENUM and field.label != FieldDescriptor.LABEL_REPEATED:
+            enum_value = field.enum_type.values_by_number.get(value)
+            message_dict[field.name] = enum_value.name if enum_value else value
+        elif field.type == FieldDescriptor.TYPE_MESSAGE or field.label == FieldDescriptor.LABEL_REPEATED:
+            other_fields.append(field.name)
+        else:
+            message_dict[field.name] = value
+
+    if other_fields:
+        other_dict = MessageToDict(message, preserving_proto_field_name=True)
+        for field_name in other_fields:
+            message_dict[field_name] = other_dict.get(field_name)
+
+    return message_dict
+
+
+def _convert_struct(value):
+    full_name = value.DESCRIPTOR.full_name
+    if full_name == 'google.protobuf.Struct':
+        return struct_to_dict(value)
+    elif full_name == 'google.protobuf.ListValue':
+        return list_value_to_list(value)
+    else:
+        return value_to_python(value)
@@ -1,18 +1,34 @@
+import logging
+from datetime import datetime
+from mongoengine import GenericReferenceField, LazyReferenceField, ListField, ReferenceField
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
 from spaceone.core import utils
 from spaceone.core.error import *
 
+_LOGGER = logging.getLogger(__name__)
+QUERY_BATCH_SIZE = 1000
+
 
 class ResourceManager(object):
 
     resource_keys: list = None
     query_method = None
+    model_name = None           # model for raw (PyMongo) lookup of find_resources
 
     """
     This is used by collector
     """
     def query_resources(self, query, change_rules):
-        secrets = []
-        only = ['collection_info.secrets']
+        """ Collect distinct values of resource_key (as change_key) and secrets of resources
+        Resources are read in batches with projection, so memory is bounded by number of distinct values
+
+        Returns:
+            change_values (dict): {change_key: list of values}
+            secrets (list): list of secret_id
+        """
+        secrets = set()
         change_values = {}
         change_key_map = {}
         for rule in change_rules:
@@ -20,27 +36,61 @@ class ResourceManager(object):
             change_key = rule['change_key']
 
             change_key_map[resource_key] = change_key
-            change_values[change_key] = []
-            only.append(resource_key)
+            change_values[change_key] = set()
 
-        vos, total_count = getattr(self, self.query_method)(query)
-
-        for vo in vos:
-            data = vo.to_dict()
+        keys = list(change_key_map.keys()) + ['collection_info.secrets']
+        for data in self._iterate_resource_values(query, keys):
             for resource_key, change_key in change_key_map.items():
-                value = utils.get_dict_value(data, resource_key)
-                if value:
-                    change_values[change_key].append(value)
+                _add_values(change_values[change_key], data.get(resource_key))
+
+            secrets.update(data.get('collection_info.secrets') or [])
 
-            secrets = secrets + utils.get_dict_value(data, 'collection_info.secrets', [])
+        return {key: list(values) for key, values in change_values.items()}, list(secrets)
 
-        for key, values in change_values.items():
-            change_values[key] = list(set(values))
+    def _iterate_resource_values(self, query, keys):
+        """ Iterate values of keys of resources
+        Returns: generator of {key: value}
+        """
+        raw_filter = self._make_raw_filter(query)
+        if raw_filter is None:
+            query['only'] = keys
+            vos, total_count = getattr(self, self.query_method)(query)
+            for vo in vos:
+                data = vo.to_dict()
+                yield {key: utils.get_dict_value(data, key) for key in keys}
 
-        return change_values, list(set(secrets))
+            return
+
+        model = self.locator.get_model(self.model_name)
+        db_keys = {}
+        for key in keys:
+            field_name, _, sub_key = key.partition('.')
+            db_field = model._fields[field_name].db_field if field_name in model._fields else field_name
+            db_keys[key] = f'{db_field}.{sub_key}' if sub_key else db_field
+
+        projection = {db_key: True for db_key in db_keys.values()}
+        projection['_id'] = False
+
+        try:
+            cursor = model._get_collection().find(raw_filter, projection).batch_size(QUERY_BATCH_SIZE)
+            for doc in cursor:
+                yield {key: utils.get_dict_value(doc, db_key) for key, db_key in db_keys.items()}
+        except Exception as e:
+            raise ERROR_DB_QUERY(reason=e)
 
     def find_resources(self, query):
+        """ Find resource_keys of resources
+
+        Returns:
+            resources (list): list of resource_keys dict
+            total_count (int): number of resources (2 means 2 or more, if it is found by raw lookup)
+        """
         self._check_resource_finder_state()
+
+        raw_filter = self._make_raw_filter(query)
+        if raw_filter is not None:
+            return self._find_resources_by_raw_filter(raw_filter)
+
         query['only'] = self.resource_keys
 
         resources = []
@@ -55,6 +105,257 @@ class ResourceManager(object):
 
         return resources, total_count
 
+    def _find_resources_by_raw_filter(self, raw_filter):
+        """ Find at most 2 resources with PyMongo projection, without MongoEngine documents and count
+        It is enough for match rules (0: create, 1: update, 2: ambiguous)
+        """
+        model = self.locator.get_model(self.model_name)
+        projection = {'_id': False}
+        for key in self.resource_keys:
+            projection[model._fields[key].db_field] = True
+
+        try:
+            cursor = model._get_collection().find(raw_filter, projection).limit(2)
+            resources = [{key: doc.get(model._fields[key].db_field) for key in self.resource_keys} for doc in cursor]
+        except Exception as e:
+            raise ERROR_DB_QUERY(reason=e)
+
+        return resources, len(resources)
+
+    def _make_raw_filter(self, query):
+        """ Convert filter and filter_or of query (eq, in, not) to PyMongo filter
+        Returns: filter (dict), None if it can not be converted (use query_method)
+        """
+        if not self.model_name or set(query.keys()) - {'filter', 'filter_or', 'only'}:
+            return None
+
+        # Same default filter as query_method (ex. except DELETED state)
+        query = {'filter': list(query.get('filter', [])), 'filter_or': list(query.get('filter_or', []))}
+        append_state_query = getattr(self, '_append_state_query', None)
+        if append_state_query:
+            query = append_state_query(query)
+
+        model = self.locator.get_model(self.model_name)
+        conditions = [self._make_raw_condition(model, condition) for condition in query.get('filter', [])]
+        or_conditions = [self._make_raw_condition(model, condition) for condition in query.get('filter_or', [])]
+        if None in conditions or None in or_conditions:
+            return None
+
+        # Empty filter_or has no condition, same as query_method
+        if len(or_conditions) > 0:
+            conditions.append({'$or': or_conditions})
+
+        if len(conditions) == 0:
+            return None
+
+        return {'$and': conditions}
+
+    @staticmethod
+    def _make_raw_condition(model, condition):
+        """ Returns: condition (dict), None if it can not be converted """
+        key = condition.get('k', condition.get('key'))
+        value = condition.get('v', condition.get('value'))
+        operator = condition.get('o', condition.get('operator'))
+
+        field_name, _, sub_key = key.partition('.')
+        field = model._fields.get(field_name)
+        if field is None or key in model._meta.get('change_query_keys', {}) or _is_reference_field(field):
+            return None
+
+        db_key = f'{field.db_field}.{sub_key}' if sub_key else field.db_field
+        if operator == 'eq':
+            return {db_key: value}
+        elif operator == 'in' and isinstance(value, list):
+            return {db_key: {'$in': value}}
+        elif operator == 'not':
+            return {db_key: {'$ne': value}}
+
+        return None
+
+    def find_resources_with_values(self, query, keys):
+        """ Same as find_resources, but values of keys are returned together
+
+        Returns:
+            resources (list): list of tuple (resource_keys dict, {key: value})
+        """
+        self._check_resource_finder_state()
+        query['only'] = self.resource_keys + keys
+
+        resources = []
+        vos, total_count = getattr(self, self.query_method)(query)
+
+        for vo in vos:
+            data = {}
+            for resource_key in self.resource_keys:
+                data[resource_key] = getattr(vo, resource_key)
+
+            vo_data = vo.to_dict()
+            values = {}
+            for key in keys:
+                values[key] = utils.get_dict_value(vo_data, key)
+
+            resources.append((data, values))
+
+        return resources
+
+    """
+    Bulk write mode for collector
+    Create or update methods return the changed vo without writing,
+    then collector writes all of them with bulk_write_resources
+    """
+    def is_bulk_write_mode(self):
+        return self.transaction.get_meta('collector.bulk_write') is True
+
+    @staticmethod
+    def make_resource_vo(model, params):
+        create_data = {}
+        for name, field in model._fields.items():
+            if name in params:
+                create_data[name] = params[name]
+            else:
+                generate_id = getattr(field, 'generate_id', None)
+                if generate_id:
+                    create_data[name] = utils.generate_id(generate_id)
+
+                if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                    create_data[name] = datetime.utcnow()
+
+        try:
+            resource_vo = model(**create_data)
+            resource_vo.validate()
+        except Exception as e:
+            raise ERROR_DB_QUERY(reason=e)
+
+        return resource_vo
+
+    @staticmethod
+    def update_resource_vo(params, resource_vo):
+        updatable_fields = resource_vo._meta.get('updatable_fields', [])
+
+        for key, value in params.items():
+            if key in updatable_fields:
+                if value is not None:
+                    value = resource_vo._fields[key].to_python(value)
+                setattr(resource_vo, key, value)
+
+        if 'updated_at' in resource_vo._fields:
+            resource_vo.updated_at = datetime.utcnow()
+
+        try:
+            resource_vo.validate()
+        except Exception as e:
+            raise ERROR_DB_QUERY(reason=e)
+
+        return resource_vo
+
+    def add_update_rollback(self, resource_vo, params):
+        """ Rollback policy of update (transaction meta: collector.rollback_policy)
+            FULL: snapshot of whole document (default)
+            CHANGED: snapshot of fields in update params only
+            NONE: no rollback (idempotent upsert of collector)
+        """
+        policy = self.transaction.get_meta('collector.rollback_policy') or 'FULL'
+
+        if policy == 'NONE':
+            return
+        elif policy == 'CHANGED':
+            old_data = {}
+            for key in params.keys():
+                if key in resource_vo._meta.get('updatable_fields', []):
+                    old_data[key] = resource_vo._fields[key].to_mongo(getattr(resource_vo, key)) \
+                        if getattr(resource_vo, key) is not None else None
+        else:
+            old_data = resource_vo.to_dict()
+
+        def _rollback(old_data):
+            _LOGGER.info(f'[ROLLBACK] Revert Data : {self._get_resource_key_values(resource_vo)}')
+            resource_vo.update(old_data)
+
+        self.transaction.add_rollback(_rollback, old_data)
+
+    def _get_resource_key_values(self, resource_vo):
+        return {key: getattr(resource_vo, key, None) for key in (self.resource_keys or [])}
+
+    def is_partial_update_mode(self):
+        """ Partial update is used by collector only (transaction meta: collector.partial_update) """
+        return self.transaction.get_meta('collector.partial_update') is True
+
+    def update_resource_vo_partially(self, params, resource_vo):
+        """ Update resource with $set/$unset of changed (dotted) paths only, ex) data.compute.instance_state
+        Whole document is not rewritten, and document is not reloaded after update
+        In bulk write mode, update is written by bulk_write_resources
+        """
+        old_data = resource_vo.to_mongo().to_dict()
+        self.update_resource_vo(params, resource_vo)
+        update_data = make_partial_update(old_data, resource_vo.to_mongo().to_dict())
+
+        if self.is_bulk_write_mode():
+            resource_vo._partial_update = update_data
+            return resource_vo
+
+        if update_data:
+            try:
+                resource_vo._get_collection().update_one({'_id': resource_vo.pk}, update_data)
+            except Exception as e:
+                raise ERROR_DB_QUERY(reason=e)
+
+        resource_vo._clear_changed_fields()
+        return resource_vo
+
+    def touch_resource_vo(self, resource_vo):
+        """ Update only updated_at of unchanged resource, for cleanup of not collected resources """
+        if self.is_bulk_write_mode():
+            return self.update_resource_vo({}, resource_vo)
+
+        updated_at = datetime.utcnow()
+        try:
+            resource_vo._get_collection().update_one({'_id': resource_vo.pk}, {'$set': {'updated_at': updated_at}})
+        except Exception as e:
+            raise ERROR_DB_QUERY(reason=e)
+
+        return resource_vo
+
+    @staticmethod
+    def bulk_write_resources(resource_vos):
+        """ Insert new vos and update changed fields of existing vos with one bulk_write
+
+        Returns:
+            errors (dict): {index of resource_vos: error message}
+        """
+        operations = []
+        operation_index = []
+        for idx, resource_vo in enumerate(resource_vos):
+            if resource_vo.pk is None:
+                operations.append(InsertOne(resource_vo.to_mongo()))
+            else:
+                update_data = getattr(resource_vo, '_partial_update', None)
+                if update_data is None:
+                    set_data, unset_data = resource_vo._delta()
+                    update_data = {}
+                    if set_data:
+                        update_data['$set'] = set_data
+                    if unset_data:
+                        update_data['$unset'] = unset_data
+                else:
+                    resource_vo._partial_update = None
+
+                if update_data == {}:
+                    continue
+
+                operations.append(UpdateOne({'_id': resource_vo.pk}, update_data))
+
+            operation_index.append(idx)
+
+        errors = {}
+        if len(operations) > 0:
+            try:
+                resource_vos[0]._get_collection().bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                for write_error in e.details.get('writeErrors', []):
+                    errors[operation_index[write_error['index']]] = write_error.get('errmsg')
+
+        return errors
+
     def update_collection_state(self, query, state):
         self._check_resource_finder_state()
         query['only'] = self.resource_keys + ['collection_info']
@@ -95,13 +396,9 @@ class ResourceManager(object):
         return resources, total_count
 
     def _update_collection_state_by_vo(self, resource_vo, state):
-        def _rollback(old_data):
-            print(f'[ROLLBACK] Revert Data : {old_data["name"]})')
-            resource_vo.update(old_data)
-
-        self.transaction.add_rollback(_rollback, resource_vo.to_dict())
         params = resource_vo.to_dict()['collection_info']
         params.update({'state': state})
+        self.add_update_rollback(resource_vo, {'collection_info': params})
         return resource_vo.update({'collection_info': params})
 
     def _check_resource_finder_state(self):
@@ -110,3 +407,69 @@ class ResourceManager(object):
 
         if getattr(self, self.query_method, None) is None:
             raise ERROR_UNKNOWN(message='ResourceManager is not set.')
+
+
+def make_partial_update(old_data, new_data):
+    """ Make update operators for changed paths of document
+
+    Args:
+        old_data (dict): document before update (to_mongo)
+        new_data (dict): document after update (to_mongo)
+
+    Returns: {'$set': {path: value}, '$unset': {path: ''}} (empty dict, if nothing is changed)
+    """
+    set_data = {}
+    unset_data = {}
+    _diff_dict(old_data, new_data, '', set_data, unset_data)
+
+    update_data = {}
+    if set_data:
+        update_data['$set'] = set_data
+    if unset_data:
+        update_data['$unset'] = unset_data
+
+    return update_data
+
+
+def _diff_dict(old_data, new_data, prefix, set_data, unset_data):
+    for key, value in new_data.items():
+        if key == '_id' and prefix == '':
+            continue
+
+        path = f'{prefix}{key}'
+        old_value = old_data.get(key)
+        if key in old_data and old_value == value:
+            continue
+
+        if isinstance(value, dict) and isinstance(old_value, dict) and len(value) > 0 \
+                and all(_is_path_key(sub_key) for sub_key in list(value) + list(old_value)):
+            _diff_dict(old_value, value, f'{path}.', set_data, unset_data)
+        else:
+            set_data[path] = value
+
+    for key in old_data.keys():
+        if key not in new_data:
+            unset_data[f'{prefix}{key}'] = ''
+
+
+def _is_path_key(key):
+    return isinstance(key, str) and key != '' and '.' not in key and not key.startswith('$')
+
+
+def _is_reference_field(field):
+    if isinstance(field, ListField):
+        field = field.field
+
+    return isinstance(field, (ReferenceField, LazyReferenceField, GenericReferenceField))
+
+
+def _add_values(values, value):
+    if not value:
+        return
+
+    for v in (value if isinstance(value, list) else [value]):
+        try:
+            values.add(v)
+        except TypeError:
+            # unhashable value (ex. dict) can not be used as filter value
+            pass
@@ -1,3 +1,6 @@
+import itertools
+
+
 def add_domain_id(query, domain_id: str):
     q = {'k': 'domain_id', 'v': domain_id, 'o': 'eq'}
     query.append(q)
@@ -54,3 +57,130 @@ def make_query(key, rules, resource, domain_id):
 
     query = {'filter': query}
     return query
+
+
+def make_batch_query(keys, values_list, domain_id):
+    """
+    make one query for many resources at same match order
+    :param keys: rule keys of match order, e.g ['zone_id', 'data.ip_addresses']
+    :param values_list: list of rule values tuple, e.g [('zone-1', '10.0.0.1'), ('zone-1', '10.0.0.2')]
+    :return: query which matches superset of resources (exact match is done by match_resources)
+    """
+    query = []
+    query = add_domain_id(query, domain_id)
+    for i, key in enumerate(keys):
+        values = list(set([values[i] for values in values_list]))
+        query.append({'k': key, 'v': values, 'o': 'in'})
+
+    query = {'filter': query}
+    return query
+
+
+def match_resources(resources, rules, domain_id, finder):
+    """
+    match many resources with match rules by one query per match order
+    like make_query, rule keys which have no value in resource are not used for matching
+    :param resources: list of resource data from collector
+    :param rules: match rules, e.g {1:['data.vm.vm_id'], 2:['zone_id', 'data.ip_addresses']}
+    :param domain_id:
+    :param finder: function(query, keys) returns list of (resource_id, {key: value})
+    :return: tuple of
+        matched_resources: {index: list of resource_id}, more than one resource_id means ambiguous
+        duplicated_resources: {index: first index}, same resource appears more than once in resources
+        fallback_indexes: list of index which can not be matched in batch, use make_query instead
+    """
+    matched_resources = {}
+    duplicated_resources = {}
+    fallback_indexes = []
+    first_values = {}
+
+    pending_indexes = list(range(len(resources)))
+    if len(rules) == 0:
+        return matched_resources, duplicated_resources, pending_indexes
+
+    for order in sorted(rules.keys()):
+        if len(pending_indexes) == 0:
+            break
+
+        # group resources by rule keys which have value
+        groups = {}
+        for idx in pending_indexes:
+            keys, values = _get_match_values(resources[idx], rules[order])
+            if keys is None:
+                fallback_indexes.append(idx)
+                continue
+
+            if idx not in first_values:
+                first_values[idx] = (keys, values)
+
+            groups[keys] = groups.get(keys, {})
+            groups[keys][idx] = values
+
+        next_indexes = []
+        for keys, values_by_index in groups.items():
+            query = make_batch_query(keys, list(values_by_index.values()), domain_id)
+            found_resources = _make_match_index(finder(query, list(keys)), keys)
+
+            for idx, values in values_by_index.items():
+                res_info = found_resources.get(values, [])
+                matched_resources[idx] = res_info
+                if len(res_info) != 1:
+                    next_indexes.append(idx)
+
+        pending_indexes = sorted(next_indexes)
+
+    # New resources, which have same values at first match order, will be created more than once
+    new_resources = {}
+    for idx in sorted(first_values.keys()):
+        if idx not in fallback_indexes and len(matched_resources.get(idx, [])) == 0:
+            if first_values[idx] in new_resources:
+                duplicated_resources[idx] = new_resources[first_values[idx]]
+            else:
+                new_resources[first_values[idx]] = idx
+
+    for idx in fallback_indexes:
+        matched_resources.pop(idx, None)
+
+    return matched_resources, duplicated_resources, fallback_indexes
+
+
+def _get_match_values(resource, rule_keys):
+    """
+    :return: (tuple of keys, tuple of values) which have value in resource
+             (None, None), if it can not be matched in batch
+    """
+    keys = []
+    values = []
+    for key in rule_keys:
+        v = find_data(resource, key)
+        if v:
+            if not isinstance(v, (str, int, float)):
+                return None, None
+
+            keys.append(key)
+            values.append(v)
+
+    if len(keys) == 0:
+        return None, None
+
+    return tuple(keys), tuple(values)
+
+
+def _make_match_index(found_resources, keys):
+    """
+    :param found_resources: list of (resource_id, {key: value})
+    :return: {tuple of rule values: list of resource_id}
+    """
+    match_index = {}
+    for resource_id, values in found_resources:
+        candidates = []
+        for key in keys:
+            value = values.get(key)
+            candidates.append(value if isinstance(value, list) else [value])
+
+        for values_tuple in itertools.product(*candidates):
+            match_index[values_tuple] = match_index.get(values_tuple, [])
+            if resource_id not in match_index[values_tuple]:
+                match_index[values_tuple].append(resource_id)
+
+    return match_index
@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+
+from spaceone.core import config
+
+try:
+    from cryptography.fernet import Fernet
+except ImportError:
+    Fernet = None
+
+_LOGGER = logging.getLogger(__name__)
+_DEFAULT_SECRET_TTL = 300
+_DEFAULT_SECRET_DATA_TTL = 60
+
+
+class SecretCache(object):
+    """
+    Process level cache of secrets, scoped by domain_id
+
+    secrets: {domain_id: {secret_id: (secret, expire_time)}}
+    secret_data: {domain_id: {secret_id: (message class, encrypted message, expire_time)}}
+
+    secret_data is encrypted with key which is generated per process,
+    it is not cached if cryptography package is not installed.
+    """
+
+    def __init__(self):
+        self._secrets = {}
+        self._secret_data = {}
+        self._lock = threading.Lock()
+        self._fernet = Fernet(Fernet.generate_key()) if Fernet else None
+        if self._fernet is None:
+            _LOGGER.warning('[SecretCache] cryptography is not installed, secret_data is not cached')
+
+    def get_secret(self, secret_id, domain_id):
+        with self._lock:
+            cached = self._secrets.get(domain_id, {}).get(secret_id)
+
+        if cached and cached[1] > time.time():
+            return cached[0]
+
+        return None
+
+    def set_secret(self, secret_id, domain_id, secret):
+        expire_time = time.time() + config.get_global('SECRET_CACHE_TTL', _DEFAULT_SECRET_TTL)
+        with self._lock:
+            self._secrets.setdefault(domain_id, {})[secret_id] = (secret, expire_time)
+
+    def get_secret_data(self, secret_id, domain_id):
+        """ Returns: new message of secret_data, otherwise, None """
+        if self._fernet is None:
+            return None
+
+        with self._lock:
+            cached = self._secret_data.get(domain_id, {}).get(secret_id)
+
+        if cached is None or cached[2] <= time.time():
+            return None
+
+        message_class, encrypted, expire_time = cached
+        secret_data = message_class()
+        secret_data.ParseFromString(self._fernet.decrypt(encrypted))
+        return secret_data
+
+    def set_secret_data(self, secret_id, domain_id, secret_data):
+        if self._fernet is None:
+            return
+
+        encrypted = self._fernet.encrypt(secret_data.SerializeToString())
+        expire_time = time.time() + config.get_global('SECRET_DATA_CACHE_TTL', _DEFAULT_SECRET_DATA_TTL)
+        with self._lock:
+            self._secret_data.setdefault(domain_id, {})[secret_id] = (type(secret_data), encrypted, expire_time)
+
+    def invalidate(self, domain_id, secret_id=None):
+        """ Remove secret and secret_data of domain (all secrets of domain, if secret_id is None) """
+        with self._lock:
+            if secret_id:
+                self._secrets.get(domain_id, {}).pop(secret_id, None)
+                self._secret_data.get(domain_id, {}).pop(secret_id, None)
+            else:
+                self._secrets.pop(domain_id, None)
+                self._secret_data.pop(domain_id, None)
+
+
+secret_cache = SecretCache()
@@ -12,12 +12,16 @@ class CloudServiceManager(BaseManager, ResourceManager):
 
     resource_keys = ['cloud_service_id']
     query_method = 'list_cloud_services'
+    model_name = 'CloudService'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.cloud_svc_model: CloudService = self.locator.get_model('CloudService')
 
     def create_cloud_service(self, params):
+        if self.is_bulk_write_mode():
+            return self.make_resource_vo(self.cloud_svc_model, params)
+
         def _rollback(cloud_svc_vo):
             _LOGGER.info(
                 f'[ROLLBACK] Delete Cloud Service : {cloud_svc_vo.provider} ({cloud_svc_vo.cloud_service_type})')
@@ -33,11 +37,17 @@ class CloudServiceManager(BaseManager, ResourceManager):
                                                self.get_cloud_service(params['cloud_service_id'], params['domain_id']))
 
     def update_cloud_service_by_vo(self, params, cloud_svc_vo):
-        def _rollback(old_data):
-            _LOGGER.info(f'[ROLLBACK] Revert Data : {old_data.get("cloud_service_id")}')
-            cloud_svc_vo.update(old_data)
+        if self.is_bulk_write_mode():
+            if self.is_partial_update_mode():
+                return self.update_resource_vo_partially(params, cloud_svc_vo)
+
+            return self.update_resource_vo(params, cloud_svc_vo)
+
+        self.add_update_rollback(cloud_svc_vo, params)
+
+        if self.is_partial_update_mode():
+            return self.update_resource_vo_partially(params, cloud_svc_vo)
 
-        self.transaction.add_rollback(_rollback, cloud_svc_vo.to_dict())
         return cloud_svc_vo.update(params)
 
     def delete_cloud_service(self, cloud_service_id, domain_id):
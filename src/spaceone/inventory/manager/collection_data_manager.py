@@ -1,13 +1,25 @@
 import logging
-from datetime import datetime
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta
 
-from spaceone.core import utils
+from spaceone.core import config, utils
 from spaceone.core.manager import BaseManager
 from spaceone.inventory.manager.collector_manager import CollectorManager
+from spaceone.inventory.lib import history_diff
+from spaceone.inventory.lib.collector_metrics import collector_metrics, MERGE
+from spaceone.inventory.lib.collector_priority_cache import collector_priority_cache
 from spaceone.inventory.error import *
 
 _LOGGER = logging.getLogger(__name__)
 _DEFAULT_PRIORITY = 10
+_DEFAULT_CHANGE_HISTORY_RETENTION_DAYS = 30
+
+# INLINE: diff in change_history (legacy), COMPACT: no diff, COLLECTION: diff in ResourceChangeHistory
+CHANGE_HISTORY_MODES = ['INLINE', 'COMPACT', 'COLLECTION']
+RESOURCE_ID_KEYS = ['server_id', 'cloud_service_id', 'cloud_service_type_id', 'subnet_id', 'network_policy_id',
+                    'network_id', 'device_id', 'ip_address']
 
 
 class CollectionDataManager(BaseManager):
@@ -20,12 +32,17 @@ class CollectionDataManager(BaseManager):
         self.merged_data = {}
         self.is_changed = False
         self.exclude_keys = []
+        self.fingerprint = None
         self.collector_mgr: CollectorManager = self.locator.get_manager('CollectorManager')
         self.job_id = self.transaction.get_meta('job_id')
         self.collector_id = self.transaction.get_meta('collector_id')
         self.secret_id = self.transaction.get_meta('secret.secret_id')
         self.service_account_id = self.transaction.get_meta('secret.service_account_id')
         self.updated_at = datetime.utcnow()
+        self.change_history_mode = config.get_global('COLLECTOR_CHANGE_HISTORY_MODE', 'INLINE')
+        if self.change_history_mode not in CHANGE_HISTORY_MODES:
+            _LOGGER.warning(f'[CollectionDataManager] unknown change history mode: {self.change_history_mode}')
+            self.change_history_mode = 'INLINE'
 
     def create_new_history(self, resource_data, **kwargs):
         self.exclude_keys = kwargs.get('exclude_keys', [])
@@ -73,6 +90,7 @@ class CollectionDataManager(BaseManager):
                 'priority': priority,
                 'data': data,
                 'job_id': self.job_id,
+                'fingerprint': self._make_fingerprint(data),
                 'updated_by': updated_by,
                 'updated_at': self.updated_at
             }
@@ -95,6 +113,8 @@ class CollectionDataManager(BaseManager):
                 raise ERROR_NOT_ALLOW_PINNING_KEYS(key=key)
 
         collection_info['pinned_keys'] = keys
+        # Merge all data at next collection
+        collection_info['fingerprint'] = None
 
         return collection_info
 
@@ -106,7 +126,32 @@ class CollectionDataManager(BaseManager):
 
         return change_keys
 
+    def is_unchanged_data(self, resource_data, resource_vo, **kwargs):
+        """ Check whether collected data is same as the last collected data of this collector
+        If it is same, merge and update can be skipped (only updated_at needs to be touched)
+        """
+        if not self.collector_id:
+            return False
+
+        self.fingerprint = self._make_data_fingerprint(resource_data, kwargs.get('exclude_keys', []))
+
+        collection_info = resource_vo.collection_info
+        if collection_info is None or collection_info.fingerprint != self.fingerprint:
+            return False
+
+        if collection_info.state != 'ACTIVE' or self.collector_id not in collection_info.collectors:
+            return False
+
+        if self.secret_id and self.secret_id not in collection_info.secrets:
+            return False
+
+        if self.service_account_id and self.service_account_id not in collection_info.service_accounts:
+            return False
+
+        return True
+
     def merge_data_by_history(self, resource_data, old_data, **kwargs):
+        start = time.time()
         self.exclude_keys = kwargs.get('exclude_keys', [])
         collection_info = old_data['collection_info']
         all_collectors = collection_info.get('collectors', [])
@@ -114,9 +159,17 @@ class CollectionDataManager(BaseManager):
         all_secrets = collection_info.get('secrets', [])
         pinned_keys = collection_info.get('pinned_keys', [])
         state = collection_info['state']
+        fingerprint = None
 
         if self.collector_id:
-            if self.collector_id not in all_secrets:
+            if self.fingerprint is None:
+                self.fingerprint = self._make_data_fingerprint(resource_data, self.exclude_keys)
+
+            fingerprint = self.fingerprint
+            if fingerprint != collection_info.get('fingerprint'):
+                self.is_changed = True
+
+            if self.collector_id not in all_collectors:
                 all_collectors.append(self.collector_id)
                 self.is_changed = True
 
@@ -151,12 +204,20 @@ class CollectionDataManager(BaseManager):
             'service_accounts': sorted(list(set(all_service_accounts))),
             'secrets': sorted(list(set(all_secrets))),
             'change_history': self._make_change_history(self.old_history),
-            'pinned_keys': pinned_keys
+            'pinned_keys': pinned_keys,
+            'fingerprint': fingerprint
         }
 
         if self.is_changed:
             self.merged_data['collection_info'] = updated_collection_info
 
+        if self.change_history_mode == 'COLLECTION':
+            self._save_change_history_diff(old_data)
+
+        if self.collector_id != 'MANUAL':
+            collector_metrics.observe(MERGE, time.time() - start, self.collector_id,
+                                      self.transaction.get_meta('collector.resource_type'))
+
         return self.merged_data
 
     def _merge_data_from_history(self, old_data):
@@ -166,8 +227,10 @@ class CollectionDataManager(BaseManager):
             if key in self.old_history:
                 old_priority = self.old_history[key]['priority']
                 old_value = self.old_history[key]['data']
-                if new_priority <= old_priority and new_value != old_value:
-                    history_info['diff'] = self._get_history_diff(old_value, new_value)
+                if new_priority <= old_priority and not self._is_same_history_data(history_info,
+                                                                                   self.old_history[key]):
+                    if self.change_history_mode != 'COMPACT':
+                        history_info['diff'] = self._get_history_diff(old_value, new_value)
                     self.old_history[key] = history_info
                     self._update_merge_data(key, new_value)
                     self.is_changed = True
@@ -182,27 +245,29 @@ class CollectionDataManager(BaseManager):
             self.merged_data['data'] = temp_data
 
     @staticmethod
-    def _get_history_diff(old_data, new_data):
-        if isinstance(old_data, list) and isinstance(new_data, list):
-            history_diff = {
-                'insert': [],
-                'delete': []
-            }
+    def _is_same_history_data(new_history, old_history):
+        new_fingerprint = new_history.get('fingerprint')
+        if new_fingerprint and new_fingerprint == old_history.get('fingerprint'):
+            return True
 
-            for value in old_data:
-                if value not in new_data:
-                    history_diff['delete'].append(value)
+        return new_history['data'] == old_history['data']
 
-            for value in new_data:
-                if value not in old_data:
-                    history_diff['insert'].append(value)
-        else:
-            history_diff = {
-                'insert': new_data,
-                'delete': old_data
-            }
+    @staticmethod
+    def _make_fingerprint(data):
+        data_str = json.dumps(data, sort_keys=True, default=str)
+        return hashlib.sha1(data_str.encode('utf-8')).hexdigest()
+
+    def _make_data_fingerprint(self, resource_data, exclude_keys):
+        data = {}
+        for key, value in resource_data.items():
+            if key not in exclude_keys:
+                data[key] = value
 
-        return history_diff
+        return self._make_fingerprint({'collector_id': self.collector_id, 'data': data})
+
+    @staticmethod
+    def _get_history_diff(old_data, new_data):
+        return history_diff.get_history_diff(old_data, new_data)
 
     @staticmethod
     def _exclude_data_by_pinned_keys(resource_data, pinned_keys):
@@ -228,6 +293,11 @@ class CollectionDataManager(BaseManager):
             self.merged_data[key] = value
 
     def _get_collector_priority(self, collectors):
+        self.collector_priority.update(
+            collector_priority_cache.get_priorities(collectors, self._list_collector_priority))
+
+    def _list_collector_priority(self, collectors):
+        collector_priority = {}
         query = {
             'only': ['collector_id', 'priority'],
             'filter': [{
@@ -240,7 +310,9 @@ class CollectionDataManager(BaseManager):
         collector_vos, total_count = self.collector_mgr.list_collectors(query)
 
         for collector_vo in collector_vos:
-            self.collector_priority[collector_vo.collector_id] = collector_vo.priority
+            collector_priority[collector_vo.collector_id] = collector_vo.priority
+
+        return collector_priority
 
     def _load_old_data_history(self, old_data):
         change_history = old_data['collection_info'].get('change_history', [])
@@ -251,6 +323,7 @@ class CollectionDataManager(BaseManager):
                 'priority': self.collector_priority.get(updated_by, _DEFAULT_PRIORITY),
                 'data': self._get_data_from_history_key(old_data, key),
                 'job_id': change_info.get('job_id'),
+                'fingerprint': change_info.get('fingerprint'),
                 'updated_by': updated_by,
                 'updated_at': change_info['updated_at']
             }
@@ -272,17 +345,64 @@ class CollectionDataManager(BaseManager):
         else:
             return data.get(key)
 
-    @staticmethod
-    def _make_change_history(change_history):
+    def _make_change_history(self, change_history):
+        """ Last writer of each key
+        diff is kept only in INLINE mode, otherwise it is omitted to keep resource document small
+        """
         history_output = []
 
         for key, history_info in change_history.items():
-            history_output.append({
+            history = {
                 'key': key,
-                'job_id': history_info.get('job_id'),
-                'diff': history_info.get('diff', {}),
+                'fingerprint': history_info.get('fingerprint'),
                 'updated_by': history_info['updated_by'],
                 'updated_at': history_info['updated_at']
-            })
+            }
+
+            if history_info.get('job_id'):
+                history['job_id'] = history_info['job_id']
+
+            if self.change_history_mode == 'INLINE':
+                history['diff'] = history_info.get('diff', {})
+
+            history_output.append(history)
 
         return history_output
+
+    def _save_change_history_diff(self, old_data):
+        """ Save diffs of changed keys to ResourceChangeHistory with one insert (COLLECTION mode)
+        They are deleted after COLLECTOR_CHANGE_HISTORY_RETENTION_DAYS by TTL index
+        """
+        diffs = [(key, history_info) for key, history_info in self.change_history.items() if 'diff' in history_info]
+        if len(diffs) == 0:
+            return
+
+        resource_id = self._get_resource_id(old_data)
+        retention_days = config.get_global('COLLECTOR_CHANGE_HISTORY_RETENTION_DAYS',
+                                           _DEFAULT_CHANGE_HISTORY_RETENTION_DAYS)
+        expire_at = self.updated_at + timedelta(days=retention_days)
+
+        try:
+            history_model = self.locator.get_model('ResourceChangeHistory')
+            history_model._get_collection().insert_many([{
+                'resource_id': resource_id,
+                'resource_type': self.transaction.get_meta('collector.resource_type'),
+                'key': key,
+                'diff': history_info['diff'],
+                'job_id': history_info.get('job_id'),
+                'updated_by': history_info['updated_by'],
+                'updated_at': history_info['updated_at'],
+                'expire_at': expire_at,
+                'domain_id': old_data.get('domain_id')
+            } for key, history_info in diffs], ordered=False)
+        except Exception as e:
+            # History is not critical, resource update goes on
+            _LOGGER.error(f'[_save_change_history_diff] failed to save change history of {resource_id}: {e}')
+
+    @staticmethod
+    def _get_resource_id(resource_data):
+        for key in RESOURCE_ID_KEYS:
+            if resource_data.get(key):
+                return resource_data[key]
+
+        return None
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import contextlib
+import copy
 import logging
 import json
+import threading
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from jsonschema import validate
 from datetime import datetime
 
@@ -10,7 +14,9 @@ from spaceone.core import queue
 from spaceone.core import config
 from spaceone.core.token import get_token
 from spaceone.core.error import *
+from spaceone.core.locator import Locator
 from spaceone.core.manager import BaseManager
+from spaceone.core.transaction import Transaction
 from spaceone.core.scheduler.task_schema import SPACEONE_TASK_SCHEMA
 
 from spaceone.inventory.error import *
@@ -31,6 +37,12 @@ __ALL__ = ['CollectorManager', 'CollectingManager', 'CollectorDB', 'FilterManage
 
 _LOGGER = logging.getLogger(__name__)
 
+# Semaphore per plugin_id, limits number of concurrent collecting streams of plugin in this process
+# {plugin_id: (limit, semaphore)}
+_PLUGIN_SEMAPHORES = {}
+_PLUGIN_SEMAPHORE_LOCK = threading.Lock()
+
+
 class CollectorManager(BaseManager):
 
     def __init__(self, *args, **kwargs):
@@ -236,18 +248,62 @@ class CollectorManager(BaseManager):
 
         # Loop all secret_list
         self.secret_mgr = self.locator.get_manager('SecretManager')
+        concurrency = config.get_global('COLLECTOR_CONCURRENCY', 1)
+        concurrent_params = []
+
+        # Get secret_info of all secrets at once
+        try:
+            secret_infos = self.secret_mgr.list_secret_infos(secret_list, domain_id)
+        except Exception as e:
+            _LOGGER.error(f'[collect] failed to list secrets, get secret one by one: {e}')
+            secret_infos = {}
+
+        # Plan JobTasks: get secret_info of each secret
+        planned_secret_ids = []
+        secret_info_list = []
         for secret_id in secret_list:
+            try:
+                secret_info = secret_infos.get(secret_id) or self._get_secret_info(secret_id, domain_id)
+                planned_secret_ids.append(secret_id)
+                secret_info_list.append(secret_info)
+
+            except ERROR_BASE as e:
+                # Do not exit, just book-keeping
+                job_mgr.add_error(created_job.job_id, domain_id,
+                                  e.error_code,
+                                  e.message,
+                                  {'secret_id': secret_id}
+                                  )
+                _LOGGER.error(f'[collect] collecting failed with {secret_id}: {e}')
+
+            except Exception as e:
+                # Do not exit, just book-keeping
+                job_mgr.add_error(created_job.job_id, domain_id,
+                                  'ERROR_COLLECTOR_COLLECTING',
+                                  e,
+                                  {'secret_id': secret_id}
+                                  )
+                _LOGGER.error(f'[collect] collecting failed with {secret_id}: {e}')
+
+        # Create all JobTasks at once, then update task counters of Job
+        try:
+            job_task_vos = job_task_mgr.create_job_tasks(created_job, secret_info_list, domain_id)
+            job_mgr.increase_tasks_by_vo(created_job, len(job_task_vos))
+        except Exception as e:
+            _LOGGER.debug(f'[collect] failed on JobTask Planning stage: {e}')
+            job_mgr.add_error(created_job.job_id, domain_id,
+                              'ERROR_COLLECT_INITIALIZE',
+                              e,
+                              params)
+            job_mgr.make_error_by_vo(created_job)
+            raise ERROR_COLLECT_INITIALIZE(stage='JobTask Planning', params=params)
+
+        queue_name = self._get_queue_name(name='collect_queue')
+        for secret_id, job_task_vo in zip(planned_secret_ids, job_task_vos):
             # Do collect per secret
             try:
                 # Make Pipeline, then push
                 # parameter of pipeline
-                job_mgr.increase_total_tasks_by_vo(created_job)
-                job_mgr.increase_remained_tasks_by_vo(created_job)
-
-                # Create JobTask
-                secret_info = self._get_secret_info(secret_id, domain_id)
-                job_task_vo = job_task_mgr.create_job_task(created_job, secret_info, domain_id)
-
                 req_params = self._make_collecting_parameters(collector_dict=collector_dict,
                                                               secret_id=secret_id,
                                                               domain_id=domain_id,
@@ -260,7 +316,6 @@ class CollectorManager(BaseManager):
                 _LOGGER.debug(f'[collect] params for collecting: {req_params}')
                 # Make SpaceONE Template Pipeline
                 task = self._create_task(req_params, domain_id)
-                queue_name = self._get_queue_name(name='collect_queue')
 
                 if task and queue_name:
                     # Push to queue
@@ -268,6 +323,9 @@ class CollectorManager(BaseManager):
                     validate(task, schema=SPACEONE_TASK_SCHEMA)
                     json_task = json.dumps(task)
                     queue.put(queue_name, json_task)
+                elif concurrency > 1:
+                    # Do synchronus collect with other secrets
+                    concurrent_params.append(req_params)
                 else:
                     # Do synchronus collect
                     _LOGGER.debug('####### Synchronous collect ########')
@@ -293,10 +351,76 @@ class CollectorManager(BaseManager):
                                   )
                 _LOGGER.error(f'[collect] collecting failed with {secret_id}: {e}')
 
+        if len(concurrent_params) > 0:
+            _LOGGER.debug(f'####### Synchronous collect (concurrency: {concurrency}) ########')
+            self._collect_concurrently(concurrent_params, concurrency, created_job, domain_id)
+
         # Update Timestamp
         #self._update_last_collected_time(collector_vo.collector_id, domain_id)
         return created_job
 
+    def _collect_concurrently(self, params_list, concurrency, job_vo, domain_id):
+        """ Run collecting_resources of secrets in thread pool
+        Each secret is collected by its own CollectingManager and Transaction,
+        since CollectingManager keeps secret and meta of JobTask
+        """
+        job_mgr = self.locator.get_manager('JobManager')
+        plugin_id = params_list[0]['plugin_info'].get('plugin_id')
+        semaphore = self._get_plugin_semaphore(plugin_id)
+
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(params_list))) as executor:
+            futures = {}
+            for req_params in params_list:
+                future = executor.submit(self._collecting_resources_with_semaphore, req_params, semaphore)
+                futures[future] = req_params['secret_id']
+
+            for future in as_completed(futures):
+                secret_id = futures[future]
+                try:
+                    future.result()
+
+                except ERROR_BASE as e:
+                    # Do not exit, just book-keeping
+                    job_mgr.add_error(job_vo.job_id, domain_id,
+                                      e.error_code,
+                                      e.message,
+                                      {'secret_id': secret_id}
+                                      )
+                    _LOGGER.error(f'[_collect_concurrently] collecting failed with {secret_id}: {e}')
+
+                except Exception as e:
+                    # Do not exit, just book-keeping
+                    job_mgr.add_error(job_vo.job_id, domain_id,
+                                      'ERROR_COLLECTOR_COLLECTING',
+                                      e,
+                                      {'secret_id': secret_id}
+                                      )
+                    _LOGGER.error(f'[_collect_concurrently] collecting failed with {secret_id}: {e}')
+
+    def _collecting_resources_with_semaphore(self, req_params, semaphore):
+        with semaphore:
+            # CollectingManager and its sub managers (JobManager, JobTaskManager, ...) use transaction of thread
+            transaction = Transaction(copy.deepcopy(self.transaction.meta))
+            collecting_mgr = Locator(transaction).get_manager('CollectingManager')
+            return collecting_mgr.collecting_resources(**req_params)
+
+    @staticmethod
+    def _get_plugin_semaphore(plugin_id):
+        """ Semaphore of plugin
+        limit: COLLECTOR_PLUGIN_CONCURRENCY[plugin_id] or COLLECTOR_PLUGIN_DEFAULT_CONCURRENCY (0: no limit)
+        """
+        plugin_concurrency = config.get_global('COLLECTOR_PLUGIN_CONCURRENCY', {})
+        limit = plugin_concurrency.get(plugin_id, config.get_global('COLLECTOR_PLUGIN_DEFAULT_CONCURRENCY', 0))
+        if limit <= 0:
+            return contextlib.nullcontext()
+
+        with _PLUGIN_SEMAPHORE_LOCK:
+            # Semaphore is created again, if limit is changed
+            if plugin_id not in _PLUGIN_SEMAPHORES or _PLUGIN_SEMAPHORES[plugin_id][0] != limit:
+                _PLUGIN_SEMAPHORES[plugin_id] = (limit, threading.BoundedSemaphore(limit))
+
+            return _PLUGIN_SEMAPHORES[plugin_id][1]
+
     def _update_last_collected_time(self, collector_id, domain_id):
         """ Update last_updated_time of collector
         """
@@ -410,16 +534,4 @@ class CollectorManager(BaseManager):
     def _get_secret_info(self, secret_id, domain_id):
         secret = self.secret_mgr.get_secret(secret_id, domain_id)
         # Update Secret also
-        secret_info = {}
-        if secret:
-            secret_info.update({'secret_id': secret['secret_id']})
-            provider = secret.get('provider', None)
-            service_account_id = secret.get('service_account_id', None)
-            project_id = secret.get('project_id', None)
-            if provider:
-                secret_info.update({'provider': provider})
-            if service_account_id:
-                secret_info.update({'service_account_id': service_account_id})
-            if project_id:
-                secret_info.update({'project_id': project_id})
-        return secret_info
+        return self.secret_mgr.make_secret_info(secret)
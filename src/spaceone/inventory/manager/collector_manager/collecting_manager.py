@@ -4,14 +4,18 @@ import logging
 import json
 import time
 
-from google.protobuf.json_format import MessageToDict
-
 from spaceone.core import config, cache
 from spaceone.core import queue
 from spaceone.core.error import *
 from spaceone.core.manager import BaseManager
 from spaceone.inventory.error import *
 from spaceone.inventory.lib import rule_matcher
+from spaceone.inventory.lib import collector_metrics as metrics
+from spaceone.inventory.lib.collector_metrics import collector_metrics
+from spaceone.inventory.lib.job_task_stat_counter import job_task_stat_counter, increment_job_task_stat, \
+    JOB_TASK_STAT_EXPIRE_TIME
+from spaceone.inventory.lib.plugin_client_pool import plugin_client_pool
+from spaceone.inventory.lib.resource_info import message_to_dict
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,13 +54,23 @@ SERVICE_MAP = {
     'inventory.Region': 'RegionService',
 }
 
+BULK_WRITE_RESOURCE_TYPES = [
+    'SERVER',
+    'CLOUD_SERVICE',
+    'inventory.Server',
+    'inventory.CloudService',
+]
+
 DB_QUEUE_NAME = 'db_q'
 NOT_COUNT = 0
 CREATED = 1
 UPDATED = 2
 ERROR = 3
-JOB_TASK_STAT_EXPIRE_TIME = 3600            # 1 hour
-WATCHDOG_WAITING_TIME = 30                  # wait 30 seconds, before watchdog works
+DB_QUEUE_WAIT_INTERVAL = 0.5                # check in-flight messages of db_q every 0.5 seconds
+DB_QUEUE_WAIT_TIMEOUT = 600                 # push anyway, if consumers are not working for 10 minutes
+WATCHDOG_WAITING_TIME = 30                  # wait 30 seconds, before watchdog works (previous version)
+JOB_TASK_FINALIZED_EXPIRE_TIME = 300        # keep lock of finalized JobTask for 5 minutes
+JOB_TASK_TIMEOUT_CHECK_INTERVAL = 60        # check deadline of db_q JobTasks every 1 minute
 
 #################################################
 # Collecting Resource and Update DB
@@ -66,6 +80,7 @@ class CollectingManager(BaseManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.secret = None      # secret info for update meta
+        self.db_queue_wait_timeouts = set()     # job_task_id, which is timed out waiting for consumers of db_q
         self.initialize()
         self.job_mgr = self.locator.get_manager('JobManager')
         self.job_task_mgr = self.locator.get_manager('JobTaskManager')
@@ -79,7 +94,13 @@ class CollectingManager(BaseManager):
             self.db_queue = DB_QUEUE_NAME
         else:
             self.use_db_queue = False
-        _LOGGER.debug(f'[initialize] use db_queue: {self.use_db_queue}')
+        self.bulk_size = config.get_global('COLLECTOR_BULK_SIZE', 0)
+        self.db_queue_batch_size = max(config.get_global('COLLECTOR_DB_QUEUE_BATCH_SIZE', 100), 1)
+        self.db_queue_max_inflight = config.get_global('COLLECTOR_DB_QUEUE_MAX_INFLIGHT', 20)
+        self.rollback_policy = config.get_global('COLLECTOR_ROLLBACK_POLICY', 'CHANGED')
+        self.partial_update = config.get_global('COLLECTOR_PARTIAL_UPDATE', True)
+        self.job_task_timeout = config.get_global('COLLECTOR_JOB_TASK_TIMEOUT', 1800)
+        _LOGGER.debug(f'[initialize] use db_queue: {self.use_db_queue}, bulk_size: {self.bulk_size}')
 
     ##########################################################
     # collect
@@ -171,6 +192,8 @@ class CollectingManager(BaseManager):
 
         except ERROR_BASE as e:
             _LOGGER.error(f'[collecting_resources] fail to get secret_data: {secret_id}')
+            # secret_data may be changed, get secret again at next collect
+            secret_mgr.delete_secret_cache(secret_id, domain_id)
             self.job_task_mgr.add_error(job_task_id, domain_id,
                                    e.error_code,
                                    e.message,
@@ -180,6 +203,9 @@ class CollectingManager(BaseManager):
             raise ERROR_COLLECTOR_COLLECTING(plugin_info=plugin_info, filters=collect_filter)
 
         except Exception as e:
+            # Plugin endpoint or secret_data may be changed, get them again at next collect
+            plugin_client_pool.invalidate(plugin_info['plugin_id'], plugin_info['version'], domain_id)
+            secret_mgr.delete_secret_cache(secret_id, domain_id)
             self.job_task_mgr.add_error(job_task_id, domain_id,
                                    'ERROR_COLLECTOR_COLLECTING',
                                    e,
@@ -219,6 +245,8 @@ class CollectingManager(BaseManager):
 
         except Exception as e:
             _LOGGER.error(f'[collecting_resources] {e}')
+            # Stream of plugin is broken
+            plugin_client_pool.invalidate(plugin_info['plugin_id'], plugin_info['version'], domain_id)
             self.job_task_mgr.add_error(job_task_id, domain_id,
                                    'ERROR_COLLECTOR_COLLECTING',
                                    e,
@@ -249,6 +277,8 @@ class CollectingManager(BaseManager):
         self.transaction.set_meta('job_task_id', job_task_id)
         self.transaction.set_meta('collector_id', collector_id)
         self.transaction.set_meta('secret.secret_id', secret_id)
+        self.transaction.set_meta('collector.rollback_policy', self.rollback_policy)
+        self.transaction.set_meta('collector.partial_update', self.partial_update)
         if 'provider' in self.secret:
             self.transaction.set_meta('secret.provider', self.secret['provider'])
         if 'project_id' in self.secret:
@@ -272,9 +302,18 @@ class CollectingManager(BaseManager):
         if self.use_db_queue:
             self._create_job_task_stat_cache(job_id, job_task_id, domain_id)
 
+        use_bulk_write = self.use_db_queue is False and self.bulk_size > 0
+        bulk_resources = []
+        db_queue_resources = []
+
+        waited_from = time.time()
         for res in results:
             try:
-                res_dict = MessageToDict(res, preserving_proto_field_name=True)
+                received_at = time.time()
+                res_dict = message_to_dict(res)
+                resource_type = res_dict.get('resource_type')
+                collector_metrics.observe(metrics.PLUGIN_WAIT, received_at - waited_from, collector_id, resource_type)
+                collector_metrics.observe(metrics.DECODE, time.time() - received_at, collector_id, resource_type)
                 idx += 1
                 _LOGGER.debug(f'[_process_results] idx: {idx}')
                 ######################################
@@ -282,10 +321,28 @@ class CollectingManager(BaseManager):
                 ######################################
                 if self.use_db_queue:
                     _LOGGER.debug(f'[_process_results] use db queue: {idx}')
-                    # Create Asynchronus Task
-                    pushed = self._create_db_update_task(res_dict, params)
-                    if pushed == False:
-                        failure += 1
+                    # Create Asynchronus Task per db_queue_batch_size resources
+                    db_queue_resources.append(res_dict)
+                    if len(db_queue_resources) >= self.db_queue_batch_size:
+                        pushed = self._create_db_update_task(db_queue_resources, params)
+                        if pushed == False:
+                            failure += len(db_queue_resources)
+                            self._add_db_update_task_failure(len(db_queue_resources), params)
+                        db_queue_resources = []
+                    continue
+
+                #####################################
+                # Bulk Update
+                # Buffer resources, then process them at once
+                #####################################
+                if use_bulk_write:
+                    bulk_resources.append(res_dict)
+                    if len(bulk_resources) >= self.bulk_size:
+                        bulk_stat = self._process_bulk_results(bulk_resources, params)
+                        created += bulk_stat['created_count']
+                        updated += bulk_stat['updated_count']
+                        failure += bulk_stat['failure_count']
+                        bulk_resources = []
                     continue
 
                 #####################################
@@ -305,11 +362,29 @@ class CollectingManager(BaseManager):
 
             except Exception as e:
                 _LOGGER.error(f'[_process_results] failed single result {e}')
-
-        # Add watchdog for stat finalizing
+            finally:
+                waited_from = time.time()
+
+        if len(db_queue_resources) > 0:
+            pushed = self._create_db_update_task(db_queue_resources, params)
+            if pushed == False:
+                failure += len(db_queue_resources)
+                self._add_db_update_task_failure(len(db_queue_resources), params)
+
+        if len(bulk_resources) > 0:
+            bulk_stat = self._process_bulk_results(bulk_resources, params)
+            created += bulk_stat['created_count']
+            updated += bulk_stat['updated_count']
+            failure += bulk_stat['failure_count']
+
+        # JobTask is finalized by consumer which flushes stat of the last resource
+        # (JobTask which is not finished by lost task, is finalized after deadline by timeout_job_tasks)
         if self.use_db_queue:
-            _LOGGER.debug(f'[_process_results] push watchdog, {job_task_id}')
-            pushed = self._create_db_update_task_watchdog(idx, job_id, job_task_id, domain_id)
+            _LOGGER.debug(f'[_process_results] set total count, {job_task_id}')
+            cache.set(f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:TOTAL', idx, expire=JOB_TASK_STAT_EXPIRE_TIME)
+            cache.set(f'job_task_deadline:{domain_id}:{job_id}:{job_task_id}', time.time() + self.job_task_timeout,
+                      expire=self.job_task_timeout + JOB_TASK_STAT_EXPIRE_TIME)
+            self._check_job_task_completion(job_id, job_task_id, domain_id)
 
         _LOGGER.debug(f'[_process_results] number of idx: {idx}')
         # Update JobTask
@@ -343,6 +418,8 @@ class CollectingManager(BaseManager):
         data = resource['resource']
 
         _LOGGER.debug(f'[_process_single_result] {resource_type}')
+        collector_id = params['collector_id']
+        self.transaction.set_meta('collector.resource_type', resource_type)
         (svc, mgr) = self._get_resource_map(resource_type)
 
         # FiterCache
@@ -371,8 +448,7 @@ class CollectingManager(BaseManager):
             total_count = 0
 
         end = time.time()
-        diff = end - start
-        _LOGGER.error(f'query time: {diff}')
+        collector_metrics.observe(metrics.MATCH, end - start, collector_id, resource_type)
 
         #########################################
         # Create / Update to DB
@@ -386,16 +462,14 @@ class CollectingManager(BaseManager):
             if total_count == 0:
                 # Create
                 res_msg = svc.create(data)
-                diff = time.time() - end
-                _LOGGER.error(f'insert: {diff}')
+                collector_metrics.observe(metrics.CREATE, time.time() - end, collector_id, resource_type)
                 response = CREATED
 
             elif total_count == 1:
                 # Update
                 data.update(res_info[0])
                 res_msg = svc.update(data)
-                diff = time.time() - end
-                _LOGGER.error(f'update: {diff}')
+                collector_metrics.observe(metrics.UPDATE, time.time() - end, collector_id, resource_type)
                 response = UPDATED
 
             elif total_count > 1:
@@ -411,9 +485,6 @@ class CollectingManager(BaseManager):
                                        )
                 response = ERROR
 
-            if self.use_db_queue:
-                self._update_job_task_stat_to_cache(job_id, job_task_id, response, domain_id)
-
         except ERROR_BASE as e:
             self.job_task_mgr.add_error(job_task_id, domain_id,
                                    e.error_code,
@@ -430,6 +501,211 @@ class CollectingManager(BaseManager):
                 response = NOT_COUNT
             return response
 
+    def _process_db_update_task(self, resources, params, inflight=True):
+        """ Process resources of db_q message (Consumer of db_q)
+            Args:
+                resources (list): list of resource from collector
+                params (dict): same as _process_single_result
+                inflight (bool): whether task is counted as in-flight by producer
+        """
+        job_id = params['job_id']
+        job_task_id = params['job_task_id']
+        domain_id = params['domain_id']
+
+        try:
+            if self.bulk_size > 0:
+                stat = self._process_bulk_results(resources, params)
+            else:
+                # COLLECTOR_BULK_SIZE = 0, resources of task are processed one by one
+                stat = {
+                    'created_count': 0,
+                    'updated_count': 0,
+                    'failure_count': 0
+                }
+                for resource in resources:
+                    self._count_stat(stat, self._process_single_result(resource, params))
+        except Exception as e:
+            _LOGGER.error(f'[_process_db_update_task] failed to process resources: {e}')
+            stat = {
+                'created_count': 0,
+                'updated_count': 0,
+                'failure_count': len(resources)
+            }
+
+        flushed = False
+        try:
+            # Stat is aggregated in process, and flushed to cache by size or interval
+            flushed = job_task_stat_counter.add(domain_id, job_id, job_task_id,
+                                                created=stat['created_count'],
+                                                updated=stat['updated_count'],
+                                                failure=stat['failure_count'],
+                                                processed=len(resources))
+        except Exception as e:
+            _LOGGER.error(f'[_process_db_update_task] failed to add stat of {job_task_id}: {e}')
+        finally:
+            if inflight:
+                key = f'job_task_inflight:{domain_id}:{job_id}:{job_task_id}'
+                cache.decrement(key)
+
+        # Otherwise, completion is checked after periodic flush (_check_job_task_completion_after_flush)
+        if flushed:
+            self._check_job_task_completion(job_id, job_task_id, domain_id)
+
+    def _add_db_update_task_failure(self, failure_count, params):
+        """ Resources which are failed to push db_q, are processed as failure """
+        try:
+            self._update_job_task_stat_to_cache(params['job_id'], params['job_task_id'], ERROR,
+                                                params['domain_id'], failure_count)
+            increment_job_task_stat(f'job_task_stat:{params["domain_id"]}:{params["job_id"]}:'
+                                    f'{params["job_task_id"]}:PROCESSED', failure_count)
+        except Exception as e:
+            _LOGGER.error(f'[_add_db_update_task_failure] {e}')
+
+    def _process_bulk_results(self, resources, params):
+        """ Process resources in bulk (Add/Update)
+            Resources of BULK_WRITE_RESOURCE_TYPES are matched with one query per match order,
+            and written with one bulk_write per resource type.
+            Others (and resources which appear twice in the bulk) are processed by _process_single_result.
+
+            Args:
+                resources (list): list of resource from collector
+                params (dict): same as _process_single_result
+
+            Returns: {
+                'created_count': int,
+                'updated_count': int,
+                'failure_count': int
+            }
+        """
+        stat = {
+            'created_count': 0,
+            'updated_count': 0,
+            'failure_count': 0
+        }
+
+        resources_by_type = {}
+        for resource in resources:
+            resource_type = resource['resource_type']
+            if resource_type in BULK_WRITE_RESOURCE_TYPES:
+                resources_by_type[resource_type] = resources_by_type.get(resource_type, [])
+                resources_by_type[resource_type].append(resource)
+            else:
+                self._count_stat(stat, self._process_single_result(resource, params))
+
+        deferred_resources = []
+        self.transaction.set_meta('collector.bulk_write', True)
+        try:
+            for resource_type, resource_list in resources_by_type.items():
+                try:
+                    bulk_stat, deferred = self._bulk_upsert_resources(resource_type, resource_list, params)
+                    for key, value in bulk_stat.items():
+                        stat[key] += value
+                    deferred_resources.extend(deferred)
+
+                except Exception as e:
+                    _LOGGER.error(f'[_process_bulk_results] failed bulk upsert of {resource_type}: {e}')
+                    stat['failure_count'] += len(resource_list)
+
+        finally:
+            self.transaction.set_meta('collector.bulk_write', False)
+
+        for resource in deferred_resources:
+            self._count_stat(stat, self._process_single_result(resource, params))
+
+        return stat
+
+    def _bulk_upsert_resources(self, resource_type, resources, params):
+        """ Create or update resources of same resource_type with one bulk_write
+            Services run as usual, but managers return vos without writing (collector.bulk_write)
+
+            Returns: stat, deferred_resources (resources to process after bulk_write)
+        """
+        domain_id = params['domain_id']
+        job_task_id = params['job_task_id']
+        stat = {
+            'created_count': 0,
+            'updated_count': 0,
+            'failure_count': 0
+        }
+
+        collector_id = params['collector_id']
+        self.transaction.set_meta('collector.resource_type', resource_type)
+        (svc, mgr) = self._get_resource_map(resource_type)
+        with collector_metrics.measure(metrics.BULK_MATCH, collector_id, resource_type):
+            matched_resources, duplicated_resources = self._query_with_match_rules_by_bulk(resources, domain_id, mgr)
+
+        resource_vos = []
+        states = []
+        deferred_resources = []
+        for idx, resource in enumerate(resources):
+            if idx in duplicated_resources:
+                # Same resource is created in this bulk, update it after bulk_write
+                deferred_resources.append(resource)
+                continue
+
+            data = resource['resource']
+            data['domain_id'] = domain_id
+            res_info = matched_resources.get(idx, [])
+            try:
+                # Create new service per resource, since transaction is variable
+                (svc, _) = self._get_resource_map(resource_type)
+                if len(res_info) == 0:
+                    with collector_metrics.measure(metrics.CREATE, collector_id, resource_type):
+                        resource_vos.append(svc.create(data))
+                    states.append(CREATED)
+                elif len(res_info) == 1:
+                    data.update(res_info[0])
+                    with collector_metrics.measure(metrics.UPDATE, collector_id, resource_type):
+                        resource_vos.append(svc.update(data))
+                    states.append(UPDATED)
+                else:
+                    _LOGGER.warning(f'[_bulk_upsert_resources] match_rules: {resource.get("match_rules", {})}')
+                    self.job_task_mgr.add_error(job_task_id, domain_id,
+                                                "TOO MANY RESOURCES MATCH",
+                                                str(resource),
+                                                {'resource_type': resource_type, 'resource_id': 'Unknown'}
+                                                )
+                    stat['failure_count'] += 1
+
+            except ERROR_BASE as e:
+                self.job_task_mgr.add_error(job_task_id, domain_id,
+                                            e.error_code,
+                                            e.message,
+                                            {'resource_type': resource_type, 'resource_id': 'Unknown'}
+                                            )
+                stat['failure_count'] += 1
+
+            except Exception as e:
+                _LOGGER.debug(f'[_bulk_upsert_resources] service error: {svc}, {e}')
+                stat['failure_count'] += 1
+
+        if len(resource_vos) == 0:
+            return stat, deferred_resources
+
+        with collector_metrics.measure(metrics.BULK_WRITE, collector_id, resource_type):
+            errors = mgr.bulk_write_resources(resource_vos)
+        for idx, state in enumerate(states):
+            if idx in errors:
+                self.job_task_mgr.add_error(job_task_id, domain_id,
+                                            'ERROR_DB_QUERY',
+                                            errors[idx],
+                                            {'resource_type': resource_type, 'resource_id': 'Unknown'}
+                                            )
+                self._count_stat(stat, ERROR)
+            else:
+                self._count_stat(stat, state)
+
+        return stat, deferred_resources
+
+    @staticmethod
+    def _count_stat(stat, res_state):
+        if res_state == CREATED:
+            stat['created_count'] += 1
+        elif res_state == UPDATED:
+            stat['updated_count'] += 1
+        elif res_state == ERROR:
+            stat['failure_count'] += 1
+
     def _get_resource_map(self, resource_type):
         """ Base on resource type
         Returns: (service, manager)
@@ -495,6 +771,12 @@ class CollectingManager(BaseManager):
             cache.set(key, 0, expire=JOB_TASK_STAT_EXPIRE_TIME)
             key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:FAILURE'
             cache.set(key, 0, expire=JOB_TASK_STAT_EXPIRE_TIME)
+            key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:PROCESSED'
+            cache.set(key, 0, expire=JOB_TASK_STAT_EXPIRE_TIME)
+            key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:FINALIZED'
+            cache.set(key, 0, expire=JOB_TASK_STAT_EXPIRE_TIME)
+            key = f'job_task_inflight:{domain_id}:{job_id}:{job_task_id}'
+            cache.set(key, 0, expire=JOB_TASK_STAT_EXPIRE_TIME)
         except Exception as e:
             _LOGGER.error(f'[_create_job_task_stat_cache] {e}')
 
@@ -514,13 +796,20 @@ class CollectingManager(BaseManager):
             cache.delete(key)
             key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:FAILURE'
             cache.delete(key)
+            key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:PROCESSED'
+            cache.delete(key)
+            key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:TOTAL'
+            cache.delete(key)
+            key = f'job_task_inflight:{domain_id}:{job_id}:{job_task_id}'
+            cache.delete(key)
         except Exception as e:
             _LOGGER.error(f'[_delete_job_task_stat_cache] {e}')
 
-    def _update_job_task_stat_to_cache(self, job_id, job_task_id, kind, domain_id):
+    def _update_job_task_stat_to_cache(self, job_id, job_task_id, kind, domain_id, amount=1):
         """ Update to cache
         Args:
             - kind: CREATED | UPDATED | ERROR
+            - amount: number of resources
         cache key
             - job_task_stat:<job_id>:<job_task_id>:created = N
             - job_task_stat:<job_id>:<job_task_id>:updated = M
@@ -532,12 +821,15 @@ class CollectingManager(BaseManager):
             key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:UPDATED'
         elif kind == ERROR:
             key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:FAILURE'
-        cache.increment(key)
+        else:
+            return
+
+        if amount > 0:
+            increment_job_task_stat(key, amount)
 
     def _watchdog_job_task_stat(self, param):
-        """ WatchDog for cache stat
-        1) Update to DB
-        2) Update JobTask status
+        """ WatchDog for cache stat, which is pushed by previous version
+        JobTask is finalized by _check_job_task_completion now
         param = {
             'job_id': job_id,
             'job_task_id': job_task_id,
@@ -548,36 +840,106 @@ class CollectingManager(BaseManager):
         # Wait a little, may be working task exist
         _LOGGER.debug(f'[_watchdog_job_task_stat] WatchDog Start: {param["job_task_id"]}')
         time.sleep(WATCHDOG_WAITING_TIME)
-        domain_id = param['domain_id']
-        job_id = param['job_id']
-        job_task_id = param['job_task_id']
+        self._finalize_job_task(param['job_id'], param['job_task_id'], param['domain_id'], param['total_count'])
+
+    def _check_job_task_completion(self, job_id, job_task_id, domain_id, processed_count=0):
+        """ Add processed count, then finalize JobTask if all resources are processed
+        TOTAL is set by producer after all resources are pushed
+        """
+        key_processed = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:PROCESSED'
+        if processed_count > 0:
+            increment_job_task_stat(key_processed, processed_count)
+
+        processed = cache.get(key_processed)
+        total_count = cache.get(f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:TOTAL')
+        if total_count is not None and processed is not None and int(processed) >= int(total_count):
+            self._finalize_job_task(job_id, job_task_id, domain_id, int(total_count))
+
+    def timeout_job_tasks(self):
+        """ Finalize db_q JobTasks which are not finished until deadline, with current stat
+        (db_q task is lost, consumer is dead or stat of exited worker is not flushed)
 
+        Returns: list of job_task_id which are finalized
+        """
+        now = time.time()
+        job_task_ids = []
+        for key in cache.keys('job_task_deadline:*'):
+            key = key.decode() if isinstance(key, bytes) else key
+            try:
+                deadline = cache.get(key)
+                if deadline is None or float(deadline) > now:
+                    continue
+
+                _, domain_id, job_id, job_task_id = key.split(':')
+                total_count = cache.get(f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:TOTAL') or 0
+                _LOGGER.warning(f'[timeout_job_tasks] JobTask is not finished until deadline: {job_task_id}')
+                if self._finalize_job_task(job_id, job_task_id, domain_id, int(total_count), timeout=True):
+                    job_task_ids.append(job_task_id)
+            except Exception as e:
+                _LOGGER.error(f'[timeout_job_tasks] failed to finalize JobTask of {key}: {e}')
+
+        return job_task_ids
+
+    def _finalize_job_task(self, job_id, job_task_id, domain_id, total_count, timeout=False):
+        """ Update stat and state of JobTask only once
+        1) Update to DB
+        2) Update JobTask status
+        If timeout, resources which are not processed are counted as failure
+
+        Returns: True, if JobTask is finalized by this call
+        """
         try:
-            key_created = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:CREATED'
-            value_created = cache.get(key_created)
-            cache.delete(key_created)
-        except:
-            value_created = 0
+            job_task_stat_counter.flush(domain_id, job_id, job_task_id)
+        except Exception as e:
+            _LOGGER.error(f'[_finalize_job_task] failed to flush stat: {e}')
+
         try:
-            key_updated = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:UPDATED'
-            value_updated = cache.get(key_updated)
-            cache.delete(key_updated)
-        except:
-            value_updated = 0
+            key_finalized = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:FINALIZED'
+            finalized = cache.increment(key_finalized)
+            if finalized is not None and int(finalized) > 1:
+                _LOGGER.debug(f'[_finalize_job_task] already finalized: {job_task_id}')
+                cache.delete(f'job_task_deadline:{domain_id}:{job_id}:{job_task_id}')
+                return False
+
+            # Lock is needed only for late checks of same JobTask
+            cache.set(key_finalized, finalized, expire=JOB_TASK_FINALIZED_EXPIRE_TIME)
+        except Exception as e:
+            _LOGGER.error(f'[_finalize_job_task] failed to lock: {e}')
+
+        stat_values = {}
+        for kind in ['CREATED', 'UPDATED', 'FAILURE', 'PROCESSED']:
+            try:
+                key = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:{kind}'
+                stat_values[kind] = int(cache.get(key) or 0)
+                cache.delete(key)
+            except Exception as e:
+                _LOGGER.error(f'[_finalize_job_task] failed to get {kind} of {job_task_id}: {e}')
+                stat_values[kind] = 0
         try:
-            key_failure = f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:FAILURE'
-            value_failure = cache.get(key_failure)
-            cache.delete(key_failure)
-        except:
-            value_failure = 0
+            cache.delete(f'job_task_stat:{domain_id}:{job_id}:{job_task_id}:TOTAL')
+            cache.delete(f'job_task_deadline:{domain_id}:{job_id}:{job_task_id}')
+        except Exception as e:
+            _LOGGER.error(f'[_finalize_job_task] failed to delete stat of {job_task_id}: {e}')
+
         # Update to DB
         stat_result = {
-            'total_count': param['total_count'],
-            'created_count': value_created,
-            'updated_count': value_updated,
-            'failure_count': value_failure
+            'total_count': total_count,
+            'created_count': stat_values['CREATED'],
+            'updated_count': stat_values['UPDATED'],
+            'failure_count': stat_values['FAILURE']
         }
-        _LOGGER.debug(f'[_watchdog_job_task_stat] stat: {stat_result}')
+        lost_count = max(total_count - stat_values['PROCESSED'], 0)
+        if timeout and lost_count > 0:
+            stat_result['failure_count'] += lost_count
+            try:
+                self.job_task_mgr.add_error(job_task_id, domain_id, 'ERROR_JOB_TASK_TIMEOUT',
+                                            f'{lost_count} resources are not processed until deadline '
+                                            f'({self.job_task_timeout} seconds)',
+                                            {'resource_type': 'inventory.JobTask', 'resource_id': job_task_id})
+            except Exception as e:
+                _LOGGER.error(f'[_finalize_job_task] failed to add timeout error of {job_task_id}: {e}')
+
+        _LOGGER.debug(f'[_finalize_job_task] stat: {stat_result}')
         try:
             if stat_result['failure_count'] > 0:
                 JOB_TASK_STATE = 'FAILURE'
@@ -585,12 +947,13 @@ class CollectingManager(BaseManager):
                 JOB_TASK_STATE = 'SUCCESS'
             self._update_job_task(job_task_id, JOB_TASK_STATE, domain_id, stat=stat_result)
         except Exception as e:
-            # error
-            pass
+            _LOGGER.error(f'[_finalize_job_task] failed to update JobTask {job_task_id}: {e}')
         finally:
             # Close remained task
             self.job_mgr.decrease_remained_tasks(job_id, domain_id)
 
+        return True
+
     ######################
     # Internal
     ######################
@@ -632,7 +995,9 @@ class CollectingManager(BaseManager):
         plugin_connector = self.locator.get_connector('PluginConnector')
         # TODO: label match
 
-        endpoint = plugin_connector.get_plugin_endpoint(plugin_id, version, domain_id)
+        endpoint = plugin_client_pool.get_endpoint(
+            plugin_id, version, domain_id,
+            lambda: plugin_connector.get_plugin_endpoint(plugin_id, version, domain_id))
         return endpoint
 
     def _query_with_match_rules(self, resource, match_rules, domain_id, mgr):
@@ -658,40 +1023,110 @@ class CollectingManager(BaseManager):
 
         for order in sorted(match_order):
             query = rule_matcher.make_query(order, match_rules, resource, domain_id)
-            _LOGGER.error(f'[_query_with_match_rules] query generated: {query}')
+            _LOGGER.debug(f'[_query_with_match_rules] query generated: {query}')
             found_resource, total_count = mgr.find_resources(query)
             if found_resource and total_count == 1:
                 return found_resource, total_count
 
         return found_resource, total_count
 
+    def _query_with_match_rules_by_bulk(self, resources, domain_id, mgr):
+        """ match resources based on match_rules, in bulk (see rule_matcher.match_resources)
+
+        Args:
+            resources: list of ResourceInfo(Json) from collector plugin
+
+        Return:
+            matched_resources (dict): {index of resources: list of resource_id}
+            duplicated_resources (dict): {index of resources: index of first same resource}
+        """
+        matched_resources = {}
+        duplicated_resources = {}
+        groups = {}
+
+        for idx, resource in enumerate(resources):
+            match_rules = rule_matcher.dict_key_int_parser(resource.get('match_rules', {}))
+            group_key = json.dumps(match_rules, sort_keys=True)
+            if group_key not in groups:
+                groups[group_key] = {'match_rules': match_rules, 'indexes': []}
+            groups[group_key]['indexes'].append(idx)
+
+        for group in groups.values():
+            indexes = group['indexes']
+            group_resources = [resources[idx]['resource'] for idx in indexes]
+            matched, duplicated, fallback = rule_matcher.match_resources(group_resources,
+                                                                         group['match_rules'],
+                                                                         domain_id,
+                                                                         mgr.find_resources_with_values)
+            for i, res_info in matched.items():
+                matched_resources[indexes[i]] = res_info
+
+            for i, first in duplicated.items():
+                duplicated_resources[indexes[i]] = indexes[first]
+
+            for i in fallback:
+                try:
+                    res_info, total_count = self._query_with_match_rules(group_resources[i],
+                                                                         group['match_rules'],
+                                                                         domain_id,
+                                                                         mgr)
+                    matched_resources[indexes[i]] = res_info
+                except Exception as e:
+                    _LOGGER.error(f'[_query_with_match_rules_by_bulk] failed to match: {e}')
+
+        return matched_resources, duplicated_resources
+
     ########################
     # Asynchronous DB Update
     ########################
-    def _create_db_update_task(self, res, param):
-        """ Create Asynchronous Task
+    def _create_db_update_task(self, resources, param):
+        """ Create Asynchronous Task (list of resources per task)
         """
         try:
-            # Push Queue
-            task = {'method': '_process_single_result', 'res': res, 'param': param, 'meta': self.transaction.meta}
+            self._wait_db_update_task_inflight(param['job_id'], param['job_task_id'], param['domain_id'])
+
+            task = {'method': '_process_db_update_task', 'res': resources, 'param': param,
+                    'meta': self.transaction.meta}
             json_task = json.dumps(task)
-            queue.put(self.db_queue, json_task)
+
+            # Count in-flight before push, since consumer decreases it as soon as task is processed
+            key = f'job_task_inflight:{param["domain_id"]}:{param["job_id"]}:{param["job_task_id"]}'
+            cache.increment(key)
+            try:
+                # Push Queue
+                queue.put(self.db_queue, json_task)
+            except Exception:
+                cache.decrement(key)
+                raise
+
             return True
         except Exception as e:
             _LOGGER.error(f'[_create_db_update_task] {e}')
             return False
 
-    def _create_db_update_task_watchdog(self, total_count, job_id, job_task_id, domain_id):
-        """ Create Asynchronous Task
+    def _wait_db_update_task_inflight(self, job_id, job_task_id, domain_id):
+        """ Backpressure of db_q
+        Wait until number of in-flight tasks of JobTask is less than COLLECTOR_DB_QUEUE_MAX_INFLIGHT
+        Once it is timed out, remained tasks of JobTask are pushed without waiting
         """
-        try:
-            # Push Queue
-            param = {'job_id': job_id, 'job_task_id': job_task_id, 'domain_id': domain_id, 'total_count': total_count}
-            task = {'method': '_watchdog_job_task_stat', 'res': {}, 'param': param, 'meta': self.transaction.meta}
-            json_task = json.dumps(task)
-            queue.put(self.db_queue, json_task)
-            return True
-        except Exception as e:
-            _LOGGER.error(f'[_create_db_update_task_watchdog] {e}')
-            return False
+        if self.db_queue_max_inflight <= 0 or job_task_id in self.db_queue_wait_timeouts:
+            return
+
+        key = f'job_task_inflight:{domain_id}:{job_id}:{job_task_id}'
+        start = time.time()
+        while int(cache.get(key) or 0) >= self.db_queue_max_inflight:
+            if time.time() - start > DB_QUEUE_WAIT_TIMEOUT:
+                _LOGGER.warning(f'[_wait_db_update_task_inflight] timeout, push remained tasks without waiting: '
+                                f'{job_task_id}')
+                self.db_queue_wait_timeouts.add(job_task_id)
+                return
+
+            time.sleep(DB_QUEUE_WAIT_INTERVAL)
+
+
+def _check_job_task_completion_after_flush(domain_id, job_id, job_task_id):
+    """ Stat of JobTask is flushed by interval, not by consumer (see JobTaskStatCounter) """
+    CollectingManager()._check_job_task_completion(job_id, job_task_id, domain_id)
+
 
+job_task_stat_counter.add_flush_listener(_check_job_task_completion_after_flush)
@@ -4,7 +4,9 @@ import abc
 import logging
 
 from datetime import datetime, timedelta
+from pymongo import ReturnDocument
 
+from spaceone.core import config
 from spaceone.core.manager import BaseManager
 from spaceone.inventory.model.job_model import Job
 from spaceone.inventory.error import *
@@ -73,21 +75,17 @@ class JobManager(BaseManager):
         _LOGGER.debug(f'[increase_remained_tasks] {job_vo.job_id}, {job_vo.remained_tasks}')
         return job_vo
 
-    def decrease_remained_tasks_by_vo(self, job_vo):
-        job_vo = job_vo.decrement('remained_tasks')
-        _LOGGER.debug(f'[decrease_remained_tasks] {job_vo.job_id}, {job_vo.remained_tasks}')
-
-        if job_vo.remained_tasks == 0 and job_vo.mark_error == 0:
-            # Update to Finished
-            self.make_success_by_vo(job_vo)
-        else:
-            self.make_error_by_vo(job_vo)
-
-        if job_vo.remained_tasks < 0:
-            _LOGGER.debug(f'[decrease_remained_tasks] {job_id}, {remained_tasks}')
-            raise ERROR_JOB_UPDATE(param='remained_tasks')
+    def increase_tasks_by_vo(self, job_vo, count):
+        """ Increase total_tasks and remained_tasks with one atomic update
+        """
+        if count > 0:
+            job_vo.modify(inc__total_tasks=count, inc__remained_tasks=count)
+        _LOGGER.debug(f'[increase_tasks] {job_vo.job_id} : {job_vo.total_tasks}, {job_vo.remained_tasks}')
         return job_vo
 
+    def decrease_remained_tasks_by_vo(self, job_vo):
+        return self.decrease_remained_tasks(job_vo.job_id, job_vo.domain_id)
+
     def increase_total_tasks(self, job_id, domain_id):
         job_vo = self.get(job_id, domain_id)
         total_tasks = job_vo.total_tasks + 1
@@ -102,22 +100,59 @@ class JobManager(BaseManager):
         return job_vo
 
     def decrease_remained_tasks(self, job_id, domain_id):
-        job_vo = self.get(job_id, domain_id)
-        job_vo = job_vo.decrement('remained_tasks')
-        _LOGGER.debug(f'[decrease_remained_tasks] {job_id}, {job_vo.remained_tasks} / {job_vo.total_tasks}')
+        """ Decrease remained_tasks, and finish Job if it is the last task (one atomic update)
 
-        if job_vo.remained_tasks == 0:
-            if job_vo.mark_error == 0:
-                # Update to Finished
-                self.make_success_by_vo(job_vo)
-            else:
-                self.make_error_by_vo(job_vo)
+        Returns: job_vo (updated document)
+        """
+        job_data = self.job_model._get_collection().find_one_and_update(
+            {'job_id': job_id, 'domain_id': domain_id},
+            self.make_decrease_remained_tasks_update(datetime.utcnow()),
+            return_document=ReturnDocument.AFTER
+        )
+
+        if job_data is None:
+            raise ERROR_NOT_FOUND(key='job_id', value=job_id)
+
+        job_vo = self.job_model._from_son(job_data)
+        _LOGGER.debug(f'[decrease_remained_tasks] {job_id}, {job_vo.remained_tasks} / '
+                      f'{job_vo.total_tasks} ({job_vo.status})')
 
         if job_vo.remained_tasks < 0:
-            _LOGGER.debug(f'[decrease_remained_tasks] {job_id}, {remained_tasks}')
+            _LOGGER.debug(f'[decrease_remained_tasks] {job_id}, {job_vo.remained_tasks}')
             raise ERROR_JOB_UPDATE(param='remained_tasks')
         return job_vo
 
+    @staticmethod
+    def make_decrease_remained_tasks_update(finished_at):
+        """ Update pipeline of decrease_remained_tasks
+        When remained_tasks becomes 0,
+            - mark_error == 0: SUCCESS (if status is CREATED, IN_PROGRESS or SUCCESS)
+            - mark_error > 0: ERROR
+        (same as JobStateMachine.success() and error())
+        """
+        is_finished = {'$eq': ['$remained_tasks', 0]}
+        finished_status = {
+            '$cond': [
+                {'$gt': ['$mark_error', 0]},
+                ERROR,
+                {'$cond': [{'$in': ['$status', [CREATED, INPROGRESS, SUCCESS]]}, SUCCESS, '$status']}
+            ]
+        }
+
+        return [
+            {'$set': {'remained_tasks': {'$subtract': ['$remained_tasks', 1]}}},
+            {'$set': {
+                'status': {'$cond': [is_finished, finished_status, '$status']},
+                'finished_at': {
+                    '$cond': [
+                        {'$and': [is_finished, {'$in': [finished_status, [SUCCESS, ERROR]]}]},
+                        finished_at,
+                        '$finished_at'
+                    ]
+                }
+            }}
+        ]
+
     def add_error(self, job_id, domain_id, error_code, msg, additional=None):
         """
         error_info (dict): {
@@ -134,16 +169,11 @@ class JobManager(BaseManager):
         if additional:
             error_info['additional'] = additional
 
-        job_vo = self.get(job_id, domain_id)
-        job_dict = job_vo.to_dict()
-        errors = job_dict.get('errors', [])
-        errors.append(error_info)
-        params = {'errors': errors}
-        _LOGGER.debug(f'[add_error] {params}')
-        job_vo = job_vo.update(params)
-        self.mark_error_by_vo(job_vo)
-
-        return job_vo
+        _LOGGER.debug(f'[add_error] {job_id}: {error_info}')
+        self._update_job_error(job_id, domain_id, {
+            '$push': {'errors': make_push_error(error_info)},
+            '$set': {'mark_error': 1, 'updated_at': datetime.utcnow()}
+        })
 
     def update_job_status_by_hour(self, hour, status, domain_id):
         # Find Jobs
@@ -255,8 +285,14 @@ class JobManager(BaseManager):
     def mark_error(self, job_id, domain_id):
         """ Mark Job has error
         """
-        job_vo = self.get(job_id, domain_id)
-        job_vo.update({'mark_error': 1})
+        self._update_job_error(job_id, domain_id, {
+            '$set': {'mark_error': 1, 'updated_at': datetime.utcnow()}
+        })
+
+    def _update_job_error(self, job_id, domain_id, update):
+        result = self.job_model._get_collection().update_one({'job_id': job_id, 'domain_id': domain_id}, update)
+        if result.matched_count == 0:
+            raise ERROR_NOT_FOUND(key='job_id', value=job_id)
 
     def _check_filter(self, params):
         """ Schedule request may have filter
@@ -267,6 +303,16 @@ class JobManager(BaseManager):
             del params['filter']
         return params
 
+def make_push_error(error_info):
+    """ $push operator which appends error_info, keeping the last JOB_MAX_ERRORS errors """
+    max_errors = config.get_global('JOB_MAX_ERRORS', 1000)
+    push_error = {'$each': [error_info]}
+    if max_errors > 0:
+        push_error['$slice'] = -max_errors
+
+    return push_error
+
+
 CREATED = 'CREATED'
 INPROGRESS = 'IN_PROGRESS'
 CANCELED = 'CANCELED'
@@ -6,6 +6,8 @@ import logging
 from datetime import datetime, timedelta
 
 from spaceone.core.manager import BaseManager
+from spaceone.inventory.lib.resource_manager import ResourceManager
+from spaceone.inventory.manager.collector_manager.job_manager import make_push_error
 from spaceone.inventory.model.job_task_model import JobTask
 from spaceone.inventory.error import *
 
@@ -35,6 +37,40 @@ class JobTaskManager(BaseManager):
 
         return job_task_vo
 
+    def create_job_tasks(self, job_vo, secret_info_list, domain_id):
+        """ Create JobTasks of secrets with one insert_many
+
+        Returns: list of job_task_vo (same order as secret_info_list)
+        """
+        def _rollback(job_task_vos):
+            _LOGGER.info(f'[ROLLBACK] Delete job_tasks: {len(job_task_vos)}')
+            self.job_task_model._get_collection().delete_many({'_id': {'$in': [vo.pk for vo in job_task_vos]}})
+
+        if len(secret_info_list) == 0:
+            return []
+
+        job_task_vos = []
+        for secret_info in secret_info_list:
+            params = {
+                'job_id': job_vo.job_id,
+                'domain_id': domain_id
+            }
+            params.update(secret_info)
+            job_task_vos.append(ResourceManager.make_resource_vo(self.job_task_model, params))
+
+        try:
+            result = self.job_task_model._get_collection().insert_many(
+                [job_task_vo.to_mongo() for job_task_vo in job_task_vos])
+        except Exception as e:
+            raise ERROR_DB_QUERY(reason=e)
+
+        for job_task_vo, inserted_id in zip(job_task_vos, result.inserted_ids):
+            job_task_vo.pk = inserted_id
+
+        self.transaction.add_rollback(_rollback, job_task_vos)
+
+        return job_task_vos
+
     def get(self, job_task_id, domain_id):
         return self.job_task_model.get(job_task_id=job_task_id, domain_id=domain_id)
 
@@ -49,6 +85,9 @@ class JobTaskManager(BaseManager):
         job_task_vo.delete()
 
     def add_error(self, job_task_id, domain_id, error_code, msg, additional=None):
+        """ Append error to JobTask and make it FAILURE with one update
+        errors are capped to the last JOB_MAX_ERRORS items by $slice
+        """
         message = repr(msg)
         error_info = {
             'error_code': error_code,
@@ -56,20 +95,23 @@ class JobTaskManager(BaseManager):
         }
         if additional:
             error_info['additional'] = additional
-        job_task_vo = self.get(job_task_id, domain_id)
-        job_task_dict = job_task_vo.to_dict()
-        errors = job_task_dict.get('errors', [])
-        errors.append(error_info)
-        params = {'errors': errors}
-        _LOGGER.debug(f'[add_error] {params}')
-        job_task_vo = job_task_vo.update(params)
-
-        self.make_failure(job_task_id, domain_id)
+
+        _LOGGER.debug(f'[add_error] {job_task_id}: {error_info}')
+        job_task_info = self.job_task_model._get_collection().find_one_and_update(
+            {'job_task_id': job_task_id, 'domain_id': domain_id},
+            {
+                '$push': {'errors': make_push_error(error_info)},
+                '$set': {'status': FAILURE, 'finished_at': datetime.utcnow()}
+            },
+            projection={'_id': False, 'job_id': True}
+        )
+
+        if job_task_info is None:
+            raise ERROR_NOT_FOUND(key='job_task_id', value=job_task_id)
+
         # Update Job Failure
         job_mgr = self.locator.get_manager('JobManager')
-        job_mgr.mark_error(job_task_vo.job_id, domain_id)
-
-        return job_task_vo
+        job_mgr.mark_error(job_task_info['job_id'], domain_id)
 
     #######################
     # Secret
@@ -3,6 +3,7 @@ import logging
 from spaceone.core.manager import BaseManager
 
 from spaceone.inventory.error import *
+from spaceone.inventory.lib.plugin_client_pool import plugin_client_pool
 from spaceone.inventory.manager.collector_manager.secret_manager import SecretManager
 
 __ALL__ = ['PluginManager']
@@ -58,6 +59,7 @@ class PluginManager(BaseManager):
             except Exception as e:
                 _LOGGER.debug(f'[verify] {e}')
                 _LOGGER.warn(f'[verify] fail to verify with secret: {secret_id}')
+                self.locator.get_manager('SecretManager').delete_secret_cache(secret_id, domain_id)
         if verified and verified_options != None:
             return verified_options
         raise ERROR_VERIFY_PLUGIN_FAILURE(params=plugin_info)
@@ -80,7 +82,12 @@ class PluginManager(BaseManager):
         """ Get plugin endpoint
         """
         plugin_connector = self.locator.get_connector('PluginConnector')
-        return plugin_connector.get_plugin_endpoint(plugin_id, version, domain_id, labels)
+        if labels:
+            return plugin_connector.get_plugin_endpoint(plugin_id, version, domain_id, labels)
+
+        return plugin_client_pool.get_endpoint(
+            plugin_id, version, domain_id,
+            lambda: plugin_connector.get_plugin_endpoint(plugin_id, version, domain_id, labels))
 
     def init_plugin(self, endpoint, options):
         """ Init plugin
@@ -136,7 +143,7 @@ class PluginManager(BaseManager):
         if provider:
             result_list.extend(secret_mgr.get_secret_ids_from_provider(provider, domain_id))
         if secret_group_id:
-            result_list.extend(secret_mgr.get_secret_ids_from_secret_group_id(secret_group_id))
+            result_list.extend(secret_mgr.get_secret_ids_from_secret_group_id(secret_group_id, domain_id))
         if secret_id:
             result_list.append(secret_id)
         return result_list
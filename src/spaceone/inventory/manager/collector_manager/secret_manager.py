@@ -1,9 +1,13 @@
 import logging
 
 from google.protobuf.json_format import MessageToDict
+from spaceone.core import config
 from spaceone.core.manager import BaseManager
+from spaceone.inventory.lib.secret_cache import secret_cache
 
 _LOGGER = logging.getLogger(__name__)
+_DEFAULT_PAGE_SIZE = 1000
+SECRET_INFO_KEYS = ['secret_id', 'provider', 'service_account_id', 'project_id']
 
 
 class SecretManager(BaseManager):
@@ -32,32 +36,78 @@ class SecretManager(BaseManager):
         _LOGGER.debug(f'[get_secret_ids_from_secret_group_id] found: {secrets.total_count}, by {secret_group_id}')
         return result
 
+    def list_secret_infos(self, secret_ids, domain_id):
+        """ List secret_id, provider, service_account_id and project_id of secrets (paged list call)
+
+        Return: {secret_id: secret_info}
+        """
+        secret_connector = self.locator.get_connector('SecretConnector')
+        page_size = config.get_global('SECRET_LIST_PAGE_SIZE', _DEFAULT_PAGE_SIZE)
+        secret_ids = list(set(secret_ids))
+
+        secret_infos = {}
+        for start in range(0, len(secret_ids), page_size):
+            query = {
+                'only': SECRET_INFO_KEYS,
+                'filter': [{'k': 'secret_id', 'v': secret_ids[start:start + page_size], 'o': 'in'}]
+            }
+            secrets = secret_connector.list_secrets(query, domain_id)
+            for secret in secrets.results:
+                secret_dict = MessageToDict(secret, preserving_proto_field_name=True)
+                secret_infos[secret_dict['secret_id']] = self.make_secret_info(secret_dict)
+
+        _LOGGER.debug(f'[list_secret_infos] found: {len(secret_infos)} / {len(secret_ids)}')
+        return secret_infos
+
+    @staticmethod
+    def make_secret_info(secret):
+        """ secret_info of JobTask from secret (dict) """
+        secret_info = {}
+        if secret:
+            for key in SECRET_INFO_KEYS:
+                if secret.get(key):
+                    secret_info[key] = secret[key]
+
+        return secret_info
+
     def get_secret_data(self, secret_id, domain_id):
         """
         Return: Dict type of secret
         """
+        secret_data = secret_cache.get_secret_data(secret_id, domain_id)
+        if secret_data:
+            return secret_data
+
         secret_connector = self.locator.get_connector('SecretConnector')
         secret_data = secret_connector.get_secret_data(secret_id, domain_id)
         secret_data_dict = MessageToDict(secret_data, preserving_proto_field_name=True)
         _LOGGER.debug(f'[get_secret_data] secret_data.keys: {list(secret_data_dict)}')
+        secret_cache.set_secret_data(secret_id, domain_id, secret_data)
         return secret_data
 
     def get_provider(self, secret_id, domain_id):
         """
         Return: provider in secret
         """
-        secret_connector = self.locator.get_connector('SecretConnector')
-        secret = secret_connector.get_secret(secret_id, domain_id)
-        secret_dict = MessageToDict(secret, preserving_proto_field_name=True)
-        _LOGGER.debug(f'[get_provider] secret: {secret}')
+        secret_dict = self.get_secret(secret_id, domain_id)
         return secret_dict.get('provider', None)
 
     def get_secret(self, secret_id, domain_id):
         """
         Return: secret
         """
+        secret_dict = secret_cache.get_secret(secret_id, domain_id)
+        if secret_dict:
+            return dict(secret_dict)
+
         secret_connector = self.locator.get_connector('SecretConnector')
         secret = secret_connector.get_secret(secret_id, domain_id)
         secret_dict = MessageToDict(secret, preserving_proto_field_name=True)
         _LOGGER.debug(f'[get_secret] secret: {secret_dict}')
-        return secret_dict
+        secret_cache.set_secret(secret_id, domain_id, secret_dict)
+        return dict(secret_dict)
+
+    @staticmethod
+    def delete_secret_cache(secret_id, domain_id):
+        """ Remove cached secret and secret_data (secret_id: None, all secrets of domain) """
+        secret_cache.invalidate(domain_id, secret_id)
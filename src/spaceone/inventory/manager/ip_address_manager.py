@@ -28,11 +28,10 @@ class IPManager(BaseManager, ResourceManager):
         return ip_vo
 
     def update_ip_by_vo(self, params, ip_vo):
-        def _rollback(old_data):
-            _LOGGER.info(f'[ROLLBACK] Revert Data : {old_data.get("ip_address")}')
-            ip_vo.update(old_data)
+        self.add_update_rollback(ip_vo, params)
 
-        self.transaction.add_rollback(_rollback, ip_vo.to_dict())
+        if self.is_partial_update_mode():
+            return self.update_resource_vo_partially(params, ip_vo)
 
         return ip_vo.update(params)
 
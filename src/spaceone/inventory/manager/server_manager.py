@@ -13,12 +13,16 @@ class ServerManager(BaseManager, ResourceManager):
 
     resource_keys = ['server_id']
     query_method = 'list_servers'
+    model_name = 'Server'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.server_model: Server = self.locator.get_model('Server')
 
     def create_server(self, params):
+        if self.is_bulk_write_mode():
+            return self.make_resource_vo(self.server_model, params)
+
         def _rollback(server_vo):
             _LOGGER.info(f'[ROLLBACK] Delete Server : {server_vo.name} ({server_vo.server_id})')
             server_vo.terminate()
@@ -33,11 +37,17 @@ class ServerManager(BaseManager, ResourceManager):
         return self.update_server_by_vo(params, server_vo)
 
     def update_server_by_vo(self, params, server_vo):
-        def _rollback(old_data):
-            _LOGGER.info(f'[ROLLBACK] Revert Server Data : {old_data["name"]} ({old_data["server_id"]})')
-            server_vo.update(old_data)
+        if self.is_bulk_write_mode():
+            if self.is_partial_update_mode():
+                return self.update_resource_vo_partially(params, server_vo)
+
+            return self.update_resource_vo(params, server_vo)
+
+        self.add_update_rollback(server_vo, params)
+
+        if self.is_partial_update_mode():
+            return self.update_resource_vo_partially(params, server_vo)
 
-        self.transaction.add_rollback(_rollback, server_vo.to_dict())
         return server_vo.update(params)
 
     def delete_server(self, server_id, domain_id):
@@ -14,6 +14,7 @@ from spaceone.inventory.model.task_item_model import TaskItem
 from spaceone.inventory.model.cloud_service_type_model import CloudServiceType
 from spaceone.inventory.model.cloud_service_model import CloudService
 from spaceone.inventory.model.collection_info_model import CollectionInfo
+from spaceone.inventory.model.change_history_model import ResourceChangeHistory
 from spaceone.inventory.model.reference_resource_model import ReferenceResource
 from spaceone.inventory.model.resource_group_model import ResourceGroup
 from spaceone.inventory.model.device_type_model import DeviceType
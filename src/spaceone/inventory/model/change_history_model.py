@@ -0,0 +1,42 @@
+from mongoengine import *
+
+from spaceone.core.model.mongo_model import MongoModel
+
+
+class ResourceChangeHistory(MongoModel):
+    resource_id = StringField(max_length=40)
+    resource_type = StringField(max_length=255, default=None, null=True)
+    key = StringField()
+    diff = DictField()
+    job_id = StringField(max_length=40, default=None, null=True)
+    updated_by = StringField(max_length=40)
+    updated_at = DateTimeField()
+    expire_at = DateTimeField()
+    domain_id = StringField(max_length=255)
+
+    meta = {
+        'exact_fields': [
+            'resource_id',
+            'resource_type',
+            'job_id',
+            'updated_by',
+            'domain_id',
+        ],
+        'minimal_fields': [
+            'resource_id',
+            'key',
+            'updated_by',
+            'updated_at',
+        ],
+        'ordering': [
+            '-updated_at'
+        ],
+        'indexes': [
+            ('resource_id', 'domain_id'),
+            'job_id',
+            {
+                'fields': ['expire_at'],
+                'expireAfterSeconds': 0
+            }
+        ]
+    }
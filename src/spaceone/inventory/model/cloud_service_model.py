@@ -79,7 +79,12 @@ class CloudService(MongoModel):
             'region_ref',
             'project_id',
             'domain_id',
-            'collection_info.state'
+            'collection_info.state',
+            # Compound indexes for collector (match rules) and cleanup
+            ('domain_id', 'reference.resource_id'),
+            ('domain_id', 'provider', 'cloud_service_group', 'cloud_service_type'),
+            ('domain_id', 'collection_info.state', 'updated_at'),
+            ('domain_id', 'state', 'updated_at')
         ],
     }
 
@@ -4,7 +4,8 @@ from mongoengine import *
 class ChangeHistory(EmbeddedDocument):
     key = StringField()
     job_id = StringField(max_length=40, default=None, null=True)
-    diff = DictField()
+    diff = DictField(default=None, null=True)
+    fingerprint = StringField(max_length=40, default=None, null=True)
     updated_by = StringField(max_length=40)
     updated_at = DateTimeField()
 
@@ -16,6 +17,7 @@ class CollectionInfo(EmbeddedDocument):
     secrets = ListField(StringField(max_length=40))
     change_history = ListField(EmbeddedDocumentField(ChangeHistory))
     pinned_keys = ListField(StringField())
+    fingerprint = StringField(max_length=40, default=None, null=True)
 
     def to_dict(self):
         return self.to_mongo()
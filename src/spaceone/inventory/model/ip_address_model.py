@@ -71,7 +71,11 @@ class IPAddress(MongoModel):
             'zone',
             'domain_id',
             'reference.resource_id',
-            'collection_info.state'
+            'collection_info.state',
+            # Compound indexes for collector (match rules) and cleanup
+            ('domain_id', 'reference.resource_id'),
+            ('domain_id', 'ip_address'),
+            ('domain_id', 'collection_info.state', 'updated_at')
         ],
         'aggregate': {
             'lookup': {
@@ -123,7 +123,12 @@ class Server(MongoModel):
             'region_ref',
             'project_id',
             'domain_id',
-            'collection_info.state'
+            'collection_info.state',
+            # Compound indexes for collector (match rules) and cleanup
+            ('domain_id', 'reference.resource_id'),
+            ('domain_id', 'data.compute.instance_id'),
+            ('domain_id', 'collection_info.state', 'updated_at'),
+            ('domain_id', 'state', 'updated_at')
         ],
     }
 
@@ -1,12 +1,15 @@
 import json
 import logging
+import threading
+import time
 
 from spaceone.core.scheduler.worker import BaseWorker
 from spaceone.core.locator import Locator
 from spaceone.core.transaction import Transaction
 from spaceone.core import queue
 
-from spaceone.inventory.manager.collector_manager.collecting_manager import CollectingManager
+from spaceone.inventory.manager.collector_manager.collecting_manager import CollectingManager, \
+    JOB_TASK_TIMEOUT_CHECK_INTERVAL
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,6 +24,7 @@ class InventoryDBUpdater(BaseWorker):
         """
         # Create Manager
         collecting_mgr = self.locator.get_manager('CollectingManager')
+        self._start_job_task_timeout_thread()
 
         while True:
             # Read from Queue
@@ -31,8 +35,12 @@ class InventoryDBUpdater(BaseWorker):
                 collecting_mgr.transaction = Transaction(resource_info['meta'])
                 # processing
                 method = resource_info['method']
-                if method == '_process_single_result':
-                    collecting_mgr._process_single_result(resource_info['res'], resource_info['param'])
+                if method == '_process_db_update_task':
+                    collecting_mgr._process_db_update_task(resource_info['res'], resource_info['param'])
+                elif method == '_process_single_result':
+                    # Task of previous version (single resource)
+                    collecting_mgr._process_db_update_task([resource_info['res']], resource_info['param'],
+                                                           inflight=False)
                 elif method == '_watchdog_job_task_stat':
                     collecting_mgr._watchdog_job_task_stat(resource_info['param'])
                 else:
@@ -42,3 +50,16 @@ class InventoryDBUpdater(BaseWorker):
                 _LOGGER.error(f'[{self._name_}] failed to processing: {e}')
                 continue
 
+    def _start_job_task_timeout_thread(self):
+        thread = threading.Thread(target=self._timeout_job_tasks_periodically, daemon=True)
+        thread.start()
+
+    def _timeout_job_tasks_periodically(self):
+        """ JobTasks of lost db_q tasks are finalized by deadline (any consumer can do it only once) """
+        collecting_mgr = self.locator.get_manager('CollectingManager')
+        while True:
+            time.sleep(JOB_TASK_TIMEOUT_CHECK_INTERVAL)
+            try:
+                collecting_mgr.timeout_job_tasks()
+            except Exception as e:
+                _LOGGER.error(f'[{self._name_}] failed to check timeout of JobTasks: {e}')
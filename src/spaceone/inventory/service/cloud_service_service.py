@@ -140,8 +140,11 @@ class CloudServiceService(BaseService):
             # SKIP Validation Check
             params['project_id'] = secret_project_id
 
-        cloud_svc_data = cloud_svc_vo.to_dict()
         exclude_keys = ['cloud_service_id', 'domain_id', 'release_project', 'release_region']
+        if data_mgr.is_unchanged_data(params, cloud_svc_vo, exclude_keys=exclude_keys):
+            return self.cloud_svc_mgr.touch_resource_vo(cloud_svc_vo)
+
+        cloud_svc_data = cloud_svc_vo.to_dict()
         params = data_mgr.merge_data_by_history(params, cloud_svc_data, exclude_keys=exclude_keys)
 
         return self.cloud_svc_mgr.update_cloud_service_by_vo(params, cloud_svc_vo)
@@ -10,6 +10,7 @@ from spaceone.inventory.manager.zone_manager import ZoneManager
 from spaceone.inventory.manager.pool_manager import PoolManager
 from spaceone.inventory.info.collector_info import PluginInfo
 from spaceone.inventory.manager.collector_manager.repository_manager import RepositoryManager
+from spaceone.inventory.lib.collector_priority_cache import collector_priority_cache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -78,7 +79,12 @@ class CollectorService(BaseService):
         _LOGGER.debug(f'[update] params: {params}')
         _LOGGER.debug(f'[update] merged_params: {merged_params}')
 
-        return collector_mgr.update_collector_by_vo(collector_vo, merged_params)
+        collector_vo = collector_mgr.update_collector_by_vo(collector_vo, merged_params)
+
+        if 'priority' in params:
+            collector_priority_cache.invalidate(collector_id)
+
+        return collector_vo
 
     @transaction
     @check_required(['collector_id', 'domain_id'])
@@ -88,6 +94,7 @@ class CollectorService(BaseService):
         domain_id = params['domain_id']
         #collector_mgr.delete_schedulers_by_collector_id(collector_id, domain_id)
 
+        collector_priority_cache.invalidate(collector_id)
         return collector_mgr.delete_collector(collector_id, domain_id)
 
     @transaction
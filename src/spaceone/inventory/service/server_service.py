@@ -178,8 +178,11 @@ class ServerService(BaseService):
                 params['primary_ip_address'] = self._get_primary_ip_address(
                     primary_ip_address, server_vo.ip_addresses)
 
-        server_data = server_vo.to_dict()
         exclude_keys = ['server_id', 'domain_id', 'release_project', 'release_pool']
+        if data_mgr.is_unchanged_data(params, server_vo, exclude_keys=exclude_keys):
+            return self.server_mgr.touch_resource_vo(server_vo)
+
+        server_data = server_vo.to_dict()
         params = data_mgr.merge_data_by_history(params, server_data, exclude_keys=exclude_keys)
 
         return self.server_mgr.update_server_by_vo(params, server_vo)
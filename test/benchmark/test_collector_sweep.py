@@ -0,0 +1,284 @@
+import json
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import mongomock
+from mongoengine import connect, disconnect
+from pymongo import MongoClient, monitoring
+from spaceone.api.inventory.plugin import collector_pb2
+from spaceone.core import config, utils
+from spaceone.core.model.mongo_model import MongoModel
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib import job_task_stat_counter
+from spaceone.inventory.lib.collector_metrics import collector_metrics
+from spaceone.inventory.manager.collector_manager import collecting_manager
+from spaceone.inventory.manager.collector_manager.collecting_manager import CollectingManager
+from spaceone.inventory.manager.collector_manager.secret_manager import SecretManager
+from spaceone.inventory.manager.identity_manager import IdentityManager
+from spaceone.inventory.model.cloud_service_model import CloudService
+from spaceone.inventory.model.job_model import Job
+from spaceone.inventory.model.job_task_model import JobTask
+from spaceone.inventory.model.server_model import Server
+
+# in-process MongoDB (mongomock), if SPACEONE_TEST_MONGO_HOST is not set
+MONGO_HOST = os.environ.get('SPACEONE_TEST_MONGO_HOST')
+NUMBER_OF_SERVERS = int(os.environ.get('SPACEONE_BENCHMARK_SERVERS', 100))
+NUMBER_OF_CLOUD_SERVICES = int(os.environ.get('SPACEONE_BENCHMARK_CLOUD_SERVICES', 100))
+BENCHMARK_DB = 'inventory_benchmark'
+
+
+def make_server(idx, version):
+    return {
+        'name': f'server-{idx}',
+        'provider': 'aws',
+        'server_type': 'VM',
+        'os_type': 'LINUX',
+        'primary_ip_address': f'10.0.{idx // 250}.{idx % 250}',
+        'data': {
+            'compute': {
+                'instance_id': f'i-{idx:08d}',
+                'instance_state': 'RUNNING' if version % 2 == 0 else 'STOPPED',
+                'instance_type': 't3.medium'
+            },
+            'os': {'os_distro': 'ubuntu', 'os_arch': 'x86_64'},
+            'security_group': [{'group_id': f'sg-{i}', 'protocol': 'tcp', 'port': i} for i in range(10)]
+        },
+        'nics': [{'device_index': 0, 'ip_addresses': [f'10.0.{idx // 250}.{idx % 250}'], 'device': 'eth0'}],
+        'reference': {'resource_id': f'arn:aws:ec2:i-{idx:08d}'},
+        'region_code': 'ap-northeast-2',
+        'region_type': 'AWS'
+    }
+
+
+def make_cloud_service(idx, version):
+    return {
+        'provider': 'aws',
+        'cloud_service_group': 'EC2',
+        'cloud_service_type': 'SecurityGroup',
+        'data': {
+            'group_id': f'sg-{idx:08d}',
+            'version': version,
+            'ip_permissions': [{'from_port': port, 'to_port': port, 'ip_protocol': 'tcp'} for port in range(20)],
+            'tags': [{'key': f'key-{i}', 'value': f'value-{i}'} for i in range(10)]
+        },
+        'reference': {'resource_id': f'arn:aws:ec2:sg-{idx:08d}'}
+    }
+
+
+def make_resource_info(resource_type, resource):
+    resource_info = collector_pb2.ResourceInfo(resource_type=resource_type, state='SUCCESS')
+    resource_info.resource.update(resource)
+    resource_info.match_rules.update({'1': ['reference.resource_id']})
+    return resource_info
+
+
+class FakeCollectorPluginConnector(object):
+    """ Collector plugin which yields synthetic resources in process
+    latencies: seconds between yield of a resource and request of next one (processing time of collector)
+    """
+
+    def __init__(self, version):
+        self.messages = [make_resource_info('inventory.Server', make_server(idx, version))
+                         for idx in range(NUMBER_OF_SERVERS)]
+        self.messages += [make_resource_info('inventory.CloudService', make_cloud_service(idx, version))
+                          for idx in range(NUMBER_OF_CLOUD_SERVICES)]
+        self.latencies = []
+
+    def collect(self, options, secret_data, filter):
+        for message in self.messages:
+            yielded_at = time.time()
+            yield message
+            self.latencies.append(time.time() - yielded_at)
+
+
+class FakeCache(object):
+    """ In-memory cache for db_q stat keys """
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+
+    def increment(self, key, amount=1):
+        self.data[key] = int(self.data.get(key) or 0) + amount
+        return self.data[key]
+
+    def decrement(self, key, amount=1):
+        return self.increment(key, -amount)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+class CommandCounter(monitoring.CommandListener):
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.database_name == BENCHMARK_DB:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class SecretData(object):
+    data = {}
+
+
+class TestCollectorSweepBenchmark(unittest.TestCase):
+    """ Throughput of CollectingManager.collecting_resources with fake plugin
+    (SPACEONE_BENCHMARK_SERVERS, SPACEONE_BENCHMARK_CLOUD_SERVICES)
+
+    MongoDB is in process (mongomock) by default, then DB commands are not counted.
+    For numbers of real MongoDB, set SPACEONE_TEST_MONGO_HOST (ex. mongodb://localhost:27017).
+    Latency is per resource in sync modes, and per db_q task (batch of resources) in db_q mode.
+    """
+    command_counter = CommandCounter()
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCollectorSweepBenchmark, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+
+        disconnect()
+        if MONGO_HOST:
+            monitoring.register(cls.command_counter)
+            connect(BENCHMARK_DB, host=MONGO_HOST)
+        else:
+            connect(BENCHMARK_DB, host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestCollectorSweepBenchmark, cls).tearDownClass()
+        if MONGO_HOST:
+            MongoClient(MONGO_HOST).drop_database(BENCHMARK_DB)
+        disconnect()
+
+    def setUp(self):
+        # Token is not needed, identity service is not called by collector
+        for patcher in [patch.object(MongoModel, 'connect', return_value=None),
+                        patch.object(IdentityManager, '__init__', return_value=None)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _run_sweep(self, mode, sweep, version, domain_id):
+        # Stat of db_q is flushed by each task, so JobTask is finalized by the last task
+        global_conf = {
+            'QUEUES': {'db_q': {}} if mode == 'db_q' else {},
+            'COLLECTOR_BULK_SIZE': 100 if mode == 'sync_bulk' else 0,
+            'COLLECTOR_DB_QUEUE_MAX_INFLIGHT': 0,
+            'COLLECTOR_STAT_FLUSH_SIZE': 0
+        }
+        with patch.dict(config.get_global(), global_conf):
+            return self._run_collecting_resources(mode, sweep, version, domain_id)
+
+    def _run_collecting_resources(self, mode, sweep, version, domain_id):
+        job_vo = Job.create({'status': 'IN_PROGRESS', 'total_tasks': 1, 'remained_tasks': 1, 'domain_id': domain_id})
+        job_task_vo = JobTask.create({'job_id': job_vo.job_id, 'secret_id': 'secret-benchmark',
+                                      'domain_id': domain_id})
+        connector = FakeCollectorPluginConnector(version)
+        db_queue = []
+        fake_cache = FakeCache()
+
+        transaction = Transaction({'service': 'inventory', 'api_class': 'Collector', 'domain_id': domain_id})
+        collecting_mgr = CollectingManager(transaction=transaction)
+        collector_metrics.reset()
+        self.command_counter.count = 0
+
+        with patch.object(CollectingManager, '_get_connector', return_value=connector), \
+                patch.object(SecretManager, 'get_secret_data', return_value=SecretData()), \
+                patch.object(SecretManager, 'get_secret', return_value={'secret_id': 'secret-benchmark',
+                                                                        'provider': 'aws'}), \
+                patch.object(collecting_manager.queue, 'put', side_effect=lambda name, task: db_queue.append(task)), \
+                patch.object(collecting_manager, 'cache', fake_cache), \
+                patch.object(job_task_stat_counter, 'cache', fake_cache), \
+                patch.object(job_task_stat_counter, '_get_redis_connection', return_value=None):
+            start = time.time()
+            collecting_mgr.collecting_resources({'plugin_id': 'plugin-benchmark', 'version': '1.0', 'options': {}},
+                                                'secret-benchmark', {}, domain_id,
+                                                job_id=job_vo.job_id, job_task_id=job_task_vo.job_task_id,
+                                                collector_id='collector-benchmark', use_cache=False)
+            latencies = connector.latencies
+            if mode == 'db_q':
+                latencies = self._drain_db_queue(collecting_mgr, db_queue)
+            elapsed = time.time() - start
+
+        number_of_resources = len(connector.messages)
+        job_vo.reload()
+        job_task_vo.reload()
+        self.assertEqual(job_vo.status, 'SUCCESS', f'{mode} {sweep}')
+        self.assertEqual(job_task_vo.status, 'SUCCESS', f'{mode} {sweep}')
+        self.assertEqual(job_task_vo.failure_count, 0)
+        if sweep == 'create':
+            self.assertEqual(job_task_vo.created_count, number_of_resources)
+        else:
+            self.assertEqual(job_task_vo.updated_count, number_of_resources)
+
+        self.assertEqual(Server.objects(domain_id=domain_id).count(), NUMBER_OF_SERVERS)
+        self.assertEqual(CloudService.objects(domain_id=domain_id).count(), NUMBER_OF_CLOUD_SERVICES)
+
+        latencies = sorted(latencies)
+        self.assertGreater(len(latencies), 0)
+        return {
+            'mode': mode,
+            'sweep': sweep,
+            'resources_per_second': number_of_resources / elapsed,
+            'db_ops_per_resource': self.command_counter.count / number_of_resources if MONGO_HOST else None,
+            'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000
+        }
+
+    @staticmethod
+    def _drain_db_queue(collecting_mgr, db_queue):
+        """ Process db_q tasks like InventoryDBUpdater
+        Returns: latencies of db_q tasks (each task has COLLECTOR_DB_QUEUE_BATCH_SIZE resources)
+        """
+        latencies = []
+        while len(db_queue) > 0:
+            task = json.loads(db_queue.pop(0))
+            collecting_mgr.transaction = Transaction(task['meta'])
+            if task['method'] == '_process_db_update_task':
+                start = time.time()
+                collecting_mgr._process_db_update_task(task['res'], task['param'])
+                latencies.append(time.time() - start)
+
+        return latencies
+
+    def _run_mode(self, mode):
+        domain_id = utils.generate_id('domain')
+        results = [self._run_sweep(mode, 'create', 0, domain_id),
+                   self._run_sweep(mode, 'update', 1, domain_id),
+                   self._run_sweep(mode, 'same', 1, domain_id)]
+
+        for result in results:
+            self.assertGreater(result['resources_per_second'], 0)
+
+        if MONGO_HOST:
+            # Unchanged resources are only touched
+            self.assertLessEqual(results[2]['db_ops_per_resource'], results[1]['db_ops_per_resource'])
+
+    def test_sync(self):
+        self._run_mode('sync')
+
+    def test_sync_bulk(self):
+        self._run_mode('sync_bulk')
+
+    def test_db_queue(self):
+        self._run_mode('db_q')
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
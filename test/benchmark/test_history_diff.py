@@ -0,0 +1,70 @@
+import os
+import timeit
+import unittest
+
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib.history_diff import get_history_diff
+
+# Timing depends on machine and load, compare it only on demand (with larger list)
+BENCHMARK_TIMING = os.environ.get('SPACEONE_BENCHMARK_TIMING') == 'true'
+NUMBER_OF_ELEMENTS = 10000 if BENCHMARK_TIMING else 1000
+
+
+def get_history_diff_by_scan(old_data, new_data):
+    """ Previous implementation of CollectionDataManager._get_history_diff (O(n * m)) """
+    return {
+        'insert': [value for value in new_data if value not in old_data],
+        'delete': [value for value in old_data if value not in new_data]
+    }
+
+
+def make_rule(idx):
+    return {
+        'protocol': 'tcp',
+        'port_range_min': idx,
+        'port_range_max': idx,
+        'remote_cidr': f'10.{idx // 256 % 256}.{idx % 256}.0/24',
+        'tags': [{'key': 'name', 'value': f'rule-{idx}'}]
+    }
+
+
+class TestHistoryDiffBenchmark(unittest.TestCase):
+    """ Micro benchmark of list diff in change history (security group rules, disks, tags ...) """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestHistoryDiffBenchmark, cls).setUpClass()
+        cls.old_data = [make_rule(idx) for idx in range(NUMBER_OF_ELEMENTS)]
+        # 10% of rules are replaced
+        cls.new_data = [make_rule(idx) for idx in range(NUMBER_OF_ELEMENTS // 10, NUMBER_OF_ELEMENTS * 11 // 10)]
+
+    def test_get_history_diff(self):
+        old_data = [{'a': 1, 'b': [1, 2]}, {'c': 3}, 'x', 1, [1, 2], {'c': 3}]
+        new_data = [{'b': [1, 2], 'a': 1}, 'y', 1, [2, 1]]
+        self.assertEqual(get_history_diff(old_data, new_data), get_history_diff_by_scan(old_data, new_data))
+        self.assertEqual(get_history_diff(old_data, new_data), {
+            'insert': ['y', [2, 1]],
+            'delete': [{'c': 3}, 'x', [1, 2], {'c': 3}]
+        })
+
+    def test_get_history_diff_not_list(self):
+        self.assertEqual(get_history_diff({'a': 1}, {'a': 2}), {'insert': {'a': 2}, 'delete': {'a': 1}})
+        self.assertEqual(get_history_diff('old', ['new']), {'insert': ['new'], 'delete': 'old'})
+
+    def test_get_history_diff_of_rules(self):
+        history_diff = get_history_diff(self.old_data, self.new_data)
+        self.assertEqual(history_diff, get_history_diff_by_scan(self.old_data, self.new_data))
+        self.assertEqual(len(history_diff['insert']), NUMBER_OF_ELEMENTS // 10)
+        self.assertEqual(len(history_diff['delete']), NUMBER_OF_ELEMENTS // 10)
+
+    @unittest.skipUnless(BENCHMARK_TIMING, 'set SPACEONE_BENCHMARK_TIMING=true to compare timing')
+    def test_benchmark(self):
+        scan_time = timeit.timeit(lambda: get_history_diff_by_scan(self.old_data, self.new_data), number=1)
+        hash_time = timeit.timeit(lambda: get_history_diff(self.old_data, self.new_data), number=1)
+
+        self.assertLess(hash_time, scan_time,
+                        f'hash: {hash_time:.4f}s, scan: {scan_time:.4f}s ({NUMBER_OF_ELEMENTS} elements)')
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
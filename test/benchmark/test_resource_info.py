@@ -0,0 +1,87 @@
+import os
+import timeit
+import unittest
+
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.struct_pb2 import Struct
+from spaceone.api.inventory.plugin import collector_pb2
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib.resource_info import struct_to_dict, message_to_dict
+
+# Timing depends on machine and load, compare it only on demand (with more resources)
+BENCHMARK_TIMING = os.environ.get('SPACEONE_BENCHMARK_TIMING') == 'true'
+NUMBER_OF_RESOURCES = 1000 if BENCHMARK_TIMING else 10
+
+
+def make_cloud_service_data(idx):
+    return {
+        'provider': 'aws',
+        'cloud_service_group': 'EC2',
+        'cloud_service_type': 'SecurityGroup',
+        'data': {
+            'group_id': f'sg-{idx:08d}',
+            'group_name': f'security-group-{idx}',
+            'vpc_id': 'vpc-00000001',
+            'ip_permissions': [
+                {
+                    'from_port': port,
+                    'to_port': port,
+                    'ip_protocol': 'tcp',
+                    'ip_ranges': [{'cidr_ip': f'10.0.{i}.0/24', 'description': f'rule {i}'} for i in range(10)],
+                    'user_id_group_pairs': []
+                } for port in range(20)
+            ],
+            'tags': [{'key': f'key-{i}', 'value': f'value-{i}'} for i in range(20)]
+        },
+        'metadata': {
+            'view': {
+                'sub_data': {
+                    'layouts': [{'name': f'layout-{i}', 'type': 'table', 'options': {'fields': []}}
+                                for i in range(5)]
+                }
+            }
+        }
+    }
+
+
+class TestResourceInfoBenchmark(unittest.TestCase):
+    """ Micro benchmark of protobuf Struct conversion for collector ResourceInfo stream """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestResourceInfoBenchmark, cls).setUpClass()
+        cls.structs = []
+        for idx in range(NUMBER_OF_RESOURCES):
+            struct = Struct()
+            struct.update(make_cloud_service_data(idx))
+            cls.structs.append(struct)
+
+    def test_struct_to_dict(self):
+        for struct in self.structs[:10]:
+            self.assertEqual(struct_to_dict(struct), MessageToDict(struct, preserving_proto_field_name=True))
+
+    def test_message_to_dict(self):
+        resource_info = collector_pb2.ResourceInfo(resource_type='inventory.CloudService', state='SUCCESS')
+        resource_info.resource.update(make_cloud_service_data(0))
+        resource_info.match_rules.update({'1': ['data.group_id']})
+
+        message_dict = message_to_dict(resource_info)
+        self.assertEqual(message_dict, MessageToDict(resource_info, preserving_proto_field_name=True))
+        self.assertEqual(message_dict['state'], 'SUCCESS')
+        self.assertEqual(message_dict['resource']['data']['group_id'], 'sg-00000000')
+
+    @unittest.skipUnless(BENCHMARK_TIMING, 'set SPACEONE_BENCHMARK_TIMING=true to compare timing')
+    def test_benchmark(self):
+        message_to_dict_time = timeit.timeit(
+            lambda: [MessageToDict(struct, preserving_proto_field_name=True) for struct in self.structs], number=1)
+        struct_to_dict_time = timeit.timeit(
+            lambda: [struct_to_dict(struct) for struct in self.structs], number=1)
+
+        self.assertLess(struct_to_dict_time, message_to_dict_time,
+                        f'struct_to_dict: {struct_to_dict_time:.4f}s, MessageToDict: {message_to_dict_time:.4f}s '
+                        f'({NUMBER_OF_RESOURCES} resources)')
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import patch
+
+from spaceone.core import config
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib import collector_metrics
+from spaceone.inventory.lib.collector_metrics import BUCKETS, CollectorMetrics, Histogram
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_bucket_boundary(self):
+        histogram = Histogram()
+        histogram.observe(0.01)
+        histogram.observe(0.010001)
+        histogram.observe(10)
+        histogram.observe(10.5)
+
+        # Bucket has observations less than or equal to its upper bound
+        self.assertEqual(histogram.buckets[BUCKETS.index(0.01)], 1)
+        self.assertEqual(histogram.buckets[BUCKETS.index(0.025)], 1)
+        self.assertEqual(histogram.buckets[BUCKETS.index(10)], 1)
+        self.assertEqual(histogram.buckets[-1], 1)
+
+    def test_percentile(self):
+        histogram = Histogram()
+        self.assertEqual(histogram.percentile(50), 0.0)
+
+        for elapsed in [0.001] * 50 + [0.02] * 45 + [20] * 5:
+            histogram.observe(elapsed)
+
+        self.assertEqual(histogram.percentile(50), 0.001)
+        self.assertEqual(histogram.percentile(95), 0.025)
+        self.assertEqual(histogram.percentile(99), 20)
+        self.assertEqual(histogram.to_dict(), {
+            'count': 100,
+            'sum': 100.95,
+            'avg': 1.0095,
+            'p50': 0.001,
+            'p95': 0.025,
+            'p99': 20,
+            'max': 20
+        })
+
+
+class TestCollectorMetrics(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCollectorMetrics, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+
+    def setUp(self):
+        patcher = patch('spaceone.inventory.lib.collector_metrics.time')
+        self.time = patcher.start()
+        self.time.time.return_value = 1000
+        self.addCleanup(patcher.stop)
+
+        patcher = patch.object(collector_metrics._LOGGER, 'info')
+        self.log_info = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.metrics = CollectorMetrics()
+
+    def test_get_stat(self):
+        self.metrics.observe(collector_metrics.MATCH, 0.002, 'collector-1', 'inventory.Server')
+        self.metrics.observe(collector_metrics.MATCH, 0.004, 'collector-1', 'inventory.Server')
+        self.metrics.observe(collector_metrics.MATCH, 0.1, 'collector-2', 'inventory.Server')
+        self.metrics.observe(collector_metrics.UPDATE, 0.1, 'collector-1', 'inventory.Server')
+
+        stat = self.metrics.get_stat(collector_metrics.MATCH, 'collector-1')
+        self.assertEqual(len(stat), 1)
+        self.assertEqual((stat[0]['count'], stat[0]['p50'], stat[0]['max']), (2, 0.0025, 0.004))
+        self.assertEqual(len(self.metrics.get_stat(collector_metrics.MATCH)), 2)
+
+        self.metrics.reset()
+        self.assertEqual(self.metrics.get_stat(), [])
+
+    def test_log_summary(self):
+        with patch.dict(config.get_global(), {'COLLECTOR_METRICS_LOG_INTERVAL': 60}):
+            self.metrics.observe(collector_metrics.MATCH, 0.002, 'collector-1', 'inventory.Server')
+            self.log_info.assert_not_called()
+
+            self.time.time.return_value = 1060
+            self.metrics.observe(collector_metrics.MATCH, 0.002, 'collector-1', 'inventory.Server')
+            self.log_info.assert_called_once()
+
+    def test_log_summary_disabled(self):
+        with patch.dict(config.get_global(), {'COLLECTOR_METRICS_LOG_INTERVAL': 0}):
+            for idx in range(10):
+                self.time.time.return_value = 1000 + idx * 3600
+                self.metrics.observe(collector_metrics.MATCH, 0.002, 'collector-1', 'inventory.Server')
+
+        self.log_info.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
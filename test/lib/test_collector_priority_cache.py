@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from spaceone.core import config
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib.collector_priority_cache import CollectorPriorityCache
+
+PRIORITIES = {'collector-1': 1, 'collector-2': 10, 'collector-3': 5}
+
+
+class TestCollectorPriorityCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCollectorPriorityCache, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        config.set_global(COLLECTOR_PRIORITY_CACHE_TTL=300)
+
+    def setUp(self):
+        patcher = patch('spaceone.inventory.lib.collector_priority_cache.time')
+        self.time = patcher.start()
+        self.time.time.return_value = 1000
+        self.addCleanup(patcher.stop)
+
+        self.priority_cache = CollectorPriorityCache()
+        self.loader = MagicMock(side_effect=lambda collector_ids: {collector_id: PRIORITIES[collector_id]
+                                                                   for collector_id in collector_ids
+                                                                   if collector_id in PRIORITIES})
+
+    def _get_priorities(self, collector_ids):
+        return self.priority_cache.get_priorities(collector_ids, self.loader)
+
+    def _loaded_ids(self):
+        return [sorted(call[0][0]) for call in self.loader.call_args_list]
+
+    def test_get_priorities(self):
+        self.assertEqual(self._get_priorities(['collector-1', 'collector-2']), {'collector-1': 1, 'collector-2': 10})
+        self.assertEqual(self._get_priorities(['collector-1', 'collector-2']), {'collector-1': 1, 'collector-2': 10})
+
+        # Loader is called once, only with missed collectors
+        self.assertEqual(self._get_priorities(['collector-1', 'collector-3']), {'collector-1': 1, 'collector-3': 5})
+        self.assertEqual(self._loaded_ids(), [['collector-1', 'collector-2'], ['collector-3']])
+        self.assertEqual(self.priority_cache.get_stat(), {'hit_count': 3, 'miss_count': 3, 'size': 3})
+
+    def test_not_existing_collector(self):
+        self.assertEqual(self._get_priorities(['collector-1', 'collector-deleted']), {'collector-1': 1})
+
+        # Not existing collector is also cached
+        self.assertEqual(self._get_priorities(['collector-deleted']), {})
+        self.loader.assert_called_once()
+
+    def test_ttl(self):
+        self._get_priorities(['collector-1'])
+
+        self.time.time.return_value = 1299
+        self._get_priorities(['collector-1'])
+        self.assertEqual(self._loaded_ids(), [['collector-1']])
+
+        self.time.time.return_value = 1300
+        self._get_priorities(['collector-1'])
+        self.assertEqual(self._loaded_ids(), [['collector-1'], ['collector-1']])
+
+    def test_invalidate(self):
+        self._get_priorities(['collector-1', 'collector-2'])
+
+        self.priority_cache.invalidate('collector-1')
+        self._get_priorities(['collector-1', 'collector-2'])
+        self.assertEqual(self._loaded_ids(), [['collector-1', 'collector-2'], ['collector-1']])
+
+        self.priority_cache.invalidate()
+        self.assertEqual(self.priority_cache.get_stat()['size'], 0)
+        self._get_priorities(['collector-1', 'collector-2'])
+        self.assertEqual(self._loaded_ids(), [['collector-1', 'collector-2'], ['collector-1'],
+                                              ['collector-1', 'collector-2']])
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,161 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from spaceone.core import config
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib import job_task_stat_counter
+from spaceone.inventory.lib.job_task_stat_counter import JobTaskStatCounter
+
+STAT_KEY = 'job_task_stat:domain-test:job-test:job-task-test'
+
+
+class FakeCache(object):
+    """ In-memory cache for stat keys, which keeps expire of keys (also used as Redis client) """
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+        self.expires[key] = expire
+
+    def increment(self, key, amount=1):
+        self.data[key] = int(self.data.get(key) or 0) + amount
+        return self.data[key]
+
+    def ttl(self, key):
+        if key not in self.data:
+            return -2
+        return self.expires.get(key) or -1
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline(object):
+    """ Commands of Redis pipeline (MULTI/EXEC), which are executed atomically """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.commands = []
+
+    def incrby(self, key, amount):
+        self.commands.append(lambda: self.cache.increment(key, amount))
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda: self.cache.expires.update({key: seconds}) or key in self.cache.data)
+
+    def execute(self):
+        with self.cache.lock:
+            return [command() for command in self.commands]
+
+
+class TestJobTaskStatCounter(unittest.TestCase):
+
+    def setUp(self):
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        self.cache = FakeCache()
+        for patcher in [patch.object(job_task_stat_counter, 'cache', self.cache),
+                        patch.object(job_task_stat_counter, '_get_redis_connection', return_value=self.cache)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_add_flush_by_size(self):
+        config.set_global(COLLECTOR_STAT_FLUSH_SIZE=10, COLLECTOR_STAT_FLUSH_INTERVAL=3600)
+        counter = JobTaskStatCounter()
+
+        self.assertFalse(counter.add('domain-test', 'job-test', 'job-task-test', created=4, processed=5))
+        self.assertIsNone(self.cache.get(f'{STAT_KEY}:PROCESSED'))
+
+        self.assertTrue(counter.add('domain-test', 'job-test', 'job-task-test', updated=4, failure=1, processed=5))
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:CREATED'), 4)
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:UPDATED'), 4)
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:FAILURE'), 1)
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:PROCESSED'), 10)
+
+    def test_flush_sets_expire_of_keys(self):
+        config.set_global(COLLECTOR_STAT_FLUSH_SIZE=1, COLLECTOR_STAT_FLUSH_INTERVAL=3600)
+        counter = JobTaskStatCounter()
+
+        # PROCESSED is created by producer, CREATED is deleted by finalization of JobTask
+        self.cache.set(f'{STAT_KEY}:PROCESSED', 0, expire=60)
+        with patch.object(self.cache, 'set', wraps=self.cache.set) as cache_set:
+            counter.add('domain-test', 'job-test', 'job-task-test', created=1, processed=1)
+            counter.add('domain-test', 'job-test', 'job-task-test', created=1, processed=1)
+
+        # Values are not rewritten, only expire time is set
+        cache_set.assert_not_called()
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:CREATED'), 2)
+        self.assertEqual(self.cache.ttl(f'{STAT_KEY}:CREATED'), job_task_stat_counter.JOB_TASK_STAT_EXPIRE_TIME)
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:PROCESSED'), 2)
+        self.assertEqual(self.cache.ttl(f'{STAT_KEY}:PROCESSED'), job_task_stat_counter.JOB_TASK_STAT_EXPIRE_TIME)
+
+    def test_flush_with_one_pipeline(self):
+        config.set_global(COLLECTOR_STAT_FLUSH_SIZE=10, COLLECTOR_STAT_FLUSH_INTERVAL=3600)
+        counter = JobTaskStatCounter()
+
+        with patch.object(self.cache, 'pipeline', wraps=self.cache.pipeline) as pipeline:
+            counter.add('domain-test', 'job-test', 'job-task-test', created=4, updated=4, failure=2, processed=10)
+
+        pipeline.assert_called_once()
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:FAILURE'), 2)
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:PROCESSED'), 10)
+
+    def test_flush_error(self):
+        config.set_global(COLLECTOR_STAT_FLUSH_SIZE=1, COLLECTOR_STAT_FLUSH_INTERVAL=3600)
+        counter = JobTaskStatCounter()
+
+        with patch.object(self.cache, 'pipeline', side_effect=Exception('cache error')):
+            self.assertEqual(counter.flush(), [])
+            counter.add('domain-test', 'job-test', 'job-task-test', created=1, processed=1)
+
+        # Counts are restored, then flushed next time
+        self.assertEqual(counter.flush(), [('domain-test', 'job-test', 'job-task-test')])
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:CREATED'), 1)
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:PROCESSED'), 1)
+
+    def test_concurrent_flush(self):
+        config.set_global(COLLECTOR_STAT_FLUSH_SIZE=1, COLLECTOR_STAT_FLUSH_INTERVAL=3600)
+
+        # Two workers flush stat of same JobTask at the same time
+        def _flush(counter):
+            for _ in range(500):
+                counter.add('domain-test', 'job-test', 'job-task-test', created=1, processed=1)
+
+        threads = [threading.Thread(target=_flush, args=(JobTaskStatCounter(),)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:CREATED'), 1000)
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:PROCESSED'), 1000)
+        self.assertEqual(self.cache.ttl(f'{STAT_KEY}:PROCESSED'), job_task_stat_counter.JOB_TASK_STAT_EXPIRE_TIME)
+
+    def test_flush_listener(self):
+        config.set_global(COLLECTOR_STAT_FLUSH_SIZE=1000, COLLECTOR_STAT_FLUSH_INTERVAL=1)
+        counter = JobTaskStatCounter()
+        flushed = []
+        counter.add_flush_listener(lambda *key: flushed.append((key, self.cache.get(f'{STAT_KEY}:PROCESSED'))))
+
+        self.assertFalse(counter.add('domain-test', 'job-test', 'job-task-test', created=1, processed=1))
+
+        # Stat is flushed by interval, then listener checks completion of JobTask
+        timeout_at = time.time() + 5
+        while len(flushed) == 0 and time.time() < timeout_at:
+            time.sleep(0.1)
+
+        self.assertEqual(flushed, [(('domain-test', 'job-test', 'job-task-test'), 1)])
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
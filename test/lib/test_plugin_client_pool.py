@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import grpc
+from spaceone.core import config
+from spaceone.core.error import ERROR_GRPC_CONNECTION
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.connector.collector_connector import CollectorPluginConnector
+from spaceone.inventory.error import ERROR_AUTHENTICATION_FAILURE_PLUGIN
+from spaceone.inventory.lib.plugin_client_pool import PluginClientPool
+
+DOMAIN_ID = 'domain-test'
+ENDPOINT = 'grpc://plugin-test:50051'
+
+
+class Endpoint(object):
+    """ Endpoint message of plugin service """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+
+
+class UnavailableError(grpc.RpcError):
+
+    def code(self):
+        return grpc.StatusCode.UNAVAILABLE
+
+
+class TestPluginClientPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestPluginClientPool, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        config.set_global(PLUGIN_ENDPOINT_CACHE_TTL=300)
+
+    def setUp(self):
+        patcher = patch('spaceone.inventory.lib.plugin_client_pool.time')
+        self.time = patcher.start()
+        self.time.time.return_value = 1000
+        self.addCleanup(patcher.stop)
+
+        self.pool = PluginClientPool()
+        self.loader = MagicMock(return_value=Endpoint(f'"{ENDPOINT}"'))
+
+    def test_endpoint_ttl(self):
+        endpoint = self.pool.get_endpoint('plugin-1', '1.0', DOMAIN_ID, self.loader)
+
+        self.time.time.return_value = 1299
+        self.assertIs(self.pool.get_endpoint('plugin-1', '1.0', DOMAIN_ID, self.loader), endpoint)
+        self.assertEqual(self.loader.call_count, 1)
+
+        # Other version or domain is loaded separately
+        self.pool.get_endpoint('plugin-1', '1.1', DOMAIN_ID, self.loader)
+        self.pool.get_endpoint('plugin-1', '1.0', 'domain-other', self.loader)
+        self.assertEqual(self.loader.call_count, 3)
+
+        self.time.time.return_value = 1300
+        self.pool.get_endpoint('plugin-1', '1.0', DOMAIN_ID, self.loader)
+        self.assertEqual(self.loader.call_count, 4)
+
+    def test_client_reuse(self):
+        factory = MagicMock(side_effect=lambda: object())
+
+        client = self.pool.get_client(ENDPOINT, 'plugin', factory)
+        self.assertIs(self.pool.get_client(ENDPOINT, 'plugin', factory), client)
+        self.assertIsNot(self.pool.get_client('grpc://plugin-other:50051', 'plugin', factory), client)
+        self.assertEqual(factory.call_count, 2)
+
+        # Client which is failed to create, is not pooled
+        self.assertIsNone(self.pool.get_client('grpc://plugin-none:50051', 'plugin', lambda: None))
+        self.assertIsNotNone(self.pool.get_client('grpc://plugin-none:50051', 'plugin', factory))
+
+    def test_invalidate(self):
+        factory = MagicMock(side_effect=lambda: object())
+        self.pool.get_endpoint('plugin-1', '1.0', DOMAIN_ID, self.loader)
+        client = self.pool.get_client(ENDPOINT, 'plugin', factory)
+        other_client = self.pool.get_client('grpc://plugin-other:50051', 'plugin', factory)
+
+        self.pool.invalidate('plugin-1', '1.0', DOMAIN_ID)
+
+        # Both endpoint and its client are removed
+        self.pool.get_endpoint('plugin-1', '1.0', DOMAIN_ID, self.loader)
+        self.assertEqual(self.loader.call_count, 2)
+        self.assertIsNot(self.pool.get_client(ENDPOINT, 'plugin', factory), client)
+        self.assertIs(self.pool.get_client('grpc://plugin-other:50051', 'plugin', factory), other_client)
+
+
+class TestCollectorPluginConnector(unittest.TestCase):
+    """ Pooled client of connector is removed only by transport error """
+
+    def setUp(self):
+        self.pool = PluginClientPool()
+        patcher = patch('spaceone.inventory.connector.collector_connector.plugin_client_pool', self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = MagicMock()
+        self.pool.get_client(ENDPOINT, 'plugin', lambda: self.client)
+        self.connector = CollectorPluginConnector.__new__(CollectorPluginConnector)
+        self.connector.client = self.client
+        self.connector.endpoint = ENDPOINT
+
+    def _is_pooled(self):
+        return self.pool.get_client(ENDPOINT, 'plugin', MagicMock()) is self.client
+
+    def test_verify_authentication_failure(self):
+        self.client.Collector.verify.side_effect = Exception('invalid secret')
+
+        with self.assertRaises(ERROR_AUTHENTICATION_FAILURE_PLUGIN):
+            self.connector.verify({}, {})
+        self.assertTrue(self._is_pooled())
+
+    def test_verify_unavailable(self):
+        self.client.Collector.verify.side_effect = ERROR_GRPC_CONNECTION(channel=ENDPOINT, message='unavailable')
+
+        with self.assertRaises(ERROR_AUTHENTICATION_FAILURE_PLUGIN):
+            self.connector.verify({}, {})
+        self.assertFalse(self._is_pooled())
+
+    def test_collect_unavailable(self):
+        self.client.Collector.collect.side_effect = UnavailableError()
+
+        with self.assertRaises(UnavailableError):
+            self.connector.collect({}, {}, {})
+        self.assertFalse(self._is_pooled())
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
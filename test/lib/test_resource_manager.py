@@ -0,0 +1,80 @@
+import unittest
+
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib.resource_manager import ResourceManager, make_partial_update
+
+
+class TestMakePartialUpdate(unittest.TestCase):
+
+    def test_unchanged(self):
+        data = {'_id': 1, 'name': 'server', 'data': {'compute': {'instance_state': 'RUNNING'}}, 'tags': []}
+        self.assertEqual(make_partial_update(data, dict(data)), {})
+
+    def test_nested_dict(self):
+        old_data = {'_id': 1, 'data': {'compute': {'instance_state': 'RUNNING', 'instance_type': 't3.medium'}}}
+        new_data = {'_id': 1, 'data': {'compute': {'instance_state': 'STOPPED', 'instance_type': 't3.medium'}}}
+
+        self.assertEqual(make_partial_update(old_data, new_data),
+                         {'$set': {'data.compute.instance_state': 'STOPPED'}})
+
+    def test_removed_keys(self):
+        old_data = {'_id': 1, 'name': 'server', 'project_id': 'project-1', 'data': {'os': {'os_arch': 'x86_64'}}}
+        new_data = {'_id': 1, 'name': 'server', 'data': {'os': {}}}
+
+        self.assertEqual(make_partial_update(old_data, new_data), {
+            '$set': {'data.os': {}},
+            '$unset': {'project_id': ''}
+        })
+
+        new_data = {'_id': 1, 'name': 'server', 'project_id': 'project-1', 'data': {'os': {'os_type': 'LINUX'}}}
+        self.assertEqual(make_partial_update(old_data, new_data), {
+            '$set': {'data.os.os_type': 'LINUX'},
+            '$unset': {'data.os.os_arch': ''}
+        })
+
+    def test_empty_dict(self):
+        old_data = {'_id': 1, 'data': {}, 'tags': {}}
+        new_data = {'_id': 1, 'data': {'compute': {'instance_id': 'i-1'}}, 'tags': {}}
+
+        self.assertEqual(make_partial_update(old_data, new_data), {'$set': {'data.compute': {'instance_id': 'i-1'}}})
+
+    def test_new_field(self):
+        self.assertEqual(make_partial_update({'_id': 1}, {'_id': 1, 'data': {'vm': {'vm_id': 'vm-1'}}}),
+                         {'$set': {'data': {'vm': {'vm_id': 'vm-1'}}}})
+
+    def test_list_replacement(self):
+        old_data = {'_id': 1, 'nics': [{'ip_addresses': ['10.0.0.1']}], 'data': {'security_group': [1, 2]}}
+        new_data = {'_id': 1, 'nics': [{'ip_addresses': ['10.0.0.2']}], 'data': {'security_group': [2, 1]}}
+
+        self.assertEqual(make_partial_update(old_data, new_data), {'$set': {
+            'nics': [{'ip_addresses': ['10.0.0.2']}],
+            'data.security_group': [2, 1]
+        }})
+
+    def test_keys_which_are_not_path(self):
+        # Keys with dot or $ can not be used in path, so whole dict is replaced
+        old_data = {'_id': 1, 'tags': {'aws.name': 'old'}}
+        new_data = {'_id': 1, 'tags': {'aws.name': 'new'}}
+
+        self.assertEqual(make_partial_update(old_data, new_data), {'$set': {'tags': {'aws.name': 'new'}}})
+
+
+class TestPartialUpdateMode(unittest.TestCase):
+
+    def test_is_partial_update_mode(self):
+        resource_mgr = ResourceManager()
+
+        resource_mgr.transaction = Transaction({'service': 'inventory'})
+        self.assertFalse(resource_mgr.is_partial_update_mode())
+
+        resource_mgr.transaction = Transaction({'service': 'inventory', 'collector.partial_update': True})
+        self.assertTrue(resource_mgr.is_partial_update_mode())
+
+        resource_mgr.transaction = Transaction({'service': 'inventory', 'collector.partial_update': False})
+        self.assertFalse(resource_mgr.is_partial_update_mode())
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
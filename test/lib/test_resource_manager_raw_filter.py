@@ -0,0 +1,153 @@
+import unittest
+from unittest.mock import patch
+
+import mongomock
+from mongoengine import connect, disconnect
+from spaceone.core import config
+from spaceone.core.manager import BaseManager
+from spaceone.core.model.mongo_model import MongoModel
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib.resource_manager import ResourceManager
+from spaceone.inventory.manager.server_manager import ServerManager
+from spaceone.inventory.model.server_model import Server
+
+DOMAIN_ID = 'domain-test'
+
+
+class DeviceFinder(BaseManager, ResourceManager):
+    """ Device has reference field (device_type) and change_query_keys (device_type_id) """
+    resource_keys = ['device_id']
+    query_method = 'list_devices'
+    model_name = 'Device'
+
+
+class TestMakeRawFilter(unittest.TestCase):
+    """ Raw (PyMongo) filter of ResourceManager is same as query_method, with in-process MongoDB (mongomock) """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestMakeRawFilter, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        disconnect()
+        connect('inventory-test', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+        with patch.object(MongoModel, 'connect', return_value=None):
+            Server.objects(domain_id=DOMAIN_ID).delete()
+            for idx, state in enumerate(['INSERVICE', 'INSERVICE', 'CLOSED', 'DELETED']):
+                Server.create({
+                    'name': f'server-{idx}',
+                    'state': state,
+                    'provider': 'aws' if idx % 2 == 0 else 'google_cloud',
+                    'ip_addresses': [f'10.0.0.{idx}', '10.0.1.1'],
+                    'data': {'compute': {'instance_id': f'i-{idx}'}},
+                    'reference': {'resource_id': f'arn:{idx}'},
+                    'domain_id': DOMAIN_ID
+                })
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestMakeRawFilter, cls).tearDownClass()
+        disconnect()
+
+    def setUp(self):
+        patcher = patch.object(MongoModel, 'connect', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.server_mgr = ServerManager(transaction=Transaction({'service': 'inventory', 'domain_id': DOMAIN_ID}))
+
+    def _find_by_query_method(self, query):
+        server_vos, total_count = self.server_mgr.list_servers({'filter': list(query['filter']),
+                                                                'filter_or': list(query.get('filter_or', []))})
+        return sorted(server_vo.name for server_vo in server_vos)
+
+    def _find_by_raw_filter(self, query):
+        raw_filter = self.server_mgr._make_raw_filter(query)
+        self.assertIsNotNone(raw_filter, query)
+        return sorted(doc['name'] for doc in Server._get_collection().find(raw_filter))
+
+    def _assert_same_result(self, query_filter, expected, query_filter_or=None):
+        query = {'filter': [{'k': 'domain_id', 'v': DOMAIN_ID, 'o': 'eq'}] + query_filter}
+        if query_filter_or is not None:
+            query['filter_or'] = query_filter_or
+
+        self.assertEqual(self._find_by_raw_filter(query), expected)
+        self.assertEqual(self._find_by_query_method(query), expected)
+
+    def test_eq(self):
+        self._assert_same_result([{'k': 'name', 'v': 'server-1', 'o': 'eq'}], ['server-1'])
+        self._assert_same_result([{'key': 'provider', 'value': 'aws', 'operator': 'eq'}], ['server-0', 'server-2'])
+
+    def test_eq_list_field(self):
+        self._assert_same_result([{'k': 'ip_addresses', 'v': '10.0.0.1', 'o': 'eq'}], ['server-1'])
+        self._assert_same_result([{'k': 'ip_addresses', 'v': '10.0.1.1', 'o': 'eq'}],
+                                 ['server-0', 'server-1', 'server-2'])
+
+    def test_in(self):
+        self._assert_same_result([{'k': 'reference.resource_id', 'v': ['arn:0', 'arn:2', 'arn:3'], 'o': 'in'}],
+                                 ['server-0', 'server-2'])
+
+    def test_not(self):
+        self._assert_same_result([{'k': 'state', 'v': 'CLOSED', 'o': 'not'}], ['server-0', 'server-1'])
+
+    def test_dotted_data_key(self):
+        self._assert_same_result([{'k': 'data.compute.instance_id', 'v': 'i-2', 'o': 'eq'}], ['server-2'])
+        self._assert_same_result([{'k': 'data.compute.instance_id', 'v': 'i-3', 'o': 'eq'}], [])
+
+    def test_deleted_state(self):
+        # DELETED resources are excluded by default, unless DELETED state is queried
+        self._assert_same_result([], ['server-0', 'server-1', 'server-2'])
+        self._assert_same_result([{'k': 'state', 'v': 'DELETED', 'o': 'eq'}], ['server-3'])
+        self._assert_same_result([{'k': 'state', 'v': ['CLOSED', 'DELETED'], 'o': 'in'}], ['server-2', 'server-3'])
+
+    def test_filter_or(self):
+        self._assert_same_result([], ['server-0', 'server-1', 'server-2'], query_filter_or=[])
+        self._assert_same_result([{'k': 'provider', 'v': 'aws', 'o': 'eq'}], ['server-0', 'server-2'],
+                                 query_filter_or=[])
+        self._assert_same_result([{'k': 'provider', 'v': 'aws', 'o': 'eq'}], ['server-0'], query_filter_or=[
+            {'k': 'name', 'v': 'server-0', 'o': 'eq'},
+            {'k': 'name', 'v': 'server-1', 'o': 'eq'}
+        ])
+
+    def test_query_resources_of_filter_manager(self):
+        # Query of FilterManager._make_query_per_resources
+        query = {
+            'filter': [{'k': 'domain_id', 'v': DOMAIN_ID, 'o': 'eq'}, {'k': 'provider', 'v': 'aws', 'o': 'eq'}],
+            'filter_or': []
+        }
+        change_rules = [{'resource_key': 'data.compute.instance_id', 'change_key': 'instance_id'}]
+
+        with patch.object(ServerManager, 'list_servers', side_effect=ServerManager.list_servers,
+                          autospec=True) as list_servers:
+            change_values, secrets = self.server_mgr.query_resources(query, change_rules)
+
+        list_servers.assert_not_called()
+        self.assertEqual(sorted(change_values['instance_id']), ['i-0', 'i-2'])
+
+    def test_fallback(self):
+        query_filter = [{'k': 'domain_id', 'v': DOMAIN_ID, 'o': 'eq'}]
+
+        self.assertIsNone(self.server_mgr._make_raw_filter({'filter': query_filter + [
+            {'k': 'name', 'v': 'server', 'o': 'contain'}]}))
+        self.assertIsNone(self.server_mgr._make_raw_filter({'filter': query_filter + [
+            {'k': 'unknown_field', 'v': 'server', 'o': 'eq'}]}))
+        self.assertIsNone(self.server_mgr._make_raw_filter({'filter': query_filter, 'sort': {'key': 'name'}}))
+        self.assertIsNone(self.server_mgr._make_raw_filter({'filter': query_filter, 'filter_or': [
+            {'k': 'name', 'v': 'server', 'o': 'contain'}]}))
+
+        device_finder = DeviceFinder(transaction=Transaction({'service': 'inventory', 'domain_id': DOMAIN_ID}))
+        self.assertIsNotNone(device_finder._make_raw_filter({'filter': query_filter + [
+            {'k': 'name', 'v': 'device-1', 'o': 'eq'}]}))
+        # change_query_keys
+        self.assertIsNone(device_finder._make_raw_filter({'filter': query_filter + [
+            {'k': 'device_type_id', 'v': 'device_type-1', 'o': 'eq'}]}))
+        # reference field
+        self.assertIsNone(device_finder._make_raw_filter({'filter': query_filter + [
+            {'k': 'device_type', 'v': 'device_type-1', 'o': 'eq'}]}))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
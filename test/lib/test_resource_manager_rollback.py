@@ -0,0 +1,88 @@
+import unittest
+from unittest.mock import patch
+
+import mongomock
+from mongoengine import connect, disconnect
+from spaceone.core import config
+from spaceone.core.model.mongo_model import MongoModel
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.manager.server_manager import ServerManager
+from spaceone.inventory.model.server_model import Server
+
+DOMAIN_ID = 'domain-test'
+
+
+class TestUpdateRollback(unittest.TestCase):
+    """ Rollback policy of ResourceManager.add_update_rollback, with in-process MongoDB (mongomock) """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestUpdateRollback, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        disconnect()
+        connect('inventory-test', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestUpdateRollback, cls).tearDownClass()
+        disconnect()
+
+    def setUp(self):
+        patcher = patch.object(MongoModel, 'connect', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.server_vo = Server.create({
+            'name': 'server-old',
+            'primary_ip_address': '10.0.0.1',
+            'data': {'compute': {'instance_state': 'RUNNING'}},
+            'collection_info': {'state': 'ACTIVE', 'collectors': ['collector-old']},
+            'domain_id': DOMAIN_ID
+        })
+
+    def _update_and_rollback(self, rollback_policy):
+        transaction = Transaction({'service': 'inventory', 'domain_id': DOMAIN_ID,
+                                   'collector.rollback_policy': rollback_policy})
+        server_mgr = ServerManager(transaction=transaction)
+        params = {
+            'name': 'server-new',
+            'data': {'compute': {'instance_state': 'STOPPED'}},
+            'collection_info': {'state': 'ACTIVE', 'collectors': ['collector-new']}
+        }
+
+        server_mgr.add_update_rollback(self.server_vo, params)
+        self.server_vo.update(params)
+        # Field which is not in params is changed by other update
+        self.server_vo.update({'primary_ip_address': '10.0.0.2'})
+
+        transaction.execute_rollback()
+        self.server_vo.reload()
+
+    def test_rollback_full(self):
+        self._update_and_rollback('FULL')
+
+        self.assertEqual(self.server_vo.name, 'server-old')
+        self.assertEqual(self.server_vo.primary_ip_address, '10.0.0.1')
+
+    def test_rollback_changed(self):
+        self._update_and_rollback('CHANGED')
+
+        # Only fields in params are restored
+        self.assertEqual(self.server_vo.name, 'server-old')
+        self.assertEqual(self.server_vo.data, {'compute': {'instance_state': 'RUNNING'}})
+        self.assertEqual(self.server_vo.collection_info.collectors, ['collector-old'])
+        self.assertEqual(self.server_vo.primary_ip_address, '10.0.0.2')
+
+    def test_rollback_none(self):
+        self._update_and_rollback('NONE')
+
+        self.assertEqual(self.server_vo.name, 'server-new')
+        self.assertEqual(self.server_vo.data, {'compute': {'instance_state': 'STOPPED'}})
+        self.assertEqual(self.server_vo.collection_info.collectors, ['collector-new'])
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
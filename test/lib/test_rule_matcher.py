@@ -0,0 +1,152 @@
+import unittest
+
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib import rule_matcher
+
+DOMAIN_ID = 'domain-test'
+
+# Stored resources (data.ip_addresses is list-valued in DB)
+SERVERS = [
+    {'server_id': 'server-1', 'domain_id': DOMAIN_ID, 'zone_id': 'zone-1',
+     'data': {'vm': {'vm_id': 'i-1'}, 'ip_addresses': ['10.0.0.1', '10.0.0.2']}},
+    {'server_id': 'server-2', 'domain_id': DOMAIN_ID, 'zone_id': 'zone-1',
+     'data': {'vm': {'vm_id': 'i-2'}, 'ip_addresses': ['10.0.0.3']}},
+    {'server_id': 'server-3', 'domain_id': DOMAIN_ID, 'zone_id': 'zone-1',
+     'data': {'vm': {'vm_id': 'i-3'}, 'ip_addresses': ['10.0.0.3']}},
+    {'server_id': 'server-4', 'domain_id': DOMAIN_ID, 'zone_id': 'zone-2',
+     'data': {'vm': {'vm_id': 'i-4'}, 'ip_addresses': ['10.0.0.1']}},
+    {'server_id': 'server-5', 'domain_id': 'domain-other', 'zone_id': 'zone-1',
+     'data': {'vm': {'vm_id': 'i-1'}, 'ip_addresses': ['10.0.0.1']}},
+]
+
+RULES = {1: ['data.vm.vm_id'], 2: ['zone_id', 'data.ip_addresses']}
+
+
+def _match_condition(doc, condition):
+    """ eq / in of MongoDB: list-valued field matches, if any element matches """
+    value = rule_matcher.find_data(doc, condition['k'])
+    values = value if isinstance(value, list) else [value]
+    if condition['o'] == 'eq':
+        return condition['v'] in values
+    elif condition['o'] == 'in':
+        return any(v in condition['v'] for v in values)
+
+    raise ValueError(f'unsupported operator: {condition["o"]}')
+
+
+def _search(query):
+    return [doc for doc in SERVERS if all(_match_condition(doc, c) for c in query['filter'])]
+
+
+def find_resources(query):
+    """ Same as ResourceManager.find_resources """
+    docs = _search(query)
+    return [{'server_id': doc['server_id']} for doc in docs], len(docs)
+
+
+def find_resources_with_values(query, keys):
+    """ Same as ResourceManager.find_resources_with_values """
+    return [({'server_id': doc['server_id']}, {key: rule_matcher.find_data(doc, key) for key in keys})
+            for doc in _search(query)]
+
+
+def query_with_match_rules(resource, rules):
+    """ Same as CollectingManager._query_with_match_rules (one query per resource and order) """
+    found_resource, total_count = None, 0
+    for order in sorted(rules.keys()):
+        query = rule_matcher.make_query(order, rules, resource, DOMAIN_ID)
+        found_resource, total_count = find_resources(query)
+        if found_resource and total_count == 1:
+            return found_resource, total_count
+
+    return found_resource, total_count
+
+
+class TestRuleMatcher(unittest.TestCase):
+
+    def test_make_batch_query(self):
+        query = rule_matcher.make_batch_query(('zone_id', 'data.ip_addresses'),
+                                              [('zone-1', '10.0.0.1'), ('zone-1', '10.0.0.3')], DOMAIN_ID)
+        self.assertEqual(query['filter'][0], {'k': 'domain_id', 'v': DOMAIN_ID, 'o': 'eq'})
+        self.assertEqual(query['filter'][1], {'k': 'zone_id', 'v': ['zone-1'], 'o': 'in'})
+        self.assertEqual(query['filter'][2]['o'], 'in')
+        self.assertEqual(sorted(query['filter'][2]['v']), ['10.0.0.1', '10.0.0.3'])
+
+    def test_match_resources_same_as_make_query(self):
+        # (resource, expected server_ids)
+        cases = [
+            ({'data': {'vm': {'vm_id': 'i-1'}}}, ['server-1']),                     # 1st order
+            ({'data': {'vm': {'vm_id': 'i-9'}}, 'zone_id': 'zone-1'},
+             ['server-1', 'server-2', 'server-3']),                                 # missing value is not used
+            ({'data': {'vm': {'vm_id': 'i-9'}, 'ip_addresses': '10.0.0.9'}, 'zone_id': 'zone-1'}, []),  # new
+            ({'data': {'vm': {'vm_id': 'i-9'}, 'ip_addresses': '10.0.0.2'},
+              'zone_id': 'zone-1'}, ['server-1']),                                  # 2nd order, list-valued in DB
+            ({'data': {'vm': {'vm_id': 'i-9'}, 'ip_addresses': '10.0.0.3'},
+              'zone_id': 'zone-1'}, ['server-2', 'server-3']),                      # ambiguous
+            ({'data': {'vm': {'vm_id': 'i-9'}, 'ip_addresses': '10.0.0.1'}}, ['server-1', 'server-4']),
+            ({'data': {'vm': {'vm_id': 'i-4'}, 'ip_addresses': '10.0.0.3'}, 'zone_id': 'zone-1'}, ['server-4']),
+        ]
+        resources = [resource for resource, expected in cases]
+        matched, duplicated, fallback = rule_matcher.match_resources(resources, RULES, DOMAIN_ID,
+                                                                     find_resources_with_values)
+
+        self.assertEqual(fallback, [])
+        for idx, (resource, expected) in enumerate(cases):
+            batch_ids = sorted(res['server_id'] for res in matched.get(idx, []))
+            self.assertEqual(batch_ids, expected, f'case {idx}: {resource}')
+
+            # Decision (create / update / ambiguous) is same as make_query
+            found_resource, total_count = query_with_match_rules(resource, RULES)
+            self.assertEqual(min(len(batch_ids), 2), min(total_count, 2), f'case {idx}: {resource}')
+            if total_count == 1:
+                self.assertEqual(batch_ids, [found_resource[0]['server_id']])
+
+    def test_match_resources_fallback(self):
+        resources = [
+            {'zone_id': 'zone-1'},                                                  # no value of 1st order
+            {'data': {'vm': {'vm_id': ['i-1', 'i-2']}}},                            # list value in resource
+            {'data': {'vm': {'vm_id': 'i-2'}}},
+        ]
+        matched, duplicated, fallback = rule_matcher.match_resources(resources, RULES, DOMAIN_ID,
+                                                                     find_resources_with_values)
+        self.assertEqual(sorted(fallback), [0, 1])
+        self.assertNotIn(0, matched)
+        self.assertNotIn(1, matched)
+        self.assertEqual(matched[2], [{'server_id': 'server-2'}])
+
+    def test_match_resources_without_rules(self):
+        matched, duplicated, fallback = rule_matcher.match_resources([{}, {}], {}, DOMAIN_ID,
+                                                                     find_resources_with_values)
+        self.assertEqual((matched, duplicated, fallback), ({}, {}, [0, 1]))
+
+    def test_match_resources_duplicated(self):
+        new_resource = {'data': {'vm': {'vm_id': 'i-new'}, 'ip_addresses': '10.0.0.9'}, 'zone_id': 'zone-9'}
+        resources = [
+            new_resource,
+            {'data': {'vm': {'vm_id': 'i-1'}}},
+            new_resource,
+            new_resource,
+            {'data': {'vm': {'vm_id': 'i-1'}}},
+        ]
+        matched, duplicated, fallback = rule_matcher.match_resources(resources, RULES, DOMAIN_ID,
+                                                                     find_resources_with_values)
+        # New resource is created by the first one, others are updated after it
+        self.assertEqual(duplicated, {2: 0, 3: 0})
+        self.assertEqual(matched[1], [{'server_id': 'server-1'}])
+        self.assertEqual(matched[4], [{'server_id': 'server-1'}])
+
+    def test_make_match_index(self):
+        found_resources = [
+            ({'server_id': 'server-1'}, {'zone_id': 'zone-1', 'data.ip_addresses': ['10.0.0.1', '10.0.0.2']}),
+            ({'server_id': 'server-2'}, {'zone_id': 'zone-1', 'data.ip_addresses': ['10.0.0.2']}),
+        ]
+        match_index = rule_matcher._make_match_index(found_resources, ('zone_id', 'data.ip_addresses'))
+        self.assertEqual(match_index, {
+            ('zone-1', '10.0.0.1'): [{'server_id': 'server-1'}],
+            ('zone-1', '10.0.0.2'): [{'server_id': 'server-1'}, {'server_id': 'server-2'}],
+        })
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch
+
+from google.protobuf.struct_pb2 import Struct
+from spaceone.core import config
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib.secret_cache import SecretCache
+
+DOMAIN_ID = 'domain-test'
+
+
+def make_secret_data(access_key):
+    secret_data = Struct()
+    secret_data.update({'aws_access_key_id': access_key, 'aws_secret_access_key': 'secret-key'})
+    return secret_data
+
+
+class TestSecretCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestSecretCache, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        config.set_global(SECRET_CACHE_TTL=300, SECRET_DATA_CACHE_TTL=60)
+
+    def setUp(self):
+        patcher = patch('spaceone.inventory.lib.secret_cache.time')
+        self.time = patcher.start()
+        self.time.time.return_value = 1000
+        self.addCleanup(patcher.stop)
+
+        self.secret_cache = SecretCache()
+
+    def test_secret_ttl(self):
+        secret = {'secret_id': 'secret-1', 'provider': 'aws'}
+        self.secret_cache.set_secret('secret-1', DOMAIN_ID, secret)
+
+        self.time.time.return_value = 1299
+        self.assertEqual(self.secret_cache.get_secret('secret-1', DOMAIN_ID), secret)
+        self.assertIsNone(self.secret_cache.get_secret('secret-1', 'domain-other'))
+
+        self.time.time.return_value = 1300
+        self.assertIsNone(self.secret_cache.get_secret('secret-1', DOMAIN_ID))
+
+    def test_secret_data_ttl(self):
+        self.secret_cache.set_secret_data('secret-1', DOMAIN_ID, make_secret_data('key-1'))
+
+        self.time.time.return_value = 1059
+        self.assertIsNotNone(self.secret_cache.get_secret_data('secret-1', DOMAIN_ID))
+
+        self.time.time.return_value = 1060
+        self.assertIsNone(self.secret_cache.get_secret_data('secret-1', DOMAIN_ID))
+
+    def test_secret_data_encryption(self):
+        secret_data = make_secret_data('key-1')
+        self.secret_cache.set_secret_data('secret-1', DOMAIN_ID, secret_data)
+
+        message_class, encrypted, expire_time = self.secret_cache._secret_data[DOMAIN_ID]['secret-1']
+        self.assertIs(message_class, Struct)
+        self.assertNotIn(b'secret-key', encrypted)
+
+        cached = self.secret_cache.get_secret_data('secret-1', DOMAIN_ID)
+        self.assertEqual(cached, secret_data)
+        self.assertIsNot(cached, secret_data)
+
+        # Each process has its own key
+        self.assertIsNone(SecretCache().get_secret_data('secret-1', DOMAIN_ID))
+
+    def test_invalidate(self):
+        for secret_id in ['secret-1', 'secret-2']:
+            self.secret_cache.set_secret(secret_id, DOMAIN_ID, {'secret_id': secret_id})
+            self.secret_cache.set_secret_data(secret_id, DOMAIN_ID, make_secret_data(secret_id))
+        self.secret_cache.set_secret('secret-3', 'domain-other', {'secret_id': 'secret-3'})
+
+        self.secret_cache.invalidate(DOMAIN_ID, 'secret-1')
+        self.assertIsNone(self.secret_cache.get_secret('secret-1', DOMAIN_ID))
+        self.assertIsNone(self.secret_cache.get_secret_data('secret-1', DOMAIN_ID))
+        self.assertIsNotNone(self.secret_cache.get_secret('secret-2', DOMAIN_ID))
+        self.assertIsNotNone(self.secret_cache.get_secret_data('secret-2', DOMAIN_ID))
+
+        self.secret_cache.invalidate(DOMAIN_ID)
+        self.assertIsNone(self.secret_cache.get_secret('secret-2', DOMAIN_ID))
+        self.assertIsNone(self.secret_cache.get_secret_data('secret-2', DOMAIN_ID))
+        self.assertIsNotNone(self.secret_cache.get_secret('secret-3', 'domain-other'))
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
@@ -0,0 +1,257 @@
+import fnmatch
+import json
+import unittest
+from unittest.mock import call, patch
+
+from spaceone.api.inventory.plugin import collector_pb2
+
+from spaceone.core import config
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib import job_task_stat_counter
+from spaceone.inventory.manager.collector_manager import collecting_manager
+from spaceone.inventory.manager.collector_manager.collecting_manager import CollectingManager
+from spaceone.inventory.manager.collector_manager.job_manager import JobManager
+from spaceone.inventory.manager.collector_manager.job_task_manager import JobTaskManager
+
+DOMAIN_ID = 'domain-test'
+JOB_ID = 'job-test'
+JOB_TASK_ID = 'job-task-test'
+STAT_KEY = f'job_task_stat:{DOMAIN_ID}:{JOB_ID}:{JOB_TASK_ID}'
+
+
+class FakeCache(object):
+    """ In-memory cache which keeps expire of keys """
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, expire=None):
+        self.data[key] = value
+        self.expires[key] = expire
+
+    def increment(self, key, amount=1):
+        self.data[key] = int(self.data.get(key) or 0) + amount
+        return self.data[key]
+
+    def decrement(self, key, amount=1):
+        return self.increment(key, -amount)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+        self.expires.pop(key, None)
+
+    def ttl(self, key):
+        if key not in self.data:
+            return -2
+        return self.expires.get(key) or -1
+
+    def keys(self, pattern):
+        return [key for key in self.data if fnmatch.fnmatch(key, pattern)]
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline(object):
+    """ Commands of Redis pipeline, which are executed in order """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.commands = []
+
+    def incrby(self, key, amount):
+        self.commands.append(lambda: self.cache.increment(key, amount))
+
+    def expire(self, key, seconds):
+        self.commands.append(lambda: self.cache.expires.update({key: seconds}) or key in self.cache.data)
+
+    def execute(self):
+        return [command() for command in self.commands]
+
+
+class TestCollectingManager(unittest.TestCase):
+    """ Completion of db_q JobTask """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCollectingManager, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        config.set_global(COLLECTOR_STAT_FLUSH_SIZE=2, COLLECTOR_STAT_FLUSH_INTERVAL=3600)
+
+    def setUp(self):
+        self.cache = FakeCache()
+        for patcher in [patch.object(collecting_manager, 'cache', self.cache),
+                        patch.object(job_task_stat_counter, 'cache', self.cache),
+                        patch.object(job_task_stat_counter, '_get_redis_connection', return_value=self.cache),
+                        patch.object(CollectingManager, '_update_job_task'),
+                        patch.object(JobManager, 'decrease_remained_tasks')]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # Pending stat of process level counter is flushed to fake cache of this test
+        self.addCleanup(job_task_stat_counter.job_task_stat_counter.flush)
+        self.collecting_mgr = CollectingManager(transaction=Transaction({'domain_id': DOMAIN_ID}))
+        self.collecting_mgr._create_job_task_stat_cache(JOB_ID, JOB_TASK_ID, DOMAIN_ID)
+        self.cache.set(f'{STAT_KEY}:TOTAL', 2)
+
+    def _add_stat(self, **stat):
+        job_task_stat_counter.job_task_stat_counter.add(DOMAIN_ID, JOB_ID, JOB_TASK_ID, **stat)
+        self.collecting_mgr._check_job_task_completion(JOB_ID, JOB_TASK_ID, DOMAIN_ID)
+
+    def test_finalize_job_task(self):
+        self._add_stat(created=1, processed=1)
+        self.collecting_mgr._update_job_task.assert_not_called()
+
+        self._add_stat(updated=1, processed=1)
+        self.collecting_mgr._update_job_task.assert_called_once_with(
+            JOB_TASK_ID, 'SUCCESS', DOMAIN_ID,
+            stat={'total_count': 2, 'created_count': 1, 'updated_count': 1, 'failure_count': 0})
+        self.collecting_mgr.job_mgr.decrease_remained_tasks.assert_called_once_with(JOB_ID, DOMAIN_ID)
+
+        # Only lock of JobTask is remained for a short time
+        self.assertEqual(self.cache.get(f'{STAT_KEY}:FINALIZED'), 1)
+        self.assertEqual(self.cache.expires[f'{STAT_KEY}:FINALIZED'], collecting_manager.JOB_TASK_FINALIZED_EXPIRE_TIME)
+        for kind in ['CREATED', 'UPDATED', 'FAILURE', 'PROCESSED', 'TOTAL']:
+            self.assertNotIn(f'{STAT_KEY}:{kind}', self.cache.data)
+        self.assertEqual(self.cache.keys('job_task_deadline:*'), [])
+
+    def test_finalize_job_task_once(self):
+        self._add_stat(created=2, processed=2)
+        self.collecting_mgr._finalize_job_task(JOB_ID, JOB_TASK_ID, DOMAIN_ID, 2)
+        self._add_stat(created=2, processed=2)
+
+        self.collecting_mgr._update_job_task.assert_called_once()
+        self.collecting_mgr.job_mgr.decrease_remained_tasks.assert_called_once()
+
+    def test_late_stat_expires(self):
+        self._add_stat(created=2, processed=2)
+        self.collecting_mgr._add_db_update_task_failure(1, {'job_id': JOB_ID, 'job_task_id': JOB_TASK_ID,
+                                                            'domain_id': DOMAIN_ID})
+
+        # Keys of finalized JobTask are created again, they are deleted by expire time
+        for kind in ['FAILURE', 'PROCESSED']:
+            self.assertEqual(self.cache.get(f'{STAT_KEY}:{kind}'), 1)
+            self.assertEqual(self.cache.ttl(f'{STAT_KEY}:{kind}'), collecting_manager.JOB_TASK_STAT_EXPIRE_TIME)
+
+    def test_process_db_update_task_stat_error(self):
+        params = {'job_id': JOB_ID, 'job_task_id': JOB_TASK_ID, 'domain_id': DOMAIN_ID}
+        self.cache.set(f'job_task_inflight:{DOMAIN_ID}:{JOB_ID}:{JOB_TASK_ID}', 1)
+
+        with patch.object(job_task_stat_counter.job_task_stat_counter, 'add', side_effect=Exception('cache error')), \
+                patch.object(CollectingManager, '_process_bulk_results',
+                             return_value={'created_count': 1, 'updated_count': 0, 'failure_count': 0}), \
+                patch.object(CollectingManager, '_check_job_task_completion') as check_job_task_completion:
+            self.collecting_mgr._process_db_update_task([{}], params)
+
+        self.assertEqual(self.cache.get(f'job_task_inflight:{DOMAIN_ID}:{JOB_ID}:{JOB_TASK_ID}'), 0)
+        check_job_task_completion.assert_not_called()
+
+    def _push_results(self, job_task_timeout=3600, count=2, max_inflight=0, put=None):
+        """ Run producer of db_q (1 resource per task), returns pushed tasks """
+        self.collecting_mgr.use_db_queue = True
+        self.collecting_mgr.db_queue = 'db_q'
+        self.collecting_mgr.db_queue_batch_size = 1
+        self.collecting_mgr.db_queue_max_inflight = max_inflight
+        self.collecting_mgr.job_task_timeout = job_task_timeout
+        self.collecting_mgr.secret = {}
+
+        results = [collector_pb2.ResourceInfo(state='SUCCESS', resource_type='inventory.Server')
+                   for _ in range(count)]
+        tasks = []
+        with patch.object(collecting_manager.queue, 'put', side_effect=put or (lambda name, task: tasks.append(task))):
+            self.collecting_mgr._process_results(results, JOB_ID, JOB_TASK_ID, 'collector-test', 'secret-test',
+                                                 DOMAIN_ID)
+        return [json.loads(task) for task in tasks]
+
+    def test_timeout_job_task_of_lost_task(self):
+        tasks = self._push_results(job_task_timeout=0)
+        self.assertEqual(len(tasks), 2)
+
+        # Only the first task is consumed, the second one is lost
+        with patch.object(CollectingManager, '_process_single_result', return_value=collecting_manager.CREATED):
+            self.collecting_mgr._process_db_update_task(tasks[0]['res'], tasks[0]['param'])
+        self.collecting_mgr._update_job_task.assert_not_called()
+
+        with patch.object(JobTaskManager, 'add_error') as add_error:
+            self.assertEqual(self.collecting_mgr.timeout_job_tasks(), [JOB_TASK_ID])
+
+        self.collecting_mgr._update_job_task.assert_called_once_with(
+            JOB_TASK_ID, 'FAILURE', DOMAIN_ID,
+            stat={'total_count': 2, 'created_count': 1, 'updated_count': 0, 'failure_count': 1})
+        self.collecting_mgr.job_mgr.decrease_remained_tasks.assert_called_once_with(JOB_ID, DOMAIN_ID)
+        add_error.assert_called_once()
+        self.assertEqual(add_error.call_args[0][2], 'ERROR_JOB_TASK_TIMEOUT')
+
+        # Deadline is removed, JobTask is not finalized again
+        self.assertEqual(self.collecting_mgr.timeout_job_tasks(), [])
+        self.collecting_mgr.job_mgr.decrease_remained_tasks.assert_called_once()
+
+    def test_timeout_job_task_before_deadline(self):
+        self._push_results(job_task_timeout=3600)
+
+        self.assertEqual(self.collecting_mgr.timeout_job_tasks(), [])
+        self.collecting_mgr._update_job_task.assert_not_called()
+        self.collecting_mgr.job_mgr.decrease_remained_tasks.assert_not_called()
+
+    def test_db_queue_backpressure(self):
+        key_inflight = f'job_task_inflight:{DOMAIN_ID}:{JOB_ID}:{JOB_TASK_ID}'
+        tasks = []
+
+        def _put(name, task):
+            # Task is counted as in-flight before push
+            tasks.append((json.loads(task), self.cache.get(key_inflight)))
+
+        def _consume(seconds):
+            # Consumer processes the oldest task, while producer waits
+            consumed = len(tasks) - self.cache.get(key_inflight)
+            task = tasks[consumed][0]
+            with patch.object(CollectingManager, '_process_single_result', return_value=collecting_manager.CREATED):
+                self.collecting_mgr._process_db_update_task(task['res'], task['param'])
+
+        with patch.object(collecting_manager, 'time', wraps=collecting_manager.time) as mock_time:
+            mock_time.sleep.side_effect = _consume
+            self._push_results(count=5, max_inflight=2, put=_put)
+
+        self.assertEqual([inflight for _, inflight in tasks], [1, 2, 2, 2, 2])
+        self.assertEqual(mock_time.sleep.call_count, 3)
+
+    def test_db_queue_wait_timeout(self):
+        key_inflight = f'job_task_inflight:{DOMAIN_ID}:{JOB_ID}:{JOB_TASK_ID}'
+        tasks = []
+
+        # Consumers are not working, producer stops waiting after the first timeout
+        with patch.object(collecting_manager, 'DB_QUEUE_WAIT_TIMEOUT', -1), \
+                patch.object(CollectingManager, '_create_job_task_stat_cache'), \
+                patch.object(self.cache, 'get', wraps=self.cache.get) as cache_get:
+            self.cache.set(key_inflight, 2)
+            self._push_results(count=3, max_inflight=2, put=lambda name, task: tasks.append(task))
+
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(self.cache.get(key_inflight), 5)
+        self.assertEqual([call for call in cache_get.call_args_list if call[0][0] == key_inflight],
+                         [call(key_inflight)])
+
+    def test_db_queue_put_error(self):
+        key_inflight = f'job_task_inflight:{DOMAIN_ID}:{JOB_ID}:{JOB_TASK_ID}'
+
+        def _put(name, task):
+            raise Exception('queue error')
+
+        self._push_results(count=2, max_inflight=2, put=_put)
+
+        # In-flight count is rolled back, and resources are counted as failure only once
+        self.assertEqual(self.cache.get(key_inflight), 0)
+        self.collecting_mgr._update_job_task.assert_called_once_with(
+            JOB_TASK_ID, 'FAILURE', DOMAIN_ID,
+            stat={'total_count': 2, 'created_count': 0, 'updated_count': 0, 'failure_count': 2})
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
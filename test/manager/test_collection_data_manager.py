@@ -0,0 +1,161 @@
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import mongomock
+from mongoengine import connect, disconnect
+from spaceone.core import config
+from spaceone.core.model.mongo_model import MongoModel
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.manager.identity_manager import IdentityManager
+from spaceone.inventory.manager.server_manager import ServerManager
+from spaceone.inventory.model.change_history_model import ResourceChangeHistory
+from spaceone.inventory.service.server_service import ServerService
+
+DOMAIN_ID = 'domain-test'
+COLLECTOR_META = {
+    'service': 'inventory',
+    'resource': 'Server',
+    'domain_id': DOMAIN_ID,
+    'collector_id': 'collector-test',
+    'job_id': 'job-test',
+    'secret.secret_id': 'secret-test',
+    'secret.service_account_id': 'sa-test'
+}
+
+
+class TestCollectionDataManager(unittest.TestCase):
+    """ Fingerprint and change history of collected data (ServerService.update) with in-process MongoDB (mongomock) """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCollectionDataManager, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        disconnect()
+        connect('inventory-test', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestCollectionDataManager, cls).tearDownClass()
+        disconnect()
+
+    def setUp(self):
+        for patcher in [patch.object(MongoModel, 'connect', return_value=None),
+                        patch.object(IdentityManager, '__init__', return_value=None)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.server_svc = ServerService(COLLECTOR_META)
+        server_vo = self.server_svc.create(self._make_server_data(instance_state='RUNNING'))
+        self.server_id = server_vo.server_id
+
+        # First update of collector saves fingerprint
+        self.server_svc.update(self._make_server_data(instance_state='RUNNING', server_id=self.server_id))
+
+    @staticmethod
+    def _make_server_data(instance_state, **kwargs):
+        return dict({
+            'name': 'server-test',
+            'primary_ip_address': '10.0.0.1',
+            'data': {'compute': {'instance_state': instance_state}, 'os': {'os_arch': 'x86_64'}},
+            'domain_id': DOMAIN_ID
+        }, **kwargs)
+
+    def _update(self, instance_state, server_svc=None):
+        server_svc = server_svc or self.server_svc
+        with patch.object(ServerManager, 'touch_resource_vo', autospec=True,
+                          side_effect=ServerManager.touch_resource_vo) as touch, \
+                patch.object(ServerManager, 'update_server_by_vo', autospec=True,
+                             side_effect=ServerManager.update_server_by_vo) as update:
+            server_vo = server_svc.update(self._make_server_data(instance_state, server_id=self.server_id))
+
+        server_vo.reload()
+        return server_vo, touch.call_count, update.call_count
+
+    def test_update_unchanged_data(self):
+        old_server_vo = self.server_svc.get({'server_id': self.server_id, 'domain_id': DOMAIN_ID})
+        self.assertIsNotNone(old_server_vo.collection_info.fingerprint)
+
+        server_vo, touch_count, update_count = self._update('RUNNING')
+
+        self.assertEqual((touch_count, update_count), (1, 0))
+        self.assertGreater(server_vo.updated_at, old_server_vo.updated_at)
+        self.assertEqual(server_vo.collection_info.fingerprint, old_server_vo.collection_info.fingerprint)
+
+    def test_update_changed_data(self):
+        old_server_vo = self.server_svc.get({'server_id': self.server_id, 'domain_id': DOMAIN_ID})
+
+        server_vo, touch_count, update_count = self._update('STOPPED')
+
+        self.assertEqual((touch_count, update_count), (0, 1))
+        self.assertEqual(server_vo.data['compute']['instance_state'], 'STOPPED')
+        self.assertEqual(server_vo.data['os'], {'os_arch': 'x86_64'})
+        self.assertNotEqual(server_vo.collection_info.fingerprint, old_server_vo.collection_info.fingerprint)
+
+    def test_pin_data_resets_fingerprint(self):
+        server_vo = self.server_svc.pin_data({'server_id': self.server_id, 'keys': ['data.compute'],
+                                              'domain_id': DOMAIN_ID})
+        self.assertIsNone(server_vo.collection_info.fingerprint)
+        self.assertEqual(server_vo.collection_info.pinned_keys, ['data.compute'])
+
+        # Same data is merged again, but pinned key is not changed by collector
+        server_vo, touch_count, update_count = self._update('RUNNING')
+        self.assertEqual((touch_count, update_count), (0, 1))
+        self.assertIsNotNone(server_vo.collection_info.fingerprint)
+
+        server_vo, touch_count, update_count = self._update('STOPPED')
+        self.assertEqual((touch_count, update_count), (0, 1))
+        self.assertEqual(server_vo.data['compute']['instance_state'], 'RUNNING')
+
+    def _update_by_mode(self, change_history_mode, job_id, instance_state='STOPPED'):
+        """ Update by next job of collector in change history mode """
+        with patch.dict(config.get_global(), {'COLLECTOR_CHANGE_HISTORY_MODE': change_history_mode,
+                                              'COLLECTOR_CHANGE_HISTORY_RETENTION_DAYS': 7}):
+            server_vo, _, _ = self._update(instance_state, ServerService(dict(COLLECTOR_META, job_id=job_id)))
+
+        return server_vo, {history.key: history for history in server_vo.collection_info.change_history}
+
+    def test_compact_change_history(self):
+        server_vo, change_history = self._update_by_mode('COMPACT', 'job-compact')
+
+        # Last writer of changed key is updated without diff
+        self.assertEqual(server_vo.data['compute']['instance_state'], 'STOPPED')
+        self.assertEqual(change_history['data.compute'].job_id, 'job-compact')
+        self.assertEqual(change_history['data.compute'].updated_by, 'collector-test')
+        self.assertIsNone(change_history['data.compute'].diff)
+        self.assertEqual(change_history['data.os'].job_id, 'job-test')
+        self.assertEqual(ResourceChangeHistory.objects(job_id='job-compact').count(), 0)
+
+    def test_collection_change_history(self):
+        insert_many = MagicMock(wraps=ResourceChangeHistory._get_collection().insert_many)
+        with patch.object(ResourceChangeHistory._get_collection(), 'insert_many', insert_many):
+            server_vo, change_history = self._update_by_mode('COLLECTION', 'job-collection')
+
+        self.assertEqual(change_history['data.compute'].job_id, 'job-collection')
+        self.assertIsNone(change_history['data.compute'].diff)
+
+        # Diff of changed key is inserted once, and deleted by TTL index
+        insert_many.assert_called_once()
+        histories = ResourceChangeHistory.objects(job_id='job-collection')
+        self.assertEqual([history.key for history in histories], ['data.compute'])
+        self.assertEqual(histories[0].resource_id, self.server_id)
+        self.assertEqual(histories[0].diff, {'insert': {'instance_state': 'STOPPED'},
+                                             'delete': {'instance_state': 'RUNNING'}})
+        self.assertEqual(histories[0].expire_at - histories[0].updated_at, timedelta(days=7))
+
+    def test_collection_change_history_error(self):
+        collection = MagicMock()
+        collection.insert_many.side_effect = Exception('insert error')
+        with patch.object(ResourceChangeHistory, '_get_collection', return_value=collection):
+            server_vo, change_history = self._update_by_mode('COLLECTION', 'job-collection-error')
+
+        # Resource is updated without history
+        collection.insert_many.assert_called_once()
+        self.assertEqual(server_vo.data['compute']['instance_state'], 'STOPPED')
+        self.assertEqual(change_history['data.compute'].job_id, 'job-collection-error')
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
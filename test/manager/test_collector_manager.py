@@ -0,0 +1,106 @@
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+from spaceone.core import config
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.manager import collector_manager
+from spaceone.inventory.manager.collector_manager import CollectorManager, CollectingManager, JobManager
+
+DOMAIN_ID = 'domain-test'
+
+
+class TestCollectorManager(unittest.TestCase):
+    """ Synchronous collect of secrets in threads (CollectorManager._collect_concurrently) """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestCollectorManager, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+
+    def setUp(self):
+        patcher = patch.object(JobManager, 'add_error')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.collector_mgr = CollectorManager(transaction=Transaction({'domain_id': DOMAIN_ID, 'job_id': 'job-test'}))
+        self.job_vo = MagicMock(job_id='job-test')
+
+    @staticmethod
+    def _make_params_list(plugin_id, number_of_secrets):
+        return [{
+            'plugin_info': {'plugin_id': plugin_id, 'version': '1.0', 'options': {}},
+            'secret_id': f'secret-{idx}',
+            'filters': {},
+            'domain_id': DOMAIN_ID
+        } for idx in range(number_of_secrets)]
+
+    def test_collect_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        managers = {}
+
+        def collecting_resources(collecting_mgr, **req_params):
+            # Both secrets are collected at the same time
+            barrier.wait()
+            collecting_mgr.transaction.set_meta('secret.secret_id', req_params['secret_id'])
+            managers[req_params['secret_id']] = collecting_mgr
+
+        with patch.object(CollectingManager, 'collecting_resources', autospec=True,
+                          side_effect=collecting_resources):
+            self.collector_mgr._collect_concurrently(self._make_params_list('plugin-test', 2), 2,
+                                                     self.job_vo, DOMAIN_ID)
+
+        self.assertEqual(sorted(managers.keys()), ['secret-0', 'secret-1'])
+        for secret_id, collecting_mgr in managers.items():
+            self.assertIsNot(collecting_mgr.transaction, self.collector_mgr.transaction)
+            self.assertIs(collecting_mgr.job_mgr.transaction, collecting_mgr.transaction)
+            self.assertIs(collecting_mgr.job_task_mgr.transaction, collecting_mgr.transaction)
+            self.assertEqual(collecting_mgr.transaction.get_meta('secret.secret_id'), secret_id)
+            self.assertEqual(collecting_mgr.transaction.get_meta('job_id'), 'job-test')
+
+        self.assertIsNot(managers['secret-0'].transaction, managers['secret-1'].transaction)
+        self.assertIsNone(self.collector_mgr.transaction.get_meta('secret.secret_id'))
+        self.collector_mgr.locator.get_manager('JobManager').add_error.assert_not_called()
+
+    def test_plugin_concurrency(self):
+        lock = threading.Lock()
+        running = {'current': 0, 'max': 0}
+
+        def collecting_resources(collecting_mgr, **req_params):
+            with lock:
+                running['current'] += 1
+                running['max'] = max(running['max'], running['current'])
+
+            threading.Event().wait(0.1)
+            with lock:
+                running['current'] -= 1
+
+        with patch.object(CollectingManager, 'collecting_resources', autospec=True,
+                          side_effect=collecting_resources), \
+                patch.dict(config.get_global('COLLECTOR_PLUGIN_CONCURRENCY'), {'plugin-limited': 1}):
+            self.collector_mgr._collect_concurrently(self._make_params_list('plugin-limited', 3), 3,
+                                                     self.job_vo, DOMAIN_ID)
+
+        self.assertEqual(running['max'], 1)
+
+    def test_plugin_semaphore(self):
+        # No limit, if plugin is not in COLLECTOR_PLUGIN_CONCURRENCY (COLLECTOR_PLUGIN_DEFAULT_CONCURRENCY = 0)
+        with CollectorManager._get_plugin_semaphore('plugin-unknown'):
+            self.assertNotIn('plugin-unknown', collector_manager._PLUGIN_SEMAPHORES)
+
+        with patch.dict(config.get_global('COLLECTOR_PLUGIN_CONCURRENCY'), {'plugin-unknown': 2}):
+            semaphore = CollectorManager._get_plugin_semaphore('plugin-unknown')
+
+        self.assertIs(semaphore, collector_manager._PLUGIN_SEMAPHORES['plugin-unknown'][1])
+        self.assertTrue(semaphore.acquire(blocking=False))
+        self.assertTrue(semaphore.acquire(blocking=False))
+        self.assertFalse(semaphore.acquire(blocking=False))
+        semaphore.release()
+        semaphore.release()
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
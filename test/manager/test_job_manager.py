@@ -0,0 +1,146 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import mongomock
+from mongoengine import connect, disconnect
+from spaceone.core import config
+from spaceone.core.model.mongo_model import MongoModel
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.error import ERROR_JOB_UPDATE, ERROR_NOT_FOUND
+from spaceone.inventory.manager.collector_manager.job_manager import JobManager
+from spaceone.inventory.model.job_model import Job
+
+DOMAIN_ID = 'domain-test'
+NUMBER_OF_TASKS = 200
+NUMBER_OF_THREADS = 32
+
+
+def _make_atomic_find_one_and_update():
+    """ mongomock does not serialize writes of threads like MongoDB, so each command is made atomic here
+    (read-and-write of several commands is still not atomic)
+    """
+    lock = threading.Lock()
+    find_one_and_update = mongomock.collection.Collection.find_one_and_update
+
+    def _find_one_and_update(*args, **kwargs):
+        with lock:
+            return find_one_and_update(*args, **kwargs)
+
+    return _find_one_and_update
+
+
+class TestJobManager(unittest.TestCase):
+    """ JobManager.decrease_remained_tasks and add_error with in-process MongoDB (mongomock) """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestJobManager, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        disconnect()
+        connect('inventory-test', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestJobManager, cls).tearDownClass()
+        disconnect()
+
+    def setUp(self):
+        for patcher in [patch.object(MongoModel, 'connect', return_value=None),
+                        patch.object(mongomock.collection.Collection, 'find_one_and_update',
+                                     _make_atomic_find_one_and_update())]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.job_mgr = JobManager(transaction=Transaction({'service': 'inventory', 'domain_id': DOMAIN_ID}))
+
+    @staticmethod
+    def _create_job(status='IN_PROGRESS', mark_error=0):
+        return Job.create({
+            'status': status,
+            'total_tasks': NUMBER_OF_TASKS,
+            'remained_tasks': NUMBER_OF_TASKS,
+            'mark_error': mark_error,
+            'domain_id': DOMAIN_ID
+        })
+
+    def _run_concurrently(self, job_id):
+        with ThreadPoolExecutor(max_workers=NUMBER_OF_THREADS) as executor:
+            return list(executor.map(lambda i: self.job_mgr.decrease_remained_tasks(job_id, DOMAIN_ID),
+                                     range(NUMBER_OF_TASKS)))
+
+    def test_decrease_remained_tasks_success(self):
+        job_vo = self._create_job()
+        job_vos = self._run_concurrently(job_vo.job_id)
+
+        self.assertTrue(all(isinstance(result_vo, Job) for result_vo in job_vos))
+        self.assertEqual(sorted([result_vo.remained_tasks for result_vo in job_vos]), list(range(NUMBER_OF_TASKS)))
+
+        finished = [result_vo for result_vo in job_vos if result_vo.status == 'SUCCESS']
+        self.assertEqual(len(finished), 1)
+        self.assertEqual(finished[0].remained_tasks, 0)
+
+        job_vo.reload()
+        self.assertEqual(job_vo.status, 'SUCCESS')
+        self.assertIsNotNone(job_vo.finished_at)
+
+    def test_decrease_remained_tasks_error(self):
+        job_vo = self._create_job(mark_error=1)
+        job_vos = self._run_concurrently(job_vo.job_id)
+
+        self.assertEqual(len([result_vo for result_vo in job_vos if result_vo.status == 'ERROR']), 1)
+        job_vo.reload()
+        self.assertEqual(job_vo.status, 'ERROR')
+
+    def test_decrease_remained_tasks_canceled(self):
+        job_vo = self._create_job(status='CANCELED')
+        self._run_concurrently(job_vo.job_id)
+
+        job_vo.reload()
+        self.assertEqual(job_vo.status, 'CANCELED')
+        self.assertEqual(job_vo.remained_tasks, 0)
+        self.assertIsNone(job_vo.finished_at)
+
+    def test_decrease_remained_tasks_below_zero(self):
+        job_vo = self._create_job()
+        job_vo.update({'remained_tasks': 0})
+
+        with self.assertRaises(ERROR_JOB_UPDATE):
+            self.job_mgr.decrease_remained_tasks(job_vo.job_id, DOMAIN_ID)
+
+    def test_decrease_remained_tasks_not_found(self):
+        with self.assertRaises(ERROR_NOT_FOUND):
+            self.job_mgr.decrease_remained_tasks('job-not-found', DOMAIN_ID)
+
+    def test_add_error(self):
+        job_vo = self._create_job()
+        with patch.dict(config.get_global(), {'JOB_MAX_ERRORS': 3}):
+            for idx in range(5):
+                self.job_mgr.add_error(job_vo.job_id, DOMAIN_ID, 'ERROR_TEST', f'error-{idx}')
+
+        # The newest errors are kept, and Job is marked as error
+        job_vo.reload()
+        self.assertEqual([error.message for error in job_vo.errors],
+                         [repr('error-2'), repr('error-3'), repr('error-4')])
+        self.assertEqual(job_vo.mark_error, 1)
+
+    def test_add_error_unlimited(self):
+        job_vo = self._create_job()
+        with patch.dict(config.get_global(), {'JOB_MAX_ERRORS': 0}):
+            for idx in range(5):
+                self.job_mgr.add_error(job_vo.job_id, DOMAIN_ID, 'ERROR_TEST', f'error-{idx}')
+
+        job_vo.reload()
+        self.assertEqual(len(job_vo.errors), 5)
+
+    def test_add_error_not_found(self):
+        with self.assertRaises(ERROR_NOT_FOUND):
+            self.job_mgr.add_error('job-not-found', DOMAIN_ID, 'ERROR_TEST', 'error')
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
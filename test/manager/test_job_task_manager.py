@@ -0,0 +1,85 @@
+import unittest
+from unittest.mock import patch
+
+import mongomock
+from mongoengine import connect, disconnect
+from spaceone.core import config
+from spaceone.core.model.mongo_model import MongoModel
+from spaceone.core.transaction import Transaction
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.error import ERROR_NOT_FOUND
+from spaceone.inventory.manager.collector_manager.job_task_manager import JobTaskManager
+from spaceone.inventory.model.job_model import Job
+from spaceone.inventory.model.job_task_model import JobTask
+
+DOMAIN_ID = 'domain-test'
+
+
+class TestJobTaskManager(unittest.TestCase):
+    """ JobTaskManager.add_error with in-process MongoDB (mongomock) """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestJobTaskManager, cls).setUpClass()
+        config.init_conf(package='spaceone.inventory')
+        config.set_service_config()
+        disconnect()
+        connect('inventory-test', host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestJobTaskManager, cls).tearDownClass()
+        disconnect()
+
+    def setUp(self):
+        patcher = patch.object(MongoModel, 'connect', return_value=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.job_task_mgr = JobTaskManager(transaction=Transaction({'service': 'inventory', 'domain_id': DOMAIN_ID}))
+        self.job_vo = Job.create({'status': 'IN_PROGRESS', 'domain_id': DOMAIN_ID})
+        self.job_task_vo = JobTask.create({'status': 'IN_PROGRESS', 'job_id': self.job_vo.job_id,
+                                           'secret_id': 'secret-test', 'domain_id': DOMAIN_ID})
+
+    def _add_errors(self, count):
+        for idx in range(count):
+            self.job_task_mgr.add_error(self.job_task_vo.job_task_id, DOMAIN_ID, 'ERROR_TEST', f'error-{idx}',
+                                        {'resource_type': 'inventory.Server', 'resource_id': f'server-{idx}'})
+        self.job_task_vo.reload()
+
+    def test_add_error(self):
+        self._add_errors(1)
+
+        self.assertEqual(self.job_task_vo.status, 'FAILURE')
+        self.assertIsNotNone(self.job_task_vo.finished_at)
+        self.assertEqual(len(self.job_task_vo.errors), 1)
+        self.assertEqual(self.job_task_vo.errors[0].error_code, 'ERROR_TEST')
+        self.assertEqual(self.job_task_vo.errors[0].message, repr('error-0'))
+        self.assertEqual(self.job_task_vo.errors[0].additional['resource_id'], 'server-0')
+
+        # Job is marked as error
+        self.job_vo.reload()
+        self.assertEqual(self.job_vo.mark_error, 1)
+
+    def test_add_error_max_errors(self):
+        with patch.dict(config.get_global(), {'JOB_MAX_ERRORS': 3}):
+            self._add_errors(5)
+
+        # The newest errors are kept
+        self.assertEqual([error.message for error in self.job_task_vo.errors],
+                         [repr('error-2'), repr('error-3'), repr('error-4')])
+
+    def test_add_error_unlimited(self):
+        with patch.dict(config.get_global(), {'JOB_MAX_ERRORS': 0}):
+            self._add_errors(5)
+
+        self.assertEqual(len(self.job_task_vo.errors), 5)
+
+    def test_add_error_not_found(self):
+        with self.assertRaises(ERROR_NOT_FOUND):
+            self.job_task_mgr.add_error('job-task-not-found', DOMAIN_ID, 'ERROR_TEST', 'error')
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)
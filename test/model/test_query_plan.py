@@ -0,0 +1,50 @@
+import os
+import unittest
+
+from mongoengine import connect, disconnect
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from spaceone.core.unittest.runner import RichTestRunner
+
+from spaceone.inventory.lib.query_plan import check_query_plans
+from spaceone.inventory.model.cloud_service_model import CloudService
+from spaceone.inventory.model.ip_address_model import IPAddress
+from spaceone.inventory.model.server_model import Server
+
+MONGO_HOST = os.environ.get('SPACEONE_TEST_MONGO_HOST', 'mongodb://localhost:27017')
+TEST_DB = 'test_inventory_query_plan'
+
+
+class TestQueryPlan(unittest.TestCase):
+    """ Hot queries of collector and cleanup should not scan collection, with indexes of model meta
+    (local MongoDB: SPACEONE_TEST_MONGO_HOST)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestQueryPlan, cls).setUpClass()
+        try:
+            cls.client = MongoClient(MONGO_HOST, serverSelectionTimeoutMS=1000)
+            cls.client.admin.command('ping')
+        except PyMongoError as e:
+            raise unittest.SkipTest(f'MongoDB is not available: {e}')
+
+        connect(TEST_DB, host=MONGO_HOST)
+        for model in [Server, CloudService, IPAddress]:
+            model.ensure_indexes()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(TestQueryPlan, cls).tearDownClass()
+        cls.client.drop_database(TEST_DB)
+        cls.client.close()
+        disconnect()
+
+    def test_no_collection_scan(self):
+        results = check_query_plans(self.client[TEST_DB])
+        collscans = [f'{result["collection"]}.{result["query"]}' for result in results if result['collscan']]
+        self.assertEqual(collscans, [])
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=RichTestRunner)